@@ -1,18 +1,23 @@
 import json
+import os
 
-from calculators import PorosityCalculationResult
+from porosity_model import PorosityCalculationResult, porosity_result_to_dict
+
+def write_json(data, output_path: str):
+    """
+    Saves data to a JSON file. The file is replaced atomically, so an interrupted run never
+    leaves a truncated file behind.
+    """
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w') as f:
+            json.dump(data, f, indent=4)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
 
 def write_porosity_result(result: PorosityCalculationResult, output_path: str):
     """Saves porosity calculation results to JSON file"""
-    data = {
-        "region_density": result.region_density,
-        "porosity": result.porosity,
-        "region_input": {
-            "pressure": result.region_input.pressure,
-            "enthalpy": result.region_input.enthalpy,
-            "composition": result.region_input.composition
-        }
-    }
-    
-    with open(output_path, 'w') as f:
-        json.dump(data, f, indent=4)
+    write_json(porosity_result_to_dict(result), output_path)
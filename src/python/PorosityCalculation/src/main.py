@@ -1,47 +1,117 @@
 import argparse
 import os.path
+import sys
+from typing import Dict, List, Tuple
 from models import Propellant, RegionCalculationResult
 from json_reader import load_propellants, load_region_result
-from calculators import calculate_porosity, calculate_region_density
-from json_writer import write_porosity_result
+from json_writer import write_json, write_porosity_result
+from porosity_model import POROSITY_FILE_NAME, PorosityCalculationResult, calculate_porosity
+
+# Region file RegionMapper writes for every propellant and pressure
+REGION_FILE_NAME = "pocket_without_skeleton.json"
 
 def get_output_path(region_file: str) -> str:
     """Generates output path for porosity results"""
     directory = os.path.dirname(region_file)
-    return os.path.join(directory, "porosity.json")
+    return os.path.join(directory, POROSITY_FILE_NAME)
+
+def find_region_files(output_root: str, propellant_names) -> List[Tuple[str, str]]:
+    """
+    Finds every '<pressure>/<propellant>/pocket_without_skeleton.json' (or '<propellant>/...'
+    for single-pressure runs) below the RegionMapper output root, in a stable order.
+    Returns pairs of propellant name and region file path.
+    """
+    region_files = []
+    for directory, subdirectories, files in os.walk(output_root):
+        subdirectories.sort()
+        name = os.path.basename(directory)
+        if REGION_FILE_NAME in files and name in propellant_names:
+            region_files.append((name, os.path.join(directory, REGION_FILE_NAME)))
+    return region_files
+
+def process_region_file(propellant: Propellant, region_file: str) -> PorosityCalculationResult:
+    """Calculates and saves the porosity of a region file"""
+    region_result = load_region_result(region_file)
+    result = calculate_porosity(propellant, region_result)
+    write_porosity_result(result, get_output_path(region_file))
+    return result
+
+def run_single(args, propellants: Dict[str, Propellant]):
+    """Processes a single region file of a propellant"""
+    propellant = propellants.get(args.propellant_name)
+    if not propellant:
+        raise ValueError(f"Propellant '{args.propellant_name}' not found")
+
+    result = process_region_file(propellant, args.region_file)
+
+    # Output summary
+    print(f"Results saved to: {get_output_path(args.region_file)}")
+    print(f"Region density: {result.region_density:.1f} kg/m³")
+    print(f"Porosity: {result.porosity:.4f}")
+
+def run_batch(args, propellants: Dict[str, Propellant]) -> int:
+    """
+    Processes every region file below the RegionMapper output root in one process.
+    Failed frames are reported and skipped; returns the number of failed frames.
+    """
+    region_files = find_region_files(args.output_root, propellants)
+    if not region_files:
+        raise ValueError(f"No '{REGION_FILE_NAME}' files of known propellants found in '{args.output_root}'")
+
+    summary = []
+    failures = 0
+    for name, region_file in region_files:
+        try:
+            result = process_region_file(propellants[name], region_file)
+        except Exception as e:
+            failures += 1
+            print(f"Error: {region_file}: {e}", file=sys.stderr)
+            continue
+        summary.append({
+            "propellant": name,
+            "pressure": result.region_input.pressure,
+            "region_density": result.region_density,
+            "porosity": result.porosity,
+            "region_file": region_file,
+            "porosity_file": get_output_path(region_file)
+        })
+        print(f"{name} at {result.region_input.pressure:g} Pa: porosity {result.porosity:.4f}")
+
+    if args.summary_file:
+        summary.sort(key=lambda entry: (entry["pressure"], entry["propellant"]))
+        write_json(summary, args.summary_file)
+        print(f"Summary saved to: {args.summary_file}")
+    print(f"Porosity of {len(summary)} of {len(region_files)} frames saved.")
+    return failures
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--propellants-file', required=True)
-    parser.add_argument('--propellant-name', required=True)
-    parser.add_argument('--region-file', required=True)
+    parser.add_argument('--propellant-name')
+    parser.add_argument('--region-file')
+    parser.add_argument('--output-root',
+                        help='RegionMapper output root; every region file below it is processed in one run')
+    parser.add_argument('--summary-file',
+                        help='Optional JSON file listing the porosity of every frame in batch mode')
     
     args = parser.parse_args()
+    if args.output_root is None and (args.propellant_name is None or args.region_file is None):
+        parser.error('either --output-root or both --propellant-name and --region-file are required')
+    if args.output_root is not None and (args.propellant_name or args.region_file):
+        parser.error('--output-root cannot be combined with --propellant-name or --region-file')
+    if args.summary_file and args.output_root is None:
+        parser.error('--summary-file requires --output-root')
     
-    # Data loading
-    propellants = load_propellants(args.propellants_file)
-    region_result = load_region_result(args.region_file)
-    
-    # Find propellant
-    propellant = next((p for p in propellants if p.name == args.propellant_name), None)
-    if not propellant:
-        raise ValueError(f"Propellant '{args.propellant_name}' not found")
+    # Data loading, once per run
+    propellants = {p.name: p for p in load_propellants(args.propellants_file)}
     
-    # Calculation
-    result = calculate_porosity(
-        calculate_region_density(propellant),
-        propellant,
-        region_result
-    )
-    
-    # Save results
-    output_path = get_output_path(args.region_file)
-    write_porosity_result(result, output_path)
-    
-    # Output summary
-    print(f"Results saved to: {output_path}")
-    print(f"Region density: {result.region_density:.1f} kg/m³")
-    print(f"Porosity: {result.porosity:.4f}")
+    if args.output_root is not None:
+        failures = run_batch(args, propellants)
+        if failures:
+            print(f"Error: {failures} frames failed.", file=sys.stderr)
+            sys.exit(1)
+    else:
+        run_single(args, propellants)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,106 @@
+"""
+Vectorized porosity calculation over grids of region compositions and model constants.
+
+The scalar `calculate_porosity` evaluates one region result with the module constants. Here
+every input is an array and all inputs broadcast against each other, so a single call covers,
+for example, every pressure of a propellant and every candidate value of the model constants
+during calibration:
+
+    carbon_retention = np.linspace(0.05, 0.2, 16)[:, None]  # shape (16, 1)
+    grid = calculate_porosity_grid(propellant, region_results, carbon_retention=carbon_retention)
+    grid.porosity  # shape (16, P)
+
+The model matches `calculate_porosity`:
+    porosity = 1 - (V_C + V_Al) / V_total, where
+    V_C = retention * n_C * M_C / rho_C and V_Al = n_Al * M_Al / (rho_Al * f_T).
+The Aluminum temperature factor f_T is not applied by the scalar model; it is only applied
+here when given.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from models import Propellant, RegionCalculationResult
+from porosity_model import CARBON_DENSITY, CARBON_RETENTION, calculate_total_volume, porosity_from_volume
+
+@dataclass(frozen=True)
+class PorosityGrid:
+    """Holds porosity and region density arrays of a porosity grid"""
+    pressures: np.ndarray
+    region_density: np.ndarray
+    porosity: np.ndarray
+
+def calculate_porosity_array(
+    total_volume,
+    aluminum_density,
+    carbon,
+    aluminum,
+    carbon_retention=CARBON_RETENTION,
+    carbon_density=CARBON_DENSITY,
+    aluminum_temperature_factor=None
+):
+    """
+    Calculates region density and porosity for broadcastable arrays of inputs.
+
+    Args:
+        total_volume: Volume of 1 kg of propellant in m^3, see `calculate_total_volume`.
+        aluminum_density: Density of the Aluminum component in kg/m^3.
+        carbon: Carbon content of the region in mol/kg.
+        aluminum: Aluminum content of the region in mol/kg.
+        carbon_retention: Fraction of the carbon retained in the region.
+        carbon_density: Density of the retained carbon in kg/m^3.
+        aluminum_temperature_factor: Optional factor of the Aluminum density at the
+            surface temperature; not applied when None, as in `calculate_porosity`.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Region density and porosity, broadcast over all inputs.
+    """
+    total_volume = np.asarray(total_volume, dtype=float)
+    porosity = porosity_from_volume(
+        total_volume,
+        np.asarray(aluminum_density, dtype=float),
+        np.asarray(carbon, dtype=float),
+        np.asarray(aluminum, dtype=float),
+        carbon_retention=np.asarray(carbon_retention, dtype=float),
+        carbon_density=np.asarray(carbon_density, dtype=float),
+        aluminum_temperature_factor=aluminum_temperature_factor
+    )
+    with np.errstate(divide='ignore'):
+        region_density = np.where(total_volume != 0, 1 / total_volume, 0.0)
+    region_density, porosity = np.broadcast_arrays(region_density, porosity)
+    return region_density, porosity
+
+def composition_arrays(region_results: Sequence[RegionCalculationResult]):
+    """Collects pressures and carbon and Aluminum contents of region results into arrays"""
+    pressures = np.array([r.pressure for r in region_results], dtype=float)
+    carbon = np.array([r.composition.get('C', 0) for r in region_results], dtype=float)
+    aluminum = np.array([r.composition.get('Al', 0) for r in region_results], dtype=float)
+    return pressures, carbon, aluminum
+
+def calculate_porosity_grid(
+    propellant: Propellant,
+    region_results: Sequence[RegionCalculationResult],
+    carbon_retention=CARBON_RETENTION,
+    carbon_density=CARBON_DENSITY,
+    aluminum_temperature_factor: Optional[object] = None
+) -> PorosityGrid:
+    """
+    Calculates porosity of a propellant for many region results, e.g. one per pressure,
+    and optional arrays of the model constants in one call.
+
+    The model constants broadcast against the region results axis, which is the last axis.
+    The component volume is calculated once and shared by the region density and porosity.
+    """
+    pressures, carbon, aluminum = composition_arrays(region_results)
+    region_density, porosity = calculate_porosity_array(
+        calculate_total_volume(propellant),
+        propellant.components['Aluminum'].density,
+        carbon,
+        aluminum,
+        carbon_retention=carbon_retention,
+        carbon_density=carbon_density,
+        aluminum_temperature_factor=aluminum_temperature_factor
+    )
+    return PorosityGrid(pressures, region_density, porosity)
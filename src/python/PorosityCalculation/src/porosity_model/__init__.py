@@ -0,0 +1,27 @@
+"""
+The porosity model shared by the porosity calculator and the region mapper.
+
+The porosity calculator imports this package from its own directory, the region mapper by
+its location (see RegionMapper/src/porosity_stage.py). The package only imports its own
+modules, relatively, so both tools evaluate exactly the same model with the same molar masses.
+
+Functions:
+    - calculate_total_volume: Volume of 1 kg of propellant.
+    - calculate_porosity: Region density and porosity of a propellant from its pocket region.
+    - porosity_from_volume: The porosity formula, for floats or broadcasting NumPy arrays.
+    - porosity_result_to_dict: Layout of the porosity JSON file.
+"""
+
+from .model import (
+    ALUMINUM_MOLAR_MASS,
+    ALUMINUM_TEMPERATURE_FACTOR,
+    CARBON_DENSITY,
+    CARBON_MOLAR_MASS,
+    CARBON_RETENTION,
+    POROSITY_FILE_NAME,
+    PorosityCalculationResult,
+    calculate_porosity,
+    calculate_total_volume,
+    porosity_from_volume,
+    porosity_result_to_dict
+)
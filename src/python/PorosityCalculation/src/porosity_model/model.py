@@ -0,0 +1,90 @@
+"""
+The porosity model: constants, result DTO, formula and JSON layout.
+
+The functions accept floats as well as NumPy arrays that broadcast against each other, and
+propellants of either tool, as they only read the mass fractions and densities of the components.
+"""
+
+from dataclasses import dataclass
+
+from .molar_masses import ELEMENT_MOLAR_MASSES
+
+CARBON_DENSITY = 2267 # kg/m^3
+CARBON_RETENTION = 0.1 # 10% of carbon is retained in the region
+ALUMINUM_TEMPERATURE_FACTOR = 0.6 # 40% density reduction at 2300 K
+
+# Molar masses resolved once at load time instead of on every calculation
+CARBON_MOLAR_MASS = ELEMENT_MOLAR_MASSES['C']
+ALUMINUM_MOLAR_MASS = ELEMENT_MOLAR_MASSES['Al']
+
+# File written next to the region files of a propellant
+POROSITY_FILE_NAME = 'porosity.json'
+
+@dataclass(frozen=True)
+class PorosityCalculationResult:
+    """Holds porosity calculation results"""
+    region_density: float
+    porosity: float
+    region_input: object
+
+def porosity_from_volume(
+    total_volume,
+    aluminum_density,
+    carbon,
+    aluminum,
+    carbon_retention=CARBON_RETENTION,
+    carbon_density=CARBON_DENSITY,
+    aluminum_temperature_factor=None
+):
+    """
+    Calculates porosity from the volume of 1 kg of propellant and the carbon and Aluminum
+    contents of the region in mol/kg. The Aluminum temperature factor is only applied when given.
+    """
+    if aluminum_temperature_factor is not None:
+        aluminum_density = aluminum_density * aluminum_temperature_factor
+
+    # Element mass calculations using molar masses
+    mass_c = carbon_retention * carbon * CARBON_MOLAR_MASS
+    mass_al = aluminum * ALUMINUM_MOLAR_MASS
+
+    # Volume calculations
+    volume_c = mass_c / carbon_density
+    volume_al = mass_al / aluminum_density
+
+    return 1 - (volume_c + volume_al) / total_volume
+
+def calculate_total_volume(propellant) -> float:
+    """
+    Calculates the volume of 1 kg of propellant from the component volume fractions.
+    Raises ValueError if the density of a component is not given.
+    """
+    total_volume = 0.0
+    for name, component in propellant.components.items():
+        if component.density is None:
+            raise ValueError(f"Density of component '{name}' of propellant '{propellant.name}' is required for the porosity.")
+        total_volume += component.mass_fraction / component.density
+    return total_volume
+
+def calculate_porosity(propellant, region_result) -> PorosityCalculationResult:
+    """Calculates the region density and porosity of a propellant from its pocket region result"""
+    total_volume = calculate_total_volume(propellant)
+    porosity = porosity_from_volume(
+        total_volume,
+        propellant.components['Aluminum'].density,
+        region_result.composition.get('C', 0),
+        region_result.composition.get('Al', 0)
+    )
+    region_density = 1 / total_volume if total_volume else 0.0
+    return PorosityCalculationResult(region_density, porosity, region_result)
+
+def porosity_result_to_dict(result: PorosityCalculationResult) -> dict:
+    """Converts a porosity result to the layout of the porosity JSON file"""
+    return {
+        "region_density": result.region_density,
+        "porosity": result.porosity,
+        "region_input": {
+            "pressure": result.region_input.pressure,
+            "enthalpy": result.region_input.enthalpy,
+            "composition": result.region_input.composition
+        }
+    }
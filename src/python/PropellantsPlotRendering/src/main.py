@@ -3,9 +3,13 @@ import sys
 
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
+import numpy as np
 
 from typing import List
 
+# Pressures are normalized to megapascals before the polynomials are evaluated, as in the region mapper
+PRESSURE_SCALE = 1e6
+
 PARAMETER_LABELS = {
     'lambda_gas': 'Thermal Conductivity (λ), W/(m·K)',
     'average_molar_mass': 'Average Molar Mass, kg/mol',
@@ -19,10 +23,13 @@ def read_json(file_path):
     with open(file_path, 'r') as file:
         return json.load(file)
 
-def _calculate_agglomeration_fraction(coefficients: List[float], pressure: float) -> float:
-    normalized_pressure = pressure / 1e6
-    fraction = sum(coeff * (normalized_pressure)**i for i, coeff in enumerate(coefficients))
-    return max(0, min(100, fraction))
+def _calculate_agglomeration_fractions(coefficients: List[float], pressures: List[float]) -> np.ndarray:
+    # Horner's scheme over all pressures at once, see RegionMapper/src/polynomials.py
+    normalized_pressures = np.asarray(pressures, dtype=float) / PRESSURE_SCALE
+    fractions = np.zeros_like(normalized_pressures)
+    for coeff in reversed(coefficients):
+        fractions = fractions * normalized_pressures + coeff
+    return np.clip(fractions, 0, 100)
 
 def plot_parameter(data, parameter_name, output_filename):
     if parameter_name in ['agglomeration_fraction', 'skeleton_surface_fraction']:
@@ -50,12 +57,12 @@ def plot_parameter(data, parameter_name, output_filename):
                 print(f"Warning: '{name}' missing required data for {parameter_name}. Skipping.")
                 continue
             
-            for frame in fuel['pressure_frames']:
-                pressure = frame['pressure']
+            frame_pressures = [frame['pressure'] for frame in fuel['pressure_frames']]
+            agglomerations = _calculate_agglomeration_fractions(aluminum_coeffs, frame_pressures)
+
+            for pressure, agglomeration in zip(frame_pressures, agglomerations):
                 pressures.append(pressure)
                 
-                agglomeration = _calculate_agglomeration_fraction(aluminum_coeffs, pressure)
-                
                 if parameter_name == 'agglomeration_fraction':
                     value = agglomeration
                 else:  # skeleton_surface_fraction
@@ -0,0 +1,270 @@
+"""
+Benchmark suite of the region mapper.
+
+Generates a seeded synthetic dataset with N propellants, P pressures and K components,
+then times the load, map, calculate and write stages of the per-item pipeline used by
+`src/main.py`, and the batched engine path, separately. Every stage reports its wall
+time, throughput and its own peak memory: the peak of the memory traced by `tracemalloc`
+above the memory held when the stage started, measured in an extra run after the timed ones,
+so the tracing overhead does not distort the times. NumPy buffers are traced as well. The
+peak resident set size of the whole process is reported once for the run.
+
+The results are written to a JSON file, which can be passed back with `--compare` to
+print the change of every stage against a previous run, e.g. of another commit.
+
+Usage:
+    python3 benchmarks/main.py --propellants 200 --pressures 20 --components 4 --output results.json
+    python3 benchmarks/main.py --output new.json --compare results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from io import StringIO
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", "src"))
+
+import numpy as np
+
+from calculators import RegionCalculator
+from json_reader import read_components, read_propellants, read_propellant_set
+from json_writer import JSONWriter
+from region_mappers import (
+    InterPocketRegionMapper,
+    PocketRegionWithoutSkeletonMapper,
+    PocketRegionWithSkeletonMapper,
+    DiffusionRegionMapper
+)
+from synthetic import generate_pressures, write_dataset
+
+RESULTS_FORMAT_VERSION = 2
+
+def parse_args():
+    """
+    Parse command-line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the region mapper on a synthetic dataset.")
+    parser.add_argument("--propellants", type=int, default=200, help="Number of propellants N (default: 200).")
+    parser.add_argument("--pressures", type=int, default=20, help="Number of pressures P (default: 20).")
+    parser.add_argument("--components", type=int, default=4, help="Number of components K, at least 4 (default: 4).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic dataset (default: 0).")
+    parser.add_argument("--repeat", type=int, default=1, help="Repetitions per stage; the fastest is kept (default: 1).")
+    parser.add_argument("--output", default="benchmark_results.json", help="Path to the results JSON file.")
+    parser.add_argument("--compare", help="Path to a previous results JSON file to compare against.")
+    parser.add_argument("--skip-write", action="store_true", help="Skip the write stage.")
+
+    args = parser.parse_args()
+    if args.propellants < 1 or args.pressures < 1 or args.repeat < 1:
+        parser.error("Counts must be positive values.")
+    if args.components < 4:
+        parser.error("At least 4 components are required.")
+    return args
+
+
+def peak_rss_kb() -> int:
+    """
+    Return the peak resident set size of the process in kilobytes. This is the high-water
+    mark of the whole process so far, not of any single stage.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def git_revision() -> str:
+    """
+    Return the current git commit, or "unknown" outside of a git checkout.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BENCHMARKS_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_stage(stages: dict, name: str, items: int, repeat: int, function):
+    """
+    Time a stage, keep the fastest of `repeat` runs and record it in `stages`, then run it
+    once more with `tracemalloc` to measure its own peak memory.
+
+    Args:
+        stages (dict): The stage results to add to.
+        name (str): Name of the stage.
+        items (int): Number of items the stage processes, for the throughput.
+        repeat (int): Number of runs.
+        function (Callable[[], Any]): The stage; the return value of the traced run is returned.
+
+    Returns:
+        Any: The return value of the stage.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        value = function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    stages[name] = {
+        "seconds": best,
+        "items": items,
+        "items_per_second": items / best if best > 0 else None,
+        "stage_peak_traced_kb": (peak - baseline) // 1024
+    }
+    print(f"{name:<20} {best:10.4f} s {items / best if best > 0 else float('inf'):14.1f} items/s "
+          f"{stages[name]['stage_peak_traced_kb']:10d} KB stage peak")
+    return value
+
+
+def map_regions(propellants, pressures):
+    """
+    Map every region of every propellant with the per-item mappers.
+    """
+    inter_pocket_mapper = InterPocketRegionMapper()
+    pocket_without_skeleton_mapper = PocketRegionWithoutSkeletonMapper()
+    pocket_with_skeleton_mapper = PocketRegionWithSkeletonMapper()
+    diffusion_mapper = DiffusionRegionMapper()
+
+    mapped = []
+    for propellant in propellants:
+        invariant = (
+            inter_pocket_mapper.calculate(propellant),
+            pocket_without_skeleton_mapper.calculate(propellant),
+            pocket_with_skeleton_mapper.calculate(propellant)
+        )
+        for pressure in pressures:
+            mapped.append((pressure, invariant + (diffusion_mapper.calculate(propellant, pressure),)))
+    return mapped
+
+
+def calculate_regions(mapped, components):
+    """
+    Calculate every mapped region with the per-item calculator.
+    """
+    return [
+        [RegionCalculator.calculate(region_data, components, pressure) for region_data in regions]
+        for pressure, regions in mapped
+    ]
+
+
+def write_results(results, directory: str):
+    """
+    Write every region result to its own JSON file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with redirect_stdout(StringIO()):
+        for index, regions in enumerate(results):
+            for region_index, result in enumerate(regions):
+                JSONWriter.write(result, os.path.join(directory, f"{index}_{region_index}.json"))
+
+
+def compare(results: dict, previous: dict) -> None:
+    """
+    Print the relative change of every stage against a previous results file.
+    """
+    print(f"\nComparison against {previous.get('git_revision', 'unknown')[:12]}:")
+    dataset_keys = ("propellants", "pressures", "components", "seed")
+    old_parameters = previous.get("parameters", {})
+    if any(old_parameters.get(key) != results["parameters"][key] for key in dataset_keys):
+        print("Warning: the benchmark datasets differ, the comparison may be meaningless.")
+    for name, stage in results["stages"].items():
+        old = previous.get("stages", {}).get(name)
+        if not old or not old.get("seconds"):
+            print(f"{name:<20} {'(new stage)':>12}")
+            continue
+        ratio = stage["seconds"] / old["seconds"]
+        if "stage_peak_traced_kb" in old:
+            memory = f"{stage['stage_peak_traced_kb'] - old['stage_peak_traced_kb']:+10d} KB stage peak"
+        else:
+            memory = f"{'n/a':>10} (no stage peak in the previous results)"
+        print(f"{name:<20} {ratio:10.3f}x time {memory}")
+
+
+def main():
+    """
+    Main function to run the benchmarks and export the results.
+    """
+    args = parse_args()
+    pressures = generate_pressures(args.pressures)
+    stages = {}
+
+    with tempfile.TemporaryDirectory(prefix="region_mapper_benchmark_") as work_dir:
+        propellants_path, components_path = write_dataset(
+            work_dir, args.propellants, args.components, args.seed)
+        region_count = args.propellants * args.pressures * 4
+
+        # Per-item pipeline, as used by src/main.py
+        components, propellants = run_stage(
+            stages, "load", args.propellants, args.repeat,
+            lambda: (read_components(components_path), read_propellants(propellants_path)))
+        mapped = run_stage(
+            stages, "map", region_count, args.repeat, lambda: map_regions(propellants, pressures))
+        results = run_stage(
+            stages, "calculate", region_count, args.repeat, lambda: calculate_regions(mapped, components))
+        if not args.skip_write:
+            run_stage(
+                stages, "write", region_count, args.repeat,
+                lambda: write_results(results, os.path.join(work_dir, "output")))
+        del mapped, results
+
+        # Batched engine path
+        propellant_set = run_stage(
+            stages, "load_set", args.propellants, args.repeat,
+            lambda: read_propellant_set(propellants_path, list(components)))
+        run_stage(
+            stages, "calculate_set", region_count, args.repeat,
+            lambda: RegionCalculator.calculate_set(propellant_set, components, pressures))
+
+    results = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python_version": platform.python_version(),
+        "numpy_version": np.__version__,
+        "platform": platform.platform(),
+        "parameters": {
+            "propellants": args.propellants,
+            "pressures": args.pressures,
+            "components": args.components,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "skip_write": args.skip_write
+        },
+        "stages": stages,
+        "process_peak_rss_kb": peak_rss_kb()
+    }
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=4)
+    print(f"Process peak RSS: {results['process_peak_rss_kb']} KB")
+    print(f"Results successfully written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            compare(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+This module generates seeded synthetic datasets for the region mapper benchmarks.
+
+The generated files follow the shapes of `data/propellant_components.json` and
+`data/propellants.json`: the four components handled by the mappers are always
+present, optional additive components are generated on top of them, and every
+propellant gets randomized mass fractions, an AP large particles fraction and
+perturbed Aluminum agglomeration coefficients.
+
+Functions:
+    - generate_components: Builds the components file content for K components.
+    - generate_propellants: Builds the propellants file content for N propellants.
+    - generate_pressures: Builds an evenly spaced grid of P pressures.
+    - write_dataset: Writes both files to a directory.
+"""
+
+import json
+import os
+import random
+
+from typing import Dict, List, Tuple
+
+# Components used by the region mappers, taken from data/propellant_components.json
+BASE_COMPONENTS = {
+    "CombustibleBinder": {
+        "composition": {"C": 23.85, "H": 71.18, "O": 22.23, "N": 10.78, "Cl": 4.06},
+        "enthalpy": -2543.93e3
+    },
+    "AmmoniumPerchlorate": {
+        "composition": {"H": 4, "O": 4, "N": 1, "Cl": 1},
+        "enthalpy": -2512e3
+    },
+    "Aluminum": {
+        "composition": {"Al": 1},
+        "enthalpy": 0.0
+    },
+    "Octogen": {
+        "composition": {"C": 4, "H": 8, "O": 8, "N": 8},
+        "enthalpy": 313e3
+    }
+}
+
+# Agglomeration coefficients of Bas_1 in data/propellants.json
+BASE_AGGLOMERATION_COEFFICIENTS = [
+    0.3871888128423973, -0.15993047126375545, 0.04323865626533666,
+    -0.006316468753512198, 0.0004719595486120565, -1.447964550264008e-05
+]
+
+# Densities in kg/m^3 of the base components, as in data/propellants.json
+BASE_DENSITIES = {
+    "CombustibleBinder": 950,
+    "AmmoniumPerchlorate": 1952,
+    "Aluminum": 2700,
+    "Octogen": 1870
+}
+
+ADDITIVE_ELEMENTS = ("C", "H", "O", "N", "Cl", "Al")
+
+def generate_components(count: int, rng: random.Random) -> List[Dict[str, dict]]:
+    """
+    Generate the content of a components file with `count` components.
+
+    Args:
+        count (int): Number of components, at least the four base components.
+        rng (random.Random): The seeded random generator.
+
+    Returns:
+        List[Dict[str, dict]]: Component records in the components.json format.
+
+    Raises:
+        ValueError: If fewer components than the base components are requested.
+    """
+    if count < len(BASE_COMPONENTS):
+        raise ValueError(f"At least {len(BASE_COMPONENTS)} components are required, got {count}")
+
+    components = [{name: data} for name, data in BASE_COMPONENTS.items()]
+    for index in range(count - len(BASE_COMPONENTS)):
+        elements = rng.sample(ADDITIVE_ELEMENTS, rng.randint(2, 4))
+        components.append({
+            f"Additive{index + 1}": {
+                "composition": {element: round(rng.uniform(1, 20), 2) for element in elements},
+                "enthalpy": round(rng.uniform(-3e6, 1e6), 1)
+            }
+        })
+    return components
+
+def generate_propellants(
+    count: int,
+    component_names: List[str],
+    rng: random.Random
+) -> List[dict]:
+    """
+    Generate the content of a propellants file with `count` propellants.
+
+    Args:
+        count (int): Number of propellants.
+        component_names (List[str]): Names of all components; additives get small fractions.
+        rng (random.Random): The seeded random generator.
+
+    Returns:
+        List[dict]: Propellant records in the propellants.json format.
+    """
+    propellants = []
+    for index in range(count):
+        # Random positive weights normalized to a unit mass fraction sum
+        weights = {
+            name: rng.uniform(0.15, 0.35) if name in BASE_COMPONENTS else rng.uniform(0.0, 0.03)
+            for name in component_names
+        }
+        total = sum(weights.values())
+
+        components = {}
+        for name, weight in weights.items():
+            component = {
+                "mass_fraction": weight / total,
+                "density": BASE_DENSITIES.get(name, round(rng.uniform(900, 2500)))
+            }
+            if name == "AmmoniumPerchlorate":
+                component["large_particles_fraction"] = rng.uniform(0.3, 0.8)
+            if name == "Aluminum":
+                component["agglomeration_coefficients"] = [
+                    coefficient * rng.uniform(0.8, 1.2) for coefficient in BASE_AGGLOMERATION_COEFFICIENTS
+                ]
+            components[name] = component
+
+        propellants.append({"name": f"Synthetic_{index}", "components": components})
+    return propellants
+
+def generate_pressures(count: int, lower: float = 1e6, upper: float = 6.5e6) -> List[float]:
+    """
+    Generate `count` evenly spaced pressures in Pascals, bounds included.
+    """
+    if count == 1:
+        return [lower]
+    step = (upper - lower) / (count - 1)
+    return [lower + i * step for i in range(count)]
+
+def write_dataset(
+    directory: str,
+    propellant_count: int,
+    component_count: int,
+    seed: int
+) -> Tuple[str, str]:
+    """
+    Generate a dataset and write propellants.json and components.json to a directory.
+
+    Args:
+        directory (str): The output directory.
+        propellant_count (int): Number of propellants.
+        component_count (int): Number of components.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        Tuple[str, str]: Paths to the propellants and components files.
+    """
+    rng = random.Random(seed)
+    components = generate_components(component_count, rng)
+    component_names = [next(iter(item)) for item in components]
+    propellants = generate_propellants(propellant_count, component_names, rng)
+
+    os.makedirs(directory, exist_ok=True)
+    propellants_path = os.path.join(directory, "propellants.json")
+    components_path = os.path.join(directory, "components.json")
+    with open(propellants_path, "w", encoding="utf-8") as file:
+        json.dump(propellants, file)
+    with open(components_path, "w", encoding="utf-8") as file:
+        json.dump(components, file, indent=4)
+    return propellants_path, components_path
@@ -1,15 +1,15 @@
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Optional, Sequence, Tuple
 
-from models import Component
+import numpy as np
+
+from models import ComponentTable
+from propellant_set import PropellantSet
+from region_engine import REGION_COMPONENTS, REGIONS, RegionEngine
 from region_mappers import RegionData
-from utils import (
-    calculate_elemental_composition,
-    calculate_enthalpy,
-    normalize_elemental_composition
-)
+from utils import normalize_elemental_composition
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RegionCalculationResult:
     """
     Data Transfer Object (DTO) for storing the result of calculations for a region.
@@ -24,19 +24,147 @@ class RegionCalculationResult:
     enthalpy: float
     composition: Dict[str, float]
 
+@dataclass(frozen=True, slots=True)
+class RegionJacobian:
+    """
+    Data Transfer Object (DTO) for storing the derivatives of the results of a region.
+
+    Attributes:
+        pressure (float): Pressure in Pascals.
+        parameters (Tuple[str, ...]): Names of the propellant parameters, e.g.
+            "Aluminum.mass_fraction" or "Aluminum.agglomeration_coefficients[0]".
+        enthalpy (Dict[str, float]): Derivatives of the enthalpy with respect to every parameter.
+        composition (Dict[str, Dict[str, float]]): Derivatives of the contribution of every
+            element with respect to every parameter.
+    """
+    pressure: float
+    parameters: Tuple[str, ...]
+    enthalpy: Dict[str, float]
+    composition: Dict[str, Dict[str, float]]
+
+class RegionResultSet:
+    """
+    Array-backed results of the region calculations for N propellants and P pressures.
+
+    Attributes:
+        names (Tuple[str, ...]): Propellant names, shape (N,).
+        pressures (np.ndarray): Pressures in Pascals, shape (P,).
+        elements (Tuple[str, ...]): Element symbols in the order of the composition axis.
+        compositions (np.ndarray): Elemental compositions, shape (N, P, len(REGIONS), E).
+        enthalpies (np.ndarray): Enthalpies in joule per kg, shape (N, P, len(REGIONS)).
+        region_elements (Dict[str, Tuple[str, ...]]): Elements reported for every region.
+        parameters (Optional[Tuple[str, ...]]): Names of the Q propellant parameters of the
+            derivatives, or None if the derivatives were not calculated.
+        composition_derivatives (Optional[np.ndarray]): Derivatives of the compositions,
+            shape (N, P, len(REGIONS), E, Q).
+        enthalpy_derivatives (Optional[np.ndarray]): Derivatives of the enthalpies,
+            shape (N, P, len(REGIONS), Q).
+    """
+    __slots__ = (
+        "names",
+        "pressures",
+        "elements",
+        "compositions",
+        "enthalpies",
+        "region_elements",
+        "parameters",
+        "composition_derivatives",
+        "enthalpy_derivatives"
+    )
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        pressures: np.ndarray,
+        elements: Sequence[str],
+        compositions: np.ndarray,
+        enthalpies: np.ndarray,
+        region_elements: Dict[str, Tuple[str, ...]],
+        parameters: Optional[Sequence[str]] = None,
+        composition_derivatives: Optional[np.ndarray] = None,
+        enthalpy_derivatives: Optional[np.ndarray] = None
+    ):
+        self.names = tuple(names)
+        self.pressures = pressures
+        self.elements = tuple(elements)
+        self.compositions = compositions
+        self.enthalpies = enthalpies
+        self.region_elements = region_elements
+        self.parameters = None if parameters is None else tuple(parameters)
+        self.composition_derivatives = composition_derivatives
+        self.enthalpy_derivatives = enthalpy_derivatives
+
+    def result(self, propellant_index: int, pressure_index: int, region: str) -> RegionCalculationResult:
+        """
+        Return a `RegionCalculationResult` view of a single propellant, pressure and region.
+
+        Args:
+            propellant_index (int): Index of the propellant.
+            pressure_index (int): Index of the pressure.
+            region (str): Name of the region, one of `REGIONS`.
+
+        Returns:
+            RegionCalculationResult: The result of the region.
+        """
+        region_index = REGIONS.index(region)
+        composition = self.compositions[propellant_index, pressure_index, region_index]
+        return RegionCalculationResult(
+            pressure=float(self.pressures[pressure_index]),
+            enthalpy=float(self.enthalpies[propellant_index, pressure_index, region_index]),
+            composition={
+                element: float(composition[self.elements.index(element)])
+                for element in self.region_elements[region]
+            }
+        )
+
+    def jacobian(self, propellant_index: int, pressure_index: int, region: str) -> RegionJacobian:
+        """
+        Return a `RegionJacobian` view of a single propellant, pressure and region.
+
+        Args:
+            propellant_index (int): Index of the propellant.
+            pressure_index (int): Index of the pressure.
+            region (str): Name of the region, one of `REGIONS`.
+
+        Returns:
+            RegionJacobian: The derivatives of the region results.
+
+        Raises:
+            ValueError: If the derivatives were not calculated.
+        """
+        if self.parameters is None:
+            raise ValueError("The derivatives were not calculated, see RegionCalculator.calculate_set.")
+
+        region_index = REGIONS.index(region)
+        composition = self.composition_derivatives[propellant_index, pressure_index, region_index]
+        enthalpy = self.enthalpy_derivatives[propellant_index, pressure_index, region_index]
+        return RegionJacobian(
+            pressure=float(self.pressures[pressure_index]),
+            parameters=self.parameters,
+            enthalpy=dict(zip(self.parameters, enthalpy.tolist())),
+            composition={
+                element: dict(zip(self.parameters, composition[self.elements.index(element)].tolist()))
+                for element in self.region_elements[region]
+            }
+        )
+
 class RegionCalculator:
     """
     Calculates the overall chemical formula, enthalpy, and other properties for a given region.
+    This is a per-item facade over `RegionEngine`; use the engine directly for batches.
 
     Methods:
-        calculate(region_data: RegionData, component_data: Dict[str, Component], pressure: float) -> RegionCalculationResult:
+        calculate(region_data: RegionData, component_data: ComponentTable, pressure: float) -> RegionCalculationResult:
             Calculates the chemical formula, enthalpy, and composition for the region.
+        calculate_set(propellants: PropellantSet, component_data: ComponentTable, pressures, jacobian) -> RegionResultSet:
+            Calculates all regions for many propellants and pressures at once, optionally
+            with the exact derivatives with respect to the propellant parameters.
     """
 
     @staticmethod
     def calculate(
         region_data: RegionData, 
-        component_data: Dict[str, Component], 
+        component_data: ComponentTable, 
         pressure: float
     ) -> RegionCalculationResult:
         """
@@ -44,23 +172,77 @@ class RegionCalculator:
 
         Args:
             region_data (RegionData): A dataclass containing components and their normalized mass fractions.
-            component_data (Dict[str, Component]): A dictionary where keys are component names and values are 
-                `Component` objects containing elemental composition and other properties.
+            component_data (ComponentTable): The component table with precompiled elemental compositions
+                and enthalpies.
             pressure (float): Pressure in Pascals.
 
         Returns:
             RegionCalculationResult: A dataclass containing the calculated pressure, enthalpy, composition.
         """
-        # Calculate the overall elemental composition
-        raw_elemental_composition = calculate_elemental_composition(region_data.components, component_data)
-        normalized_elemental_composition = normalize_elemental_composition(raw_elemental_composition)
+        engine = RegionEngine.for_components(component_data)
 
-        # Calculate the overall enthalpy
-        enthalpy = calculate_enthalpy(region_data.components, component_data)
+        # Calculate the overall elemental composition and enthalpy
+        composition, enthalpy = engine.calculate(engine.component_vector(region_data.components))
+        raw_elemental_composition = engine.composition_dict(
+            composition, engine.region_elements(region_data.components))
+        normalized_elemental_composition = normalize_elemental_composition(raw_elemental_composition)
 
         # Return the results as a DTO
         return RegionCalculationResult(
             pressure=pressure,
-            enthalpy=enthalpy,
+            enthalpy=float(enthalpy),
             composition=normalized_elemental_composition
         )
+
+    @staticmethod
+    def calculate_set(
+        propellants: PropellantSet,
+        component_data: ComponentTable,
+        pressures: Sequence[float],
+        jacobian: bool = False
+    ) -> RegionResultSet:
+        """
+        Calculate the enthalpy and composition of every region for many propellants and pressures.
+
+        With `jacobian`, the exact derivatives of the compositions and enthalpies with respect to
+        the component mass fractions, the large particles fractions and the agglomeration
+        coefficients are calculated in the same pass, replacing finite differences over
+        repeated runs.
+
+        Args:
+            propellants (PropellantSet): Columnar propellant properties.
+            component_data (ComponentTable): The component table.
+            pressures (Sequence[float]): Pressures in Pascals.
+            jacobian (bool): Whether to calculate the derivatives as well.
+
+        Returns:
+            RegionResultSet: The array-backed results.
+        """
+        engine = RegionEngine.for_components(component_data)
+        pressures = np.asarray(pressures, dtype=float)
+        region_elements = {region: engine.region_elements(REGION_COMPONENTS[region]) for region in REGIONS}
+
+        if not jacobian:
+            compositions, enthalpies = engine.calculate_regions(propellants, pressures)
+            return RegionResultSet(
+                names=propellants.names,
+                pressures=pressures,
+                elements=engine.elements,
+                compositions=compositions,
+                enthalpies=enthalpies,
+                region_elements=region_elements
+            )
+
+        compositions, enthalpies, composition_derivatives, enthalpy_derivatives, parameters = (
+            engine.calculate_regions_with_jacobian(propellants, pressures))
+        return RegionResultSet(
+            names=propellants.names,
+            pressures=pressures,
+            elements=engine.elements,
+            compositions=compositions,
+            enthalpies=enthalpies,
+            region_elements=region_elements,
+            parameters=parameters,
+            composition_derivatives=composition_derivatives,
+            enthalpy_derivatives=enthalpy_derivatives
+        )
@@ -0,0 +1,74 @@
+"""
+This module contains the command-line helpers shared by the entry scripts of the region mapper
+(`main`, `monte_carlo` and `sweep`), so that no module has to import an entry script.
+
+Functions:
+    - parse_pressures: Parses pressure sweep values into a list of unique pressures.
+    - format_pressure: Formats a pressure as an output directory name.
+    - ensure_directory_exists: Creates a directory if it does not exist.
+"""
+
+import os
+
+from typing import List
+
+def parse_pressures(values: List[str]) -> List[float]:
+    """
+    Parse the pressure sweep values into a list of unique pressures.
+
+    Args:
+        values (List[str]): Single pressures (e.g., "1e6") or ranges "start:stop:count".
+
+    Returns:
+        List[float]: Pressures in Pascals in the order of their first appearance.
+
+    Raises:
+        ValueError: If a value or a range is malformed.
+    """
+    pressures = []
+    for value in values:
+        parts = value.split(":")
+        if len(parts) == 1:
+            pressures.append(float(value))
+            continue
+        if len(parts) != 3:
+            raise ValueError(f"Invalid pressure range '{value}', expected 'start:stop:count'.")
+
+        start, stop, count = float(parts[0]), float(parts[1]), int(parts[2])
+        if count < 1:
+            raise ValueError(f"Invalid pressure range '{value}', count must be positive.")
+        if count == 1:
+            pressures.append(start)
+            continue
+        step = (stop - start) / (count - 1)
+        pressures.extend(start + i * step for i in range(count - 1))
+        pressures.append(stop)
+
+    # Drop duplicates, as they would be written to the same directory
+    return list(dict.fromkeys(pressures))
+
+def format_pressure(pressure: float) -> str:
+    """
+    Format a pressure as a directory name, matching the naming used by the .NET host
+    (e.g., 1000000 for 1e6 and 1611111.1111111112 for fractional values).
+
+    Args:
+        pressure (float): Pressure in Pascals.
+
+    Returns:
+        str: The directory name for the pressure.
+    """
+    if pressure.is_integer():
+        return str(int(pressure))
+    return repr(pressure)
+
+def ensure_directory_exists(directory_path):
+    """
+    Ensure that the directory exists. If not, create it.
+
+    Args:
+        directory_path (str): The path to the directory.
+    """
+    if not os.path.exists(directory_path):
+        os.makedirs(directory_path, exist_ok=True)
+        print(f"Created directory: {directory_path}")
@@ -1,25 +1,27 @@
 import json
 
-from typing import Dict, List
-from models import Component, Propellant, PropellantComponent
+from typing import Iterator, List, Sequence
+from models import Component, ComponentTable, Propellant, PropellantComponent
+from propellant_set import DEFAULT_COMPONENT_NAMES, PropellantSet
 
-def read_components(file_path: str) -> Dict[str, Component]:
+def read_components(file_path: str) -> ComponentTable:
     """
-    Reads the components.json file and returns a dictionary of Component objects.
+    Reads the components.json file and returns an immutable table of Component objects
+    with precompiled molar masses and elemental compositions.
     """
     with open(file_path, 'r', encoding='utf-8') as file:
         data = json.load(file)
 
-    components = {}
+    components = []
     for item in data:
         # Extract the first key-value pair in the dictionary
         component_name, component_data = next(iter(item.items()))
-        components[component_name] = Component(
+        components.append(Component(
             name=component_name,
             composition=component_data.get("composition", {}),
             enthalpy=component_data.get("enthalpy", 0.0)
-        )
-    return components
+        ))
+    return ComponentTable(components)
 
 def read_propellants(file_path: str) -> List[Propellant]:
     """
@@ -28,19 +30,96 @@ def read_propellants(file_path: str) -> List[Propellant]:
     with open(file_path, 'r', encoding='utf-8') as file:
         data = json.load(file)
 
-    propellants = []
-    for item in data:
-        propellant_name = item.get("name")
-        propellant_data = item.get("components", {})
-        if not isinstance(propellant_data, dict):
-            raise ValueError(f"Expected a dictionary for propellant data, but got {type(propellant_data)}")
-
-        components = {
-            component_name: parse_propellant_component(component_data)
-            for component_name, component_data in propellant_data.items()
-        }
-        propellants.append(Propellant(name=propellant_name, components=components))
-    return propellants
+    return [parse_propellant(item) for item in data]
+
+def iter_propellants(file_path: str, chunk_size: int = 1 << 16) -> Iterator[Propellant]:
+    """
+    Reads Propellant objects one at a time from a top-level JSON array or a JSON Lines file,
+    keeping at most one record and one chunk of the file in memory.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for item in iter_json_records(file, chunk_size):
+            yield parse_propellant(item)
+
+def read_propellant_set(
+    file_path: str,
+    component_names: Sequence[str] = DEFAULT_COMPONENT_NAMES
+) -> PropellantSet:
+    """
+    Reads a JSON array or JSON Lines propellants file into a columnar PropellantSet,
+    without materializing the records.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return PropellantSet.from_records(iter_json_records(file), component_names)
+
+def iter_json_records(file, chunk_size: int = 1 << 16) -> Iterator[object]:
+    """
+    Incrementally decodes the records of a top-level JSON array or of JSON Lines from a text file.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    in_array = None
+
+    while True:
+        # Skip whitespace and the separators between records
+        while position < len(buffer) and (buffer[position].isspace() or (in_array and buffer[position] == ",")):
+            position += 1
+
+        if position == len(buffer):
+            if eof:
+                break
+            buffer, position = file.read(chunk_size), 0
+            eof = not buffer
+            continue
+
+        if in_array is None:
+            in_array = buffer[position] == "["
+            if in_array:
+                position += 1
+            continue
+        if in_array and buffer[position] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            item, end = None, None
+
+        # A record is complete only when a delimiter follows it, as a chunk may split a number
+        # after a prefix that is a valid number itself, e.g. "1." of "1.25"
+        if end is None or not (_is_record_delimiter(buffer[end]) if end < len(buffer) else eof):
+            if eof:
+                raise ValueError(f"Invalid JSON record at offset {position} of the propellants file")
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+
+        position = end
+        yield item
+
+    if in_array:
+        raise ValueError("Unterminated JSON array in the propellants file")
+
+def _is_record_delimiter(character: str) -> bool:
+    return character.isspace() or character in ",]"
+
+def parse_propellant(item: dict) -> Propellant:
+    """
+    Parses a single Propellant from a dictionary.
+    """
+    propellant_name = item.get("name")
+    propellant_data = item.get("components", {})
+    if not isinstance(propellant_data, dict):
+        raise ValueError(f"Expected a dictionary for propellant data, but got {type(propellant_data)}")
+
+    components = {
+        component_name: parse_propellant_component(component_data)
+        for component_name, component_data in propellant_data.items()
+    }
+    return Propellant(name=propellant_name, components=components)
 
 def parse_propellant_component(data: dict) -> PropellantComponent:
     """
@@ -49,5 +128,6 @@ def parse_propellant_component(data: dict) -> PropellantComponent:
     return PropellantComponent(
         mass_fraction=data.get("mass_fraction", 0.0),
         large_particles_fraction=data.get("large_particles_fraction"),
-        agglomeration_coefficients=data.get("agglomeration_coefficients", [])
+        agglomeration_coefficients=data.get("agglomeration_coefficients", []),
+        density=data.get("density")
     )
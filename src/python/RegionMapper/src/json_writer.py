@@ -1,17 +1,23 @@
 import json
+import os
 
-from typing import Dict
-from dataclasses import asdict
-
-from calculators import RegionCalculationResult
+from calculators import RegionCalculationResult, RegionJacobian
+from porosity_stage import PorosityCalculationResult, porosity_result_to_dict
 
 class JSONWriter:
     """
-    Writes the results of region calculations to a JSON file.
+    Writes the results of region calculations to a JSON file. Files are replaced atomically,
+    so readers never observe a partially written result.
 
     Methods:
         write(result: RegionCalculationResult, file_path: str) -> None:
             Writes the calculation result to the specified file in JSON format.
+        write_jacobian(jacobian: RegionJacobian, file_path: str) -> None:
+            Writes the derivatives of a calculation result to the specified file in JSON format.
+        write_porosity(result: PorosityCalculationResult, file_path: str) -> None:
+            Writes the porosity of a propellant to the specified file in JSON format.
+        write_dict(data: dict, file_path: str) -> None:
+            Writes any JSON-serializable dictionary to the specified file atomically.
     """
 
     @staticmethod
@@ -31,11 +37,64 @@ class JSONWriter:
             )
             JSONWriter.write(result, "output.json")
         """
-        # Convert the dataclass to a dictionary
-        result_dict = asdict(result)
+        # Convert the dataclass to a dictionary without deep-copying the composition
+        result_dict = {
+            "pressure": result.pressure,
+            "enthalpy": result.enthalpy,
+            "composition": result.composition
+        }
 
-        # Write the dictionary to a JSON file
-        with open(file_path, "w", encoding="utf-8") as file:
-            json.dump(result_dict, file, indent=4, ensure_ascii=False)
+        JSONWriter.write_dict(result_dict, file_path)
 
         print(f"Results successfully written to {file_path}")
+
+    @staticmethod
+    def write_jacobian(jacobian: RegionJacobian, file_path: str) -> None:
+        """
+        Write the derivatives of a calculation result to a JSON file.
+
+        Args:
+            jacobian (RegionJacobian): The derivatives of the region calculation result.
+            file_path (str): The path to the output JSON file.
+        """
+        jacobian_dict = {
+            "pressure": jacobian.pressure,
+            "parameters": list(jacobian.parameters),
+            "enthalpy": jacobian.enthalpy,
+            "composition": jacobian.composition
+        }
+        JSONWriter.write_dict(jacobian_dict, file_path)
+
+        print(f"Derivatives successfully written to {file_path}")
+
+    @staticmethod
+    def write_porosity(result: PorosityCalculationResult, file_path: str) -> None:
+        """
+        Write the porosity of a propellant to a JSON file, in the layout of the porosity calculator.
+
+        Args:
+            result (PorosityCalculationResult): The porosity calculation result.
+            file_path (str): The path to the output JSON file.
+        """
+        JSONWriter.write_dict(porosity_result_to_dict(result), file_path)
+
+        print(f"Porosity successfully written to {file_path}")
+
+    @staticmethod
+    def write_dict(data: dict, file_path: str) -> None:
+        """
+        Write a dictionary to a temporary file next to the target and move it into place.
+
+        Args:
+            data (dict): The JSON-serializable dictionary.
+            file_path (str): The path to the output JSON file.
+        """
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(data, file, indent=4, ensure_ascii=False)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
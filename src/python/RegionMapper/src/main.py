@@ -1,16 +1,46 @@
 import argparse
+import io
+import itertools
 import os
 import sys
 
-from json_reader import read_components, read_propellants
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import replace
+from typing import Iterable, Iterator, List, Tuple, Union
+
+from cli_utils import ensure_directory_exists, format_pressure, parse_pressures
+from json_reader import iter_propellants, read_components, read_propellants
 from region_mappers import (
     InterPocketRegionMapper,
     PocketRegionWithoutSkeletonMapper,
     PocketRegionWithSkeletonMapper,
     DiffusionRegionMapper
 )
-from calculators import RegionCalculator
+from calculators import RegionCalculationResult, RegionCalculator, RegionJacobian
 from json_writer import JSONWriter
+from porosity_stage import POROSITY_FILE_NAME, PorosityCalculationResult, calculate_porosity
+from propellant_set import PropellantSet
+from region_engine import REGION_COMPONENTS, REGIONS, RegionEngine
+from region_store import RegionStoreWriter
+from result_cache import ResultCache
+
+REGION_FILE_NAMES = (
+    "inter_pocket.json",
+    "pocket_without_skeleton.json",
+    "pocket_with_skeleton.json",
+    "diffusion.json"
+)
+
+# Derivative files written next to the region files with --jacobian, in region order
+JACOBIAN_FILE_NAMES = tuple(f"{region}.jacobian.json" for region in REGIONS)
+
+# Number of tasks per worker that may be in flight at once
+WORKER_QUEUE_FACTOR = 2
+
+# Number of propellants evaluated at once for the binary region store
+STORE_CHUNK_SIZE = 1024
 
 def parse_args():
     """
@@ -32,38 +62,369 @@ def parse_args():
         required=True,
         help="Path to the components JSON file (e.g., components.json)."
     )
-    parser.add_argument(
+    pressure_group = parser.add_mutually_exclusive_group(required=True)
+    pressure_group.add_argument(
         "--pressure",
         type=float,
-        required=True,
-        help="Pressure in Pascals (e.g., 1e6)."
+        help="Pressure in Pascals (e.g., 1e6). Results are written directly to the output directory."
+    )
+    pressure_group.add_argument(
+        "--pressures",
+        nargs="+",
+        help=(
+            "Pressures in Pascals for a sweep computed in one run. Each value is either a single "
+            "pressure (e.g., 1e6) or a range 'start:stop:count' with evenly spaced, inclusive "
+            "bounds (e.g., 1e6:6.5e6:10). Results are written to '<output-dir>/<pressure>/'."
+        )
     )
     parser.add_argument(
         "--output-dir",
         required=True,
         help="Path to the output directory where results will be stored."
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes the propellants are spread across (default: 1)."
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Read the propellants incrementally from a JSON array or a JSON Lines file and "
+            "process them as they are read, keeping memory bounded for large datasets."
+        )
+    )
+    parser.add_argument(
+        "--jacobian",
+        action="store_true",
+        help=(
+            "Also write the exact derivatives of every region's enthalpy and composition with respect "
+            "to the mass fractions, large particles fractions and agglomeration coefficients to "
+            "'<region>.jacobian.json' next to the region files."
+        )
+    )
+    parser.add_argument(
+        "--porosity",
+        action="store_true",
+        help=(
+            f"Also calculate the porosity from the pocket region without skeleton in the same process "
+            f"and write it to '{POROSITY_FILE_NAME}' next to the region files."
+        )
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=("json", "npy", "both"),
+        default="json",
+        help=(
+            "Output format: per-region JSON files (default), a binary region store "
+            "'region_store.npy' with its header 'region_store.json' in the output directory, or both."
+        )
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recalculate all results, even those recorded as up to date in the output directory."
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Print the number of cache hits and misses after the run."
+    )
 
     # Parse arguments
     args = parser.parse_args()
 
     # Validate arguments
-    if args.pressure <= 0:
+    if args.pressures is not None:
+        try:
+            args.pressures = parse_pressures(args.pressures)
+        except ValueError as e:
+            parser.error(str(e))
+        if any(pressure <= 0 for pressure in args.pressures):
+            parser.error("Pressures must be positive values.")
+    elif args.pressure <= 0:
         parser.error("Pressure must be a positive value.")
+    if args.workers < 1:
+        parser.error("Number of workers must be a positive value.")
+    if args.jacobian and args.output_format == "npy":
+        parser.error("Derivatives are only written with the JSON output format.")
+    if args.porosity and args.output_format == "npy":
+        parser.error("Porosity is only written with the JSON output format.")
 
     return args
 
 
-def ensure_directory_exists(directory_path):
+def calculate_propellant(
+    propellant,
+    components,
+    pressure_output_dirs: List[Tuple[float, str]],
+    jacobian: bool = False,
+    porosity: bool = False
+) -> Iterator[Tuple[str, List[Tuple[str, Union[RegionCalculationResult, RegionJacobian, PorosityCalculationResult]]]]]:
+    """
+    Lazily calculate the region results of a propellant for all requested pressures.
+
+    The inter-pocket and pocket regions do not depend on pressure, so they are calculated
+    once and reused for every pressure; only the diffusion region is recalculated.
+
+    Args:
+        propellant (Propellant): The propellant to process.
+        components (ComponentTable): The component data.
+        pressure_output_dirs (List[Tuple[float, str]]): Pairs of pressure in Pascals and
+            the output directory for that pressure.
+        jacobian (bool): Whether to calculate the derivatives of the results as well.
+        porosity (bool): Whether to calculate the porosity from the pocket region as well.
+
+    Yields:
+        Tuple[str, List[Tuple[str, Union[RegionCalculationResult, RegionJacobian, PorosityCalculationResult]]]]:
+            The propellant output directory of a pressure and the result to write to every region
+            file in it, followed by the derivatives to write to every jacobian file and the
+            porosity if requested.
+    """
+    # Initialize mappers
+    inter_pocket_mapper = InterPocketRegionMapper()
+    pocket_without_skeleton_mapper = PocketRegionWithoutSkeletonMapper()
+    pocket_with_skeleton_mapper = PocketRegionWithSkeletonMapper()
+    diffusion_mapper = DiffusionRegionMapper()
+
+    # Perform calculations for the pressure-independent regions
+    first_pressure = pressure_output_dirs[0][0]
+    inter_pocket_result = RegionCalculator.calculate(
+        inter_pocket_mapper.calculate(propellant), components, first_pressure)
+    pocket_without_skeleton_result = RegionCalculator.calculate(
+        pocket_without_skeleton_mapper.calculate(propellant), components, first_pressure)
+    pocket_with_skeleton_result = RegionCalculator.calculate(
+        pocket_with_skeleton_mapper.calculate(propellant), components, first_pressure)
+
+    # The porosity only depends on the pressure-independent pocket region
+    porosity_result = None
+    if porosity:
+        porosity_result = calculate_porosity(propellant, pocket_without_skeleton_result)
+
+    # The derivatives of all regions and pressures are calculated in one batched pass
+    derivatives = None
+    if jacobian:
+        derivatives = RegionCalculator.calculate_set(
+            PropellantSet.from_propellants([propellant], tuple(components)),
+            components,
+            [pressure for pressure, _ in pressure_output_dirs],
+            jacobian=True
+        )
+
+    for pressure_index, (pressure, output_dir) in enumerate(pressure_output_dirs):
+        propellant_output_dir = os.path.join(output_dir, propellant.name)
+
+        # Only the diffusion region depends on pressure
+        diffusion_data = diffusion_mapper.calculate(propellant, pressure)
+        diffusion_result = RegionCalculator.calculate(diffusion_data, components, pressure)
+
+        results = (
+            replace(inter_pocket_result, pressure=pressure),
+            replace(pocket_without_skeleton_result, pressure=pressure),
+            replace(pocket_with_skeleton_result, pressure=pressure),
+            diffusion_result
+        )
+        files = [
+            (os.path.join(propellant_output_dir, file_name), result)
+            for file_name, result in zip(REGION_FILE_NAMES, results)
+        ]
+        if derivatives is not None:
+            files.extend(
+                (os.path.join(propellant_output_dir, file_name), derivatives.jacobian(0, pressure_index, region))
+                for file_name, region in zip(JACOBIAN_FILE_NAMES, REGIONS)
+            )
+        if porosity_result is not None:
+            files.append((
+                os.path.join(propellant_output_dir, POROSITY_FILE_NAME),
+                replace(porosity_result, region_input=results[1])
+            ))
+        yield propellant_output_dir, files
+
+
+def write_propellant(
+    propellant_name: str,
+    calculated: Iterable[
+        Tuple[str, List[Tuple[str, Union[RegionCalculationResult, RegionJacobian, PorosityCalculationResult]]]]]
+) -> None:
+    """
+    Write the region results of a propellant as they are calculated.
+
+    Args:
+        propellant_name (str): The name of the propellant.
+        calculated (Iterable[Tuple[str, List[Tuple[str, Union[RegionCalculationResult, RegionJacobian,
+            PorosityCalculationResult]]]]]):
+            Output directories and their results, see `calculate_propellant`.
+    """
+    for propellant_output_dir, results in calculated:
+        # Create a subdirectory for the propellant
+        ensure_directory_exists(propellant_output_dir)
+
+        # Write results to JSON files
+        for file_path, result in results:
+            if isinstance(result, RegionJacobian):
+                JSONWriter.write_jacobian(result, file_path)
+            elif isinstance(result, PorosityCalculationResult):
+                JSONWriter.write_porosity(result, file_path)
+            else:
+                JSONWriter.write(result, file_path)
+
+        print(f"All results for propellant '{propellant_name}' successfully written to '{propellant_output_dir}'.")
+
+
+def process_propellant(
+    propellant,
+    components,
+    pressure_output_dirs: List[Tuple[float, str]],
+    jacobian: bool = False,
+    porosity: bool = False
+):
+    """
+    Calculate and export region data of a propellant for all requested pressures.
+
+    Args:
+        propellant (Propellant): The propellant to process.
+        components (ComponentTable): The component data.
+        pressure_output_dirs (List[Tuple[float, str]]): Pairs of pressure in Pascals and
+            the output directory for that pressure.
+        jacobian (bool): Whether to export the derivatives of the results as well.
+        porosity (bool): Whether to export the porosity as well.
+    """
+    write_propellant(
+        propellant.name, calculate_propellant(propellant, components, pressure_output_dirs, jacobian, porosity))
+
+
+def select_stale_tasks(
+    propellants: Iterable,
+    pressure_output_dirs: List[Tuple[float, str]],
+    cache: ResultCache,
+    components_digest: str
+) -> Iterator[Tuple[object, List[Tuple[float, str, str, str]]]]:
+    """
+    Lazily pair every propellant with the pressures whose results are not up to date.
+
+    Args:
+        propellants (Iterable[Propellant]): The propellants to process.
+        pressure_output_dirs (List[Tuple[float, str]]): Pairs of pressure in Pascals and
+            the output directory for that pressure.
+        cache (ResultCache): The result cache of the output directory.
+        components_digest (str): Digest of the component table.
+
+    Yields:
+        Tuple[Propellant, List[Tuple[float, str, str, str]]]: A propellant and its stale
+            pressures as (pressure, output directory, propellant output directory, cache key).
+    """
+    for propellant in propellants:
+        stale_output_dirs = []
+        for pressure, output_dir in pressure_output_dirs:
+            propellant_output_dir = os.path.join(output_dir, propellant.name)
+            key = ResultCache.key(propellant, components_digest, pressure)
+            if cache.is_up_to_date(propellant_output_dir, key):
+                print(f"Results for propellant '{propellant.name}' in '{propellant_output_dir}' are up to date.")
+            else:
+                stale_output_dirs.append((pressure, output_dir, propellant_output_dir, key))
+        if stale_output_dirs:
+            yield propellant, stale_output_dirs
+
+
+def write_region_store(propellants: Iterable, components, pressures: List[float], output_dir: str) -> None:
+    """
+    Calculate the region results of all propellants with the batched engine and write them
+    to the binary region store of the output directory.
+
+    Args:
+        propellants (Iterable[Propellant]): The propellants to process.
+        components (ComponentTable): The component data.
+        pressures (List[float]): Pressures in Pascals.
+        output_dir (str): The output directory holding the store.
+    """
+    engine = RegionEngine.for_components(components)
+    region_elements = {region: engine.region_elements(REGION_COMPONENTS[region]) for region in REGIONS}
+    propellants = iter(propellants)
+
+    with RegionStoreWriter(output_dir, engine.elements, region_elements, pressures) as writer:
+        while True:
+            chunk = list(itertools.islice(propellants, STORE_CHUNK_SIZE))
+            if not chunk:
+                break
+            propellant_set = PropellantSet.from_propellants(chunk, tuple(components))
+            writer.append(RegionCalculator.calculate_set(propellant_set, components, pressures))
+
+    print(f"Region store with {writer.count} records successfully written to '{output_dir}'.")
+
+
+# Component data of the current worker process, set once by the pool initializer
+_worker_components = None
+
+
+def _init_worker(components):
+    """
+    Store the component data in a worker process of the pool.
     """
-    Ensure that the directory exists. If not, create it.
+    global _worker_components
+    _worker_components = components
+
+
+def _process_propellant_in_worker(
+    propellant,
+    pressure_output_dirs: List[Tuple[float, str]],
+    jacobian: bool,
+    porosity: bool
+) -> str:
+    """
+    Process a propellant in a worker process and return its captured console output,
+    so that the main process can print the outputs in the sequential order.
+    """
+    output = io.StringIO()
+    with redirect_stdout(output):
+        process_propellant(propellant, _worker_components, pressure_output_dirs, jacobian, porosity)
+    return output.getvalue()
+
+
+def run_tasks(tasks: Iterable, components, workers: int, jacobian: bool = False, porosity: bool = False) -> Iterator:
+    """
+    Process the tasks from `select_stale_tasks`, yielding every task once it is written.
+
+    With several workers, at most a bounded window of tasks is in flight at once and the
+    tasks are yielded in submission order, which keeps memory bounded and the console
+    output identical to the sequential mode.
 
     Args:
-        directory_path (str): The path to the directory.
+        tasks (Iterable): Pairs of a propellant and its stale pressures.
+        components (ComponentTable): The component data.
+        workers (int): Number of worker processes.
+        jacobian (bool): Whether to export the derivatives of the results as well.
+        porosity (bool): Whether to export the porosity as well.
+
+    Yields:
+        Tuple[Propellant, List[Tuple[float, str, str, str]]]: The processed tasks.
     """
-    if not os.path.exists(directory_path):
-        os.makedirs(directory_path)
-        print(f"Created directory: {directory_path}")
+    if workers == 1:
+        for propellant, stale_output_dirs in tasks:
+            process_propellant(propellant, components, [item[:2] for item in stale_output_dirs], jacobian, porosity)
+            yield propellant, stale_output_dirs
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(components,)
+    ) as executor:
+        pending = deque()
+        for task in tasks:
+            propellant, stale_output_dirs = task
+            future = executor.submit(
+                _process_propellant_in_worker, propellant, [item[:2] for item in stale_output_dirs], jacobian, porosity)
+            pending.append((task, future))
+            if len(pending) >= WORKER_QUEUE_FACTOR * workers:
+                task, future = pending.popleft()
+                sys.stdout.write(future.result())
+                yield task
+        while pending:
+            task, future = pending.popleft()
+            sys.stdout.write(future.result())
+            yield task
 
 
 def main():
@@ -76,48 +437,54 @@ def main():
 
         # Load data
         components = read_components(args.components)
-        propellants = read_propellants(args.propellants)
+        if args.stream:
+            propellants = iter_propellants(args.propellants)
+        else:
+            propellants = read_propellants(args.propellants)
+
+        # Resolve the output directory of every pressure
+        if args.pressures is None:
+            pressure_output_dirs = [(args.pressure, args.output_dir)]
+        else:
+            pressure_output_dirs = [
+                (pressure, os.path.join(args.output_dir, format_pressure(pressure)))
+                for pressure in args.pressures
+            ]
 
         # Ensure the output directory exists
         ensure_directory_exists(args.output_dir)
 
-        # Process each propellant
-        for propellant in propellants:
-            # Create a subdirectory for the propellant
-            propellant_output_dir = os.path.join(args.output_dir, propellant.name)
-            ensure_directory_exists(propellant_output_dir)
-
-            # Initialize mappers
-            inter_pocket_mapper = InterPocketRegionMapper()
-            pocket_without_skeleton_mapper = PocketRegionWithoutSkeletonMapper()
-            pocket_with_skeleton_mapper = PocketRegionWithSkeletonMapper()
-            diffusion_mapper = DiffusionRegionMapper()
-
-            # Perform calculations for each region
-            inter_pocket_data = inter_pocket_mapper.calculate(propellant)
-            pocket_without_skeleton_data = pocket_without_skeleton_mapper.calculate(propellant)
-            pocket_with_skeleton_data = pocket_with_skeleton_mapper.calculate(propellant)
-            diffusion_data = diffusion_mapper.calculate(propellant, args.pressure)
-
-            # Calculate results using RegionCalculator
-            inter_pocket_result = RegionCalculator.calculate(inter_pocket_data, components, args.pressure)
-            pocket_without_skeleton_result = RegionCalculator.calculate(pocket_without_skeleton_data, components, args.pressure)
-            pocket_with_skeleton_result = RegionCalculator.calculate(pocket_with_skeleton_data, components, args.pressure)
-            diffusion_result = RegionCalculator.calculate(diffusion_data, components, args.pressure)
-
-            # Define output file paths
-            inter_pocket_file = os.path.join(propellant_output_dir, "inter_pocket.json")
-            pocket_without_skeleton_file = os.path.join(propellant_output_dir, "pocket_without_skeleton.json")
-            pocket_with_skeleton_file = os.path.join(propellant_output_dir, "pocket_with_skeleton.json")
-            diffusion_file = os.path.join(propellant_output_dir, "diffusion.json")
-
-            # Write results to JSON files
-            JSONWriter.write(inter_pocket_result, inter_pocket_file)
-            JSONWriter.write(pocket_without_skeleton_result, pocket_without_skeleton_file)
-            JSONWriter.write(pocket_with_skeleton_result, pocket_with_skeleton_file)
-            JSONWriter.write(diffusion_result, diffusion_file)
-
-            print(f"All results for propellant '{propellant.name}' successfully written to '{propellant_output_dir}'.")
+        if args.output_format in ("json", "both"):
+            for _, output_dir in pressure_output_dirs:
+                ensure_directory_exists(output_dir)
+
+            # Skip the pressures whose results are up to date
+            file_names = REGION_FILE_NAMES + (JACOBIAN_FILE_NAMES if args.jacobian else ()) \
+                + ((POROSITY_FILE_NAME,) if args.porosity else ())
+            cache = ResultCache(args.output_dir, file_names, enabled=not args.no_cache)
+            components_digest = ResultCache.components_digest(components)
+            tasks = select_stale_tasks(propellants, pressure_output_dirs, cache, components_digest)
+            if not args.stream:
+                # Look up every propellant first, so stale entries are dropped from the manifest
+                # before any result is rewritten
+                tasks = list(tasks)
+                cache.save()
+
+            # Process each propellant and record the calculated results
+            for _, stale_output_dirs in run_tasks(tasks, components, args.workers, args.jacobian, args.porosity):
+                for _, _, propellant_output_dir, key in stale_output_dirs:
+                    cache.record(propellant_output_dir, key)
+            cache.save()
+
+            if args.cache_stats:
+                print(cache.format_stats())
+
+        if args.output_format in ("npy", "both"):
+            if args.stream and args.output_format == "both":
+                # The propellant stream was consumed by the JSON output
+                propellants = iter_propellants(args.propellants)
+            write_region_store(
+                propellants, components, [pressure for pressure, _ in pressure_output_dirs], args.output_dir)
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -1,7 +1,11 @@
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Optional, Dict, List
+from types import MappingProxyType
+from typing import Optional, Dict, Iterable, Iterator, List
 
-@dataclass(frozen=True)
+from molar_masses import ELEMENT_MOLAR_MASSES
+
+@dataclass(frozen=True, slots=True)
 class Component:
     """
     Represents a chemical component with its composition and enthalpy.
@@ -25,7 +29,93 @@ class Component:
     enthalpy: float
 
 
-@dataclass(frozen=True)
+class ComponentTable(Mapping):
+    """
+    Immutable table of components with precompiled molar masses and elemental compositions.
+
+    The table behaves as a read-only mapping from component names to `Component` objects.
+    Molar masses and elemental compositions per kilogram are computed once when the table
+    is built, so unknown elements are reported at load time rather than during calculations.
+
+    Methods:
+        molar_mass(name: str) -> float:
+            Returns the molar mass of the component in kg/mol.
+        specific_composition(name: str) -> Mapping[str, float]:
+            Returns the moles of every element per kilogram of the component.
+
+    Example:
+        >>> table = ComponentTable([Component(name="Aluminum", composition={"Al": 1}, enthalpy=0.0)])
+        >>> table.molar_mass("Aluminum")
+        0.0269815385
+        >>> table.specific_composition("Aluminum")
+        mappingproxy({'Al': 37.0623787816992})
+    """
+    __slots__ = ("_components", "_molar_masses", "_specific_compositions")
+
+    def __init__(self, components: Iterable[Component]):
+        """
+        Build the table and precompile molar masses and elemental compositions.
+
+        Args:
+            components (Iterable[Component]): The components of the table.
+
+        Raises:
+            KeyError: If any element is not found in the `ELEMENT_MOLAR_MASSES` database.
+            ValueError: If a component has a non-positive molar mass.
+        """
+        table = {}
+        molar_masses = {}
+        specific_compositions = {}
+        for component in components:
+            molar_mass = 0.0
+            for element, count in component.composition.items():
+                if element not in ELEMENT_MOLAR_MASSES:
+                    raise KeyError(
+                        f"Element '{element}' of component '{component.name}' not found in molar mass database.")
+                molar_mass += ELEMENT_MOLAR_MASSES[element] * count
+            if molar_mass <= 0:
+                raise ValueError(f"Molar mass of component '{component.name}' must be greater than zero.")
+
+            table[component.name] = component
+            molar_masses[component.name] = molar_mass
+            specific_compositions[component.name] = MappingProxyType({
+                element: count / molar_mass for element, count in component.composition.items()
+            })
+
+        self._components = MappingProxyType(table)
+        self._molar_masses = MappingProxyType(molar_masses)
+        self._specific_compositions = MappingProxyType(specific_compositions)
+
+    def __getitem__(self, name: str) -> Component:
+        return self._components[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._components)
+
+    def __len__(self) -> int:
+        return len(self._components)
+
+    def __reduce__(self):
+        # Mapping proxies cannot be pickled, so the table is rebuilt from its components
+        return ComponentTable, (list(self._components.values()),)
+
+    def __repr__(self) -> str:
+        return f"ComponentTable({list(self._components.values())!r})"
+
+    def molar_mass(self, name: str) -> float:
+        """
+        Return the molar mass of a component in kg/mol.
+        """
+        return self._molar_masses[name]
+
+    def specific_composition(self, name: str) -> Mapping:
+        """
+        Return the moles of every element per kilogram of a component.
+        """
+        return self._specific_compositions[name]
+
+
+@dataclass(frozen=True, slots=True)
 class PropellantComponent:
     """
     Represents a component of a propellant with its mass fraction and optional properties.
@@ -36,6 +126,8 @@ class PropellantComponent:
             Defaults to None if not applicable.
         agglomeration_coefficients (Optional[List[float]]): Coefficients used to calculate agglomeration effects.
             Defaults to None if not applicable.
+        density (Optional[float]): The density of the component in kg/m^3, used for the porosity.
+            Defaults to None if not given.
 
     Example:
         >>> PropellantComponent(
@@ -48,9 +140,10 @@ class PropellantComponent:
     mass_fraction: float
     large_particles_fraction: Optional[float]
     agglomeration_coefficients: Optional[List[float]]
+    density: Optional[float] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Propellant:
     """
     Represents a propellant composed of multiple components.
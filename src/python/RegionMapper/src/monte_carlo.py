@@ -0,0 +1,376 @@
+"""
+This module contains the Monte Carlo uncertainty propagation of the region results.
+
+For every propellant, S samples of its inputs are drawn at once:
+    - mass fractions: relative normal noise, renormalized to the original mass fraction sum;
+    - large particles fractions: absolute normal noise, clipped to [0, 1];
+    - agglomeration coefficients: a relative normal scale of the whole polynomial per sample,
+      which keeps the shape of the fitted curve instead of perturbing its coefficients
+      independently.
+
+The samples form a `PropellantSet` that is evaluated for all regions in batched array
+computations. Pressure-invariant regions are evaluated once, the pressure-dependent regions
+in chunks of pressures to bound memory. The mean, the standard
+deviation and the requested percentiles of every region enthalpy and element contribution
+are reported per pressure.
+
+Classes:
+    - UncertaintyModel: Spreads of the sampled inputs.
+    - RegionStatistics: Per-pressure statistics of the regions of a propellant.
+
+Functions:
+    - sample_propellant: Draws the input samples of a propellant.
+    - propagate: Evaluates the samples and reduces them to statistics.
+
+Usage:
+    python3 monte_carlo.py --propellants propellants.json --components ../data/components.json \
+        --pressures 1e6:6.5e6:50 --samples 100000 --output-dir output
+"""
+
+import argparse
+import os
+import sys
+
+from dataclasses import asdict, dataclass
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from cli_utils import ensure_directory_exists, parse_pressures
+from json_reader import read_components, read_propellant_set
+from json_writer import JSONWriter
+from models import ComponentTable
+from propellant_set import PropellantSet
+from region_engine import REGION_COMPONENTS, REGIONS, RegionEngine
+from region_specs import REGION_SPECS, CompiledRegions
+
+MONTE_CARLO_FILE_NAME = "monte_carlo.json"
+
+# Upper bound of the array elements evaluated per pressure chunk, about 64 MB of float64
+CHUNK_ELEMENTS = 1 << 23
+
+@dataclass(frozen=True, slots=True)
+class UncertaintyModel:
+    """
+    Spreads of the sampled propellant inputs, as standard deviations of normal distributions.
+
+    Attributes:
+        mass_fraction_std (float): Relative standard deviation of the mass fractions.
+        large_particles_fraction_std (float): Absolute standard deviation of the large particles fractions.
+        agglomeration_std (float): Relative standard deviation of the agglomeration polynomials.
+    """
+    mass_fraction_std: float = 0.01
+    large_particles_fraction_std: float = 0.02
+    agglomeration_std: float = 0.05
+
+    def __post_init__(self):
+        for name, value in asdict(self).items():
+            if value < 0:
+                raise ValueError(f"Standard deviation '{name}' must not be negative, got {value}")
+
+@dataclass(frozen=True, slots=True)
+class RegionStatistics:
+    """
+    Data Transfer Object (DTO) for storing the statistics of the regions of a propellant.
+
+    Attributes:
+        name (str): Name of the propellant.
+        samples (int): Number of samples S.
+        pressures (np.ndarray): Pressures in Pascals, shape (P,).
+        percentiles (Tuple[float, ...]): The percentiles, shape (Q,).
+        elements (Tuple[str, ...]): Element symbols in the order of the composition axis.
+        enthalpy_mean (np.ndarray): Mean enthalpies, shape (P, len(REGIONS)).
+        enthalpy_std (np.ndarray): Standard deviations of the enthalpies, shape (P, len(REGIONS)).
+        enthalpy_percentiles (np.ndarray): Enthalpy percentiles, shape (Q, P, len(REGIONS)).
+        composition_mean (np.ndarray): Mean compositions, shape (P, len(REGIONS), E).
+        composition_std (np.ndarray): Standard deviations of the compositions, shape (P, len(REGIONS), E).
+        composition_percentiles (np.ndarray): Composition percentiles, shape (Q, P, len(REGIONS), E).
+    """
+    name: str
+    samples: int
+    pressures: np.ndarray
+    percentiles: Tuple[float, ...]
+    elements: Tuple[str, ...]
+    enthalpy_mean: np.ndarray
+    enthalpy_std: np.ndarray
+    enthalpy_percentiles: np.ndarray
+    composition_mean: np.ndarray
+    composition_std: np.ndarray
+    composition_percentiles: np.ndarray
+
+def sample_propellant(
+    propellants: PropellantSet,
+    index: int,
+    model: UncertaintyModel,
+    samples: int,
+    rng: np.random.Generator
+) -> PropellantSet:
+    """
+    Draw samples of the inputs of a propellant.
+
+    Args:
+        propellants (PropellantSet): Columnar propellant properties.
+        index (int): Index of the propellant to sample.
+        model (UncertaintyModel): Spreads of the sampled inputs.
+        samples (int): Number of samples S.
+        rng (np.random.Generator): The random generator.
+
+    Returns:
+        PropellantSet: The samples as a set of S propellants.
+    """
+    name = propellants.names[index]
+    width = len(propellants.component_names)
+
+    # Mass fractions stay positive and keep their sum; absent components stay NaN
+    nominal = propellants.mass_fractions[index]
+    mass_fractions = nominal * (1 + model.mass_fraction_std * rng.standard_normal((samples, width)))
+    mass_fractions = np.maximum(mass_fractions, np.finfo(float).tiny)
+    mass_fractions *= np.nansum(nominal) / np.nansum(mass_fractions, axis=1, keepdims=True)
+
+    large_particles_fractions = np.clip(
+        propellants.large_particles_fractions[index]
+        + model.large_particles_fraction_std * rng.standard_normal((samples, width)),
+        0.0, 1.0)
+
+    scales = 1 + model.agglomeration_std * rng.standard_normal(samples)
+    agglomeration_coefficients = propellants.agglomeration_coefficients[index] * scales[:, None, None]
+
+    return PropellantSet(
+        names=[name] * samples,
+        component_names=propellants.component_names,
+        mass_fractions=mass_fractions,
+        densities=np.broadcast_to(propellants.densities[index], (samples, width)),
+        large_particles_fractions=large_particles_fractions,
+        agglomeration_coefficients=agglomeration_coefficients,
+        coefficient_counts=np.broadcast_to(propellants.coefficient_counts[index], (samples, width))
+    )
+
+def propagate(
+    samples: PropellantSet,
+    component_data: ComponentTable,
+    pressures: Sequence[float],
+    percentiles: Sequence[float] = (5.0, 50.0, 95.0)
+) -> RegionStatistics:
+    """
+    Evaluate every region for all samples and reduce the results to per-pressure statistics.
+
+    Args:
+        samples (PropellantSet): The samples of a propellant, see `sample_propellant`.
+        component_data (ComponentTable): The component table.
+        pressures (Sequence[float]): Pressures in Pascals, shape (P,).
+        percentiles (Sequence[float]): Percentiles in [0, 100], shape (Q,).
+
+    Returns:
+        RegionStatistics: The statistics of the regions.
+
+    Raises:
+        ValueError: If a sample has an invalid region mass.
+    """
+    engine = RegionEngine.for_components(component_data)
+    pressures = np.asarray(pressures, dtype=float)
+    percentiles = tuple(float(q) for q in percentiles)
+    count, p, e = len(samples), len(pressures), len(engine.elements)
+
+    enthalpy_mean = np.empty((p, len(REGIONS)))
+    enthalpy_std = np.empty((p, len(REGIONS)))
+    enthalpy_percentiles = np.empty((len(percentiles), p, len(REGIONS)))
+    composition_mean = np.empty((p, len(REGIONS), e))
+    composition_std = np.empty((p, len(REGIONS), e))
+    composition_percentiles = np.empty((len(percentiles), p, len(REGIONS), e))
+
+    def reduce(regions: Sequence[int], window: slice, compositions: np.ndarray, enthalpies: np.ndarray):
+        # Statistics over the sample axis, broadcast over the pressures of the window
+        enthalpy_mean[window, regions] = enthalpies.mean(axis=0)
+        enthalpy_std[window, regions] = enthalpies.std(axis=0)
+        enthalpy_percentiles[:, window, regions] = np.percentile(enthalpies, percentiles, axis=0)
+        composition_mean[window, regions] = compositions.mean(axis=0)
+        composition_std[window, regions] = compositions.std(axis=0)
+        composition_percentiles[:, window, regions] = np.percentile(compositions, percentiles, axis=0)
+
+    # Pressure-invariant regions are evaluated once, the others in chunks of pressures
+    invariant = [r for r, spec in enumerate(REGION_SPECS) if not spec.pressure_dependent]
+    dependent = [r for r, spec in enumerate(REGION_SPECS) if spec.pressure_dependent]
+
+    if invariant:
+        regions = CompiledRegions([REGION_SPECS[r] for r in invariant], engine.component_names)
+        compositions, enthalpies = engine.calculate(regions.map(samples, pressures[:1]))
+        reduce(invariant, slice(None), compositions, enthalpies)
+
+    if dependent:
+        regions = CompiledRegions([REGION_SPECS[r] for r in dependent], engine.component_names)
+        width = max(len(engine.component_names), e)
+        chunk = max(1, CHUNK_ELEMENTS // (count * len(dependent) * width))
+        for start in range(0, p, chunk):
+            window = slice(start, min(start + chunk, p))
+            compositions, enthalpies = engine.calculate(regions.map(samples, pressures[window]))
+            reduce(dependent, window, compositions, enthalpies)
+
+    return RegionStatistics(
+        name=samples.names[0] if count else "",
+        samples=count,
+        pressures=pressures,
+        percentiles=percentiles,
+        elements=engine.elements,
+        enthalpy_mean=enthalpy_mean,
+        enthalpy_std=enthalpy_std,
+        enthalpy_percentiles=enthalpy_percentiles,
+        composition_mean=composition_mean,
+        composition_std=composition_std,
+        composition_percentiles=composition_percentiles
+    )
+
+def statistics_to_dict(
+    statistics: RegionStatistics,
+    region_elements: Dict[str, Tuple[str, ...]],
+    model: UncertaintyModel,
+    seed: int
+) -> dict:
+    """
+    Convert region statistics to the JSON layout of the Monte Carlo output file.
+
+    Every statistic is a list over the pressures; percentiles are keyed by their value.
+
+    Args:
+        statistics (RegionStatistics): The statistics to convert.
+        region_elements (Dict[str, Tuple[str, ...]]): Elements reported for every region.
+        model (UncertaintyModel): The spreads the samples were drawn with.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        dict: The JSON-serializable statistics.
+    """
+    def summary(mean, std, percentiles):
+        return {
+            "mean": mean.tolist(),
+            "std": std.tolist(),
+            "percentiles": {f"{q:g}": values.tolist() for q, values in zip(statistics.percentiles, percentiles)}
+        }
+
+    regions = {}
+    for r, region in enumerate(REGIONS):
+        composition = {}
+        for element in region_elements[region]:
+            j = statistics.elements.index(element)
+            composition[element] = summary(
+                statistics.composition_mean[:, r, j],
+                statistics.composition_std[:, r, j],
+                statistics.composition_percentiles[:, :, r, j])
+        regions[region] = {
+            "enthalpy": summary(
+                statistics.enthalpy_mean[:, r],
+                statistics.enthalpy_std[:, r],
+                statistics.enthalpy_percentiles[:, :, r]),
+            "composition": composition
+        }
+
+    return {
+        "propellant": statistics.name,
+        "samples": statistics.samples,
+        "seed": seed,
+        "uncertainty": asdict(model),
+        "pressures": statistics.pressures.tolist(),
+        "regions": regions
+    }
+
+def parse_args():
+    """
+    Parse command-line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    defaults = UncertaintyModel()
+    parser = argparse.ArgumentParser(
+        description="Propagate input uncertainties of the propellants to region results with Monte Carlo sampling."
+    )
+    parser.add_argument("--propellants", required=True, help="Path to the propellant JSON or JSON Lines file.")
+    parser.add_argument("--components", required=True, help="Path to the components JSON file.")
+    parser.add_argument(
+        "--pressures",
+        nargs="+",
+        required=True,
+        help="Pressures in Pascals, single values or ranges 'start:stop:count' (e.g., 1e6:6.5e6:50)."
+    )
+    parser.add_argument(
+        "--output-dir",
+        required=True,
+        help=f"Path to the output directory; results are written to '<output-dir>/<propellant>/{MONTE_CARLO_FILE_NAME}'."
+    )
+    parser.add_argument("--samples", type=int, default=10000, help="Number of samples per propellant (default: 10000).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator (default: 0).")
+    parser.add_argument(
+        "--percentiles",
+        type=float,
+        nargs="+",
+        default=[5.0, 50.0, 95.0],
+        help="Percentiles to report (default: 5 50 95)."
+    )
+    parser.add_argument(
+        "--mass-fraction-std",
+        type=float,
+        default=defaults.mass_fraction_std,
+        help="Relative standard deviation of the mass fractions (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--large-particles-fraction-std",
+        type=float,
+        default=defaults.large_particles_fraction_std,
+        help="Absolute standard deviation of the large particles fractions (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--agglomeration-std",
+        type=float,
+        default=defaults.agglomeration_std,
+        help="Relative standard deviation of the agglomeration polynomials (default: %(default)s)."
+    )
+
+    args = parser.parse_args()
+    try:
+        args.pressures = parse_pressures(args.pressures)
+    except ValueError as e:
+        parser.error(str(e))
+    if any(pressure <= 0 for pressure in args.pressures):
+        parser.error("Pressures must be positive values.")
+    if args.samples < 1:
+        parser.error("Number of samples must be a positive value.")
+    if any(q < 0 or q > 100 for q in args.percentiles):
+        parser.error("Percentiles must be between 0 and 100.")
+    return args
+
+
+def main():
+    """
+    Main function to propagate the uncertainties and export the statistics.
+    """
+    try:
+        args = parse_args()
+        model = UncertaintyModel(
+            mass_fraction_std=args.mass_fraction_std,
+            large_particles_fraction_std=args.large_particles_fraction_std,
+            agglomeration_std=args.agglomeration_std
+        )
+
+        components = read_components(args.components)
+        propellants = read_propellant_set(args.propellants, tuple(components))
+        engine = RegionEngine.for_components(components)
+        region_elements = {region: engine.region_elements(REGION_COMPONENTS[region]) for region in REGIONS}
+        rng = np.random.default_rng(args.seed)
+
+        ensure_directory_exists(args.output_dir)
+        for index, name in enumerate(propellants.names):
+            samples = sample_propellant(propellants, index, model, args.samples, rng)
+            statistics = propagate(samples, components, args.pressures, args.percentiles)
+
+            propellant_output_dir = os.path.join(args.output_dir, name)
+            ensure_directory_exists(propellant_output_dir)
+            file_path = os.path.join(propellant_output_dir, MONTE_CARLO_FILE_NAME)
+            JSONWriter.write_dict(statistics_to_dict(statistics, region_elements, model, args.seed), file_path)
+            print(f"Statistics of {args.samples} samples for propellant '{name}' successfully written to '{file_path}'.")
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
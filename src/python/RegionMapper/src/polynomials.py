@@ -0,0 +1,116 @@
+"""
+This module contains the vectorized evaluation of the pressure polynomials used by the
+propellant model, such as the Aluminum `agglomeration_coefficients` and the propellant
+`pocket_surface_fraction_coefficients`.
+
+Both fields hold coefficients in ascending order of a polynomial in the pressure
+normalized to megapascals:
+    f(p) = c0 + c1 * (p / 1e6) + c2 * (p / 1e6)^2 + ...
+
+The polynomials are evaluated with Horner's scheme over whole pressure arrays, and
+optionally over batches of coefficient sets padded with trailing zeros.
+
+Functions:
+    - evaluate_pressure_polynomial: Evaluates coefficient sets over pressures.
+    - pressure_polynomial_basis: Powers of normalized pressure, the derivatives with respect to
+      the coefficients.
+    - calculate_agglomeration_fraction: Evaluates `agglomeration_coefficients`.
+    - calculate_pocket_surface_fraction: Evaluates `pocket_surface_fraction_coefficients`.
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+# Pressures are normalized to megapascals before the polynomials are evaluated
+PRESSURE_SCALE = 1e6
+
+def evaluate_pressure_polynomial(
+    coefficients: Union[Sequence[float], np.ndarray],
+    pressures: Union[float, Sequence[float], np.ndarray],
+    lower: Optional[float] = None,
+    upper: Optional[float] = None
+) -> Union[float, np.ndarray]:
+    """
+    Evaluate polynomials in normalized pressure with Horner's scheme.
+
+    Args:
+        coefficients (Union[Sequence[float], np.ndarray]): Coefficients in ascending order,
+            shape (K,) for a single polynomial or (..., K) for a batch of polynomials.
+        pressures (Union[float, Sequence[float], np.ndarray]): Pressures in Pascals, any shape.
+        lower (Optional[float]): Lower bound the values are clamped to, if given.
+        upper (Optional[float]): Upper bound the values are clamped to, if given.
+
+    Returns:
+        Union[float, np.ndarray]: Values of shape coefficients.shape[:-1] + pressures.shape,
+            or a float for a single polynomial evaluated at a scalar pressure.
+
+    Example:
+        >>> evaluate_pressure_polynomial([0.2, 0.01], [1e6, 2e6])
+        array([0.21, 0.22])
+    """
+    coefficients = np.asarray(coefficients, dtype=float)
+    x = np.asarray(pressures, dtype=float) / PRESSURE_SCALE
+
+    # Coefficients of every batch item broadcast against all pressures
+    batch_shape = coefficients.shape[:-1]
+    expand = batch_shape + (1,) * x.ndim
+
+    values = np.zeros(batch_shape + x.shape)
+    for k in range(coefficients.shape[-1] - 1, -1, -1):
+        values = values * x + coefficients[..., k].reshape(expand)
+
+    if lower is not None or upper is not None:
+        values = np.clip(values, lower, upper)
+
+    return float(values) if values.ndim == 0 else values
+
+def pressure_polynomial_basis(
+    pressures: Union[float, Sequence[float], np.ndarray],
+    count: int
+) -> np.ndarray:
+    """
+    Return the powers of normalized pressure, which are the derivatives of a polynomial
+    with respect to each of its coefficients.
+
+    Args:
+        pressures (Union[float, Sequence[float], np.ndarray]): Pressures in Pascals, any shape.
+        count (int): Number of coefficients K.
+
+    Returns:
+        np.ndarray: Values (p / 1e6)^k, shape pressures.shape + (K,).
+    """
+    x = np.asarray(pressures, dtype=float) / PRESSURE_SCALE
+    return x[..., None] ** np.arange(count)
+
+def calculate_agglomeration_fraction(
+    agglomeration_coefficients: Union[Sequence[float], np.ndarray],
+    pressures: Union[float, Sequence[float], np.ndarray]
+) -> Union[float, np.ndarray]:
+    """
+    Calculate the Aluminum agglomeration fraction from its `agglomeration_coefficients`.
+
+    Args:
+        agglomeration_coefficients (Union[Sequence[float], np.ndarray]): Polynomial coefficients.
+        pressures (Union[float, Sequence[float], np.ndarray]): Pressures in Pascals.
+
+    Returns:
+        Union[float, np.ndarray]: Agglomeration fractions.
+    """
+    return evaluate_pressure_polynomial(agglomeration_coefficients, pressures)
+
+def calculate_pocket_surface_fraction(
+    pocket_surface_fraction_coefficients: Union[Sequence[float], np.ndarray],
+    pressures: Union[float, Sequence[float], np.ndarray]
+) -> Union[float, np.ndarray]:
+    """
+    Calculate the pocket surface fraction from the propellant `pocket_surface_fraction_coefficients`.
+
+    Args:
+        pocket_surface_fraction_coefficients (Union[Sequence[float], np.ndarray]): Polynomial coefficients.
+        pressures (Union[float, Sequence[float], np.ndarray]): Pressures in Pascals.
+
+    Returns:
+        Union[float, np.ndarray]: Pocket surface fractions.
+    """
+    return evaluate_pressure_polynomial(pocket_surface_fraction_coefficients, pressures)
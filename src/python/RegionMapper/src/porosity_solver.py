@@ -0,0 +1,385 @@
+"""
+This module contains the batched inverse porosity solver. It finds, for many targets at once,
+the value of a propellant input that yields a target porosity within the skeleton, e.g. the
+large particles fraction of the Ammonium Perchlorate.
+
+Every target is an independent root of `porosity(x) - target` on a bracket [lower, upper].
+All targets are advanced together with the Illinois variant of the false position method:
+every iteration evaluates the region mapping and the porosity model once, for all targets
+that have not converged yet, as one batched array computation. The bracket is kept around
+the root, so every target with a sign change in its bracket converges.
+
+Supported variables:
+    - "<Component>.large_particles_fraction", e.g. "AmmoniumPerchlorate.large_particles_fraction";
+    - "pressure". The pocket region without skeleton does not depend on pressure, so in this
+      model no pressure bracket has a sign change unless the porosity already matches the
+      target; such targets are reported with the status "no_bracket".
+
+Classes:
+    - PorositySolution: The solutions and convergence diagnostics of all targets.
+
+Functions:
+    - porosity_function: The batched porosity of a propellant set as a function of a variable.
+    - solve_porosity: Solves many targets at once.
+
+Usage:
+    python3 porosity_solver.py --propellants propellants.json --components ../data/components.json \
+        --pressure 1e6 --targets 0.70 0.72 0.75 --output solutions.json
+"""
+
+import argparse
+import sys
+import time
+
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from json_reader import read_components, read_propellant_set
+from json_writer import JSONWriter
+from models import ComponentTable
+from porosity_stage import POROSITY_REGION, porosity_of_compositions
+from propellant_set import PropellantSet
+from region_engine import RegionEngine
+from region_specs import LARGE_PARTICLES_FRACTION, REGION_SPECS, CompiledRegions
+
+PRESSURE_VARIABLE = "pressure"
+
+# Statuses of the solutions
+CONVERGED = "converged"
+NO_BRACKET = "no_bracket"
+MAX_ITERATIONS = "max_iterations"
+
+@dataclass(frozen=True, slots=True)
+class PorositySolution:
+    """
+    Data Transfer Object (DTO) for storing the solutions of M porosity targets.
+
+    Attributes:
+        names (Tuple[str, ...]): Propellant names of the targets, shape (M,).
+        variable (str): The solved variable.
+        targets (np.ndarray): Target porosities, shape (M,).
+        values (np.ndarray): Solved values of the variable, NaN without a bracket, shape (M,).
+        porosity (np.ndarray): Porosity at the solved values, shape (M,).
+        residuals (np.ndarray): Porosity minus target at the solved values, shape (M,).
+        bracket_widths (np.ndarray): Width of the final brackets, shape (M,).
+        iterations (np.ndarray): Iterations of every target, shape (M,).
+        statuses (Tuple[str, ...]): CONVERGED, NO_BRACKET or MAX_ITERATIONS, shape (M,).
+        evaluations (int): Number of batched porosity evaluations.
+    """
+    names: Tuple[str, ...]
+    variable: str
+    targets: np.ndarray
+    values: np.ndarray
+    porosity: np.ndarray
+    residuals: np.ndarray
+    bracket_widths: np.ndarray
+    iterations: np.ndarray
+    statuses: Tuple[str, ...]
+    evaluations: int
+
+    @property
+    def converged(self) -> np.ndarray:
+        """
+        Whether every target converged, shape (M,).
+        """
+        return np.array([status == CONVERGED for status in self.statuses], dtype=bool)
+
+def porosity_function(
+    propellants: PropellantSet,
+    component_data: ComponentTable,
+    variable: str,
+    pressure: Optional[float] = None
+) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+    """
+    Build the batched porosity of a propellant set as a function of a variable.
+
+    Args:
+        propellants (PropellantSet): The propellants, with their densities.
+        component_data (ComponentTable): The component table.
+        variable (str): "pressure" or "<Component>.large_particles_fraction".
+        pressure (Optional[float]): Pressure in Pascals, required if the variable is not the pressure.
+
+    Returns:
+        Callable[[np.ndarray, np.ndarray], np.ndarray]: Function of row indices into the set
+            and values of the variable, both of shape (M,), returning the porosities, shape (M,).
+
+    Raises:
+        ValueError: If the variable is not supported or the pressure is missing.
+    """
+    engine = RegionEngine.for_components(component_data)
+    spec = next(spec for spec in REGION_SPECS if spec.name == POROSITY_REGION)
+    regions = CompiledRegions([spec], engine.component_names)
+
+    def porosity(rows: PropellantSet, pressures: Sequence[float]) -> np.ndarray:
+        compositions, _ = engine.calculate(regions.map(rows, pressures))
+        return porosity_of_compositions(rows, compositions[:, :, 0], engine.elements)[1]
+
+    if variable == PRESSURE_VARIABLE:
+        # The porosity region does not depend on pressure, so one pressure serves all rows
+        if spec.pressure_dependent:
+            raise ValueError(
+                f"Solving for the pressure requires the region '{POROSITY_REGION}' to be pressure independent.")
+
+        def evaluate(indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+            return porosity(propellants.take(indices), values[:1])[:, 0]
+        return evaluate
+
+    component_name, _, fraction = variable.partition(".")
+    if fraction != LARGE_PARTICLES_FRACTION or component_name not in propellants.component_names:
+        raise ValueError(
+            f"Unsupported variable '{variable}', expected '{PRESSURE_VARIABLE}' or "
+            f"'<Component>.{LARGE_PARTICLES_FRACTION}' with one of {propellants.component_names}")
+    if pressure is None:
+        raise ValueError(f"A pressure is required for the variable '{variable}'.")
+    column = propellants.column(component_name)
+
+    def evaluate(indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+        rows = propellants.take(indices)
+        rows.large_particles_fractions[:, column] = values
+        return porosity(rows, [pressure])[:, 0]
+    return evaluate
+
+def solve_porosity(
+    propellants: PropellantSet,
+    component_data: ComponentTable,
+    targets: Sequence[float],
+    variable: str,
+    lower: float,
+    upper: float,
+    pressure: Optional[float] = None,
+    tolerance: float = 1e-12,
+    max_iterations: int = 100
+) -> PorositySolution:
+    """
+    Solve every target porosity for every propellant of a set at once.
+
+    A target converges when the residual is at most `tolerance` or the bracket is narrower
+    than `tolerance` times max(1, |value|).
+
+    Args:
+        propellants (PropellantSet): The propellants, with their densities, shape (N,).
+        component_data (ComponentTable): The component table.
+        targets (Sequence[float]): Target porosities, shape (T,); every propellant is solved
+            for every target, giving M = N * T solutions in propellant-major order.
+        variable (str): "pressure" or "<Component>.large_particles_fraction".
+        lower (float): Lower bound of the bracket.
+        upper (float): Upper bound of the bracket.
+        pressure (Optional[float]): Pressure in Pascals, required if the variable is not the pressure.
+        tolerance (float): Convergence tolerance.
+        max_iterations (int): Maximum number of iterations.
+
+    Returns:
+        PorositySolution: The solutions and their convergence diagnostics.
+
+    Raises:
+        ValueError: If the bracket or the variable is invalid.
+    """
+    if not lower < upper:
+        raise ValueError(f"Lower bound {lower} must be less than the upper bound {upper}.")
+    function = porosity_function(propellants, component_data, variable, pressure)
+
+    targets = np.asarray(targets, dtype=float)
+    rows = np.repeat(np.arange(len(propellants)), len(targets))
+    targets = np.tile(targets, len(propellants))
+    m = len(rows)
+
+    # Both bounds of all targets in one evaluation
+    a, b = np.full(m, float(lower)), np.full(m, float(upper))
+    bounds = function(np.concatenate([rows, rows]), np.concatenate([a, b])) - np.concatenate([targets, targets])
+    fa, fb = bounds[:m], bounds[m:]
+    evaluations = 1
+
+    values = np.full(m, np.nan)
+    residuals = np.full(m, np.nan)
+    iterations = np.zeros(m, dtype=np.int64)
+    statuses = np.full(m, NO_BRACKET, dtype=object)
+
+    # Bounds that hit the target are solutions
+    for bound, residual in ((a, fa), (b, fb)):
+        hit = (np.abs(residual) <= tolerance) & (statuses == NO_BRACKET)
+        values[hit], residuals[hit], statuses[hit] = bound[hit], residual[hit], CONVERGED
+
+    active = (statuses == NO_BRACKET) & (np.sign(fa) != np.sign(fb))
+    statuses[active] = MAX_ITERATIONS
+    # Side of the last replaced bound, +1 for a and -1 for b, to apply the Illinois weighting
+    side = np.zeros(m, dtype=np.int8)
+
+    for _ in range(max_iterations):
+        index = np.flatnonzero(active)
+        if index.size == 0:
+            break
+        ai, bi, fai, fbi = a[index], b[index], fa[index], fb[index]
+
+        # False position, with bisection where the secant step leaves the bracket
+        with np.errstate(divide="ignore", invalid="ignore"):
+            c = bi - fbi * (bi - ai) / (fbi - fai)
+        outside = ~((c > np.minimum(ai, bi)) & (c < np.maximum(ai, bi)))
+        c[outside] = 0.5 * (ai[outside] + bi[outside])
+
+        fc = function(rows[index], c) - targets[index]
+        evaluations += 1
+        iterations[index] += 1
+
+        same = np.sign(fc) == np.sign(fai)
+        # Replace a where fc has its sign, else b, halving the retained value after a repeat
+        a[index[same]], fa[index[same]] = c[same], fc[same]
+        repeat = same & (side[index] == 1)
+        fb[index[repeat]] *= 0.5
+        b[index[~same]], fb[index[~same]] = c[~same], fc[~same]
+        repeat = ~same & (side[index] == -1)
+        fa[index[repeat]] *= 0.5
+        side[index] = np.where(same, 1, -1)
+
+        values[index], residuals[index] = c, fc
+        done = (np.abs(fc) <= tolerance) | (np.abs(b[index] - a[index]) <= tolerance * np.maximum(1.0, np.abs(c)))
+        statuses[index[done]] = CONVERGED
+        active[index[done]] = False
+
+    widths = np.where(statuses == NO_BRACKET, np.nan, np.abs(b - a))
+    return PorositySolution(
+        names=tuple(propellants.names[i] for i in rows),
+        variable=variable,
+        targets=targets,
+        values=values,
+        porosity=targets + residuals,
+        residuals=residuals,
+        bracket_widths=widths,
+        iterations=iterations,
+        statuses=tuple(statuses.tolist()),
+        evaluations=evaluations
+    )
+
+def solution_to_dict(solution: PorositySolution, pressure: Optional[float]) -> dict:
+    """
+    Convert the solutions to the JSON layout of the solver output file.
+
+    Args:
+        solution (PorositySolution): The solutions to convert.
+        pressure (Optional[float]): Pressure in Pascals, if the variable is not the pressure.
+
+    Returns:
+        dict: The JSON-serializable solutions; values that were not found are null.
+    """
+    def number(value) -> object:
+        return None if np.isnan(value) else float(value)
+
+    return {
+        "variable": solution.variable,
+        "pressure": pressure,
+        "evaluations": solution.evaluations,
+        "converged": int(solution.converged.sum()),
+        "solutions": [
+            {
+                "propellant": solution.names[i],
+                "target": float(solution.targets[i]),
+                "value": number(solution.values[i]),
+                "porosity": number(solution.porosity[i]),
+                "residual": number(solution.residuals[i]),
+                "bracket_width": number(solution.bracket_widths[i]),
+                "iterations": int(solution.iterations[i]),
+                "status": solution.statuses[i]
+            }
+            for i in range(len(solution.names))
+        ]
+    }
+
+def parse_args():
+    """
+    Parse command-line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Find the propellant inputs that yield target porosities within the skeleton."
+    )
+    parser.add_argument("--propellants", required=True, help="Path to the propellant JSON or JSON Lines file.")
+    parser.add_argument("--components", required=True, help="Path to the components JSON file.")
+    parser.add_argument("--targets", type=float, nargs="+", required=True, help="Target porosities.")
+    parser.add_argument(
+        "--variable",
+        default=f"AmmoniumPerchlorate.{LARGE_PARTICLES_FRACTION}",
+        help=(
+            f"The solved variable, '{PRESSURE_VARIABLE}' or '<Component>.{LARGE_PARTICLES_FRACTION}' "
+            "(default: %(default)s)."
+        )
+    )
+    parser.add_argument(
+        "--bounds",
+        type=float,
+        nargs=2,
+        metavar=("LOWER", "UPPER"),
+        help="Bracket of the variable (default: 0 1 for fractions, required for the pressure)."
+    )
+    parser.add_argument("--pressure", type=float, help="Pressure in Pascals, required unless the variable is the pressure.")
+    parser.add_argument("--tolerance", type=float, default=1e-12, help="Convergence tolerance (default: %(default)s).")
+    parser.add_argument(
+        "--max-iterations", type=int, default=100, help="Maximum number of iterations (default: %(default)s).")
+    parser.add_argument("--output", help="Path to the output JSON file; the solutions are printed if omitted.")
+
+    args = parser.parse_args()
+    if args.variable == PRESSURE_VARIABLE:
+        if args.bounds is None:
+            parser.error("The bounds are required for the pressure.")
+        if args.bounds[0] <= 0:
+            parser.error("Pressures must be positive values.")
+        args.pressure = None
+    else:
+        if args.pressure is None:
+            parser.error(f"The pressure is required for the variable '{args.variable}'.")
+        if args.pressure <= 0:
+            parser.error("Pressure must be a positive value.")
+        if args.bounds is None:
+            args.bounds = [0.0, 1.0]
+    if args.tolerance <= 0:
+        parser.error("Tolerance must be a positive value.")
+    if args.max_iterations < 1:
+        parser.error("Maximum number of iterations must be a positive value.")
+    return args
+
+
+def main():
+    """
+    Main function to solve the target porosities and export the solutions.
+    """
+    try:
+        args = parse_args()
+
+        components = read_components(args.components)
+        propellants = read_propellant_set(args.propellants, tuple(components))
+
+        start = time.perf_counter()
+        solution = solve_porosity(
+            propellants,
+            components,
+            args.targets,
+            args.variable,
+            args.bounds[0],
+            args.bounds[1],
+            pressure=args.pressure,
+            tolerance=args.tolerance,
+            max_iterations=args.max_iterations
+        )
+        elapsed = time.perf_counter() - start
+
+        for i, name in enumerate(solution.names):
+            print(
+                f"{name}: target {solution.targets[i]:g} -> {args.variable} = {solution.values[i]:.12g} "
+                f"({solution.statuses[i]}, {solution.iterations[i]} iterations, residual {solution.residuals[i]:.3g})")
+        print(
+            f"{int(solution.converged.sum())} of {len(solution.names)} targets converged in "
+            f"{solution.evaluations} batched evaluations ({elapsed * 1000:.1f} ms).")
+
+        if args.output:
+            JSONWriter.write_dict(solution_to_dict(solution, args.pressure), args.output)
+            print(f"Solutions successfully written to '{args.output}'.")
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
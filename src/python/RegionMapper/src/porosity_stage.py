@@ -0,0 +1,137 @@
+"""
+This module contains the porosity stage of the region mapper. It hands the region results
+to the porosity model in the same process, instead of writing the pocket region to JSON and
+running the porosity calculator on it.
+
+The porosity model is the `porosity_model` package of the porosity calculator, so both paths
+produce identical `porosity.json` files. It is imported by its location rather than through
+the import path, and only imports its own modules, so none of them resolve to the modules
+of the region mapper with the same names.
+
+Functions:
+    - calculate_porosity: Porosity of a propellant from its pocket region result.
+    - porosity_of_compositions: Porosity of a propellant set from pocket region compositions.
+    - calculate_porosity_set: Porosity of a result set, for all propellants and pressures at once.
+
+Usage:
+    result = RegionCalculator.calculate(PocketRegionWithoutSkeletonMapper().calculate(propellant), components, pressure)
+    porosity = calculate_porosity(propellant, result)
+"""
+
+import importlib.util
+import os
+import sys
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from calculators import RegionCalculationResult, RegionResultSet
+from models import Propellant
+from propellant_set import PropellantSet
+from region_engine import REGIONS
+
+# Package of the porosity model in the porosity calculator
+POROSITY_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'PorosityCalculation', 'src', 'porosity_model')
+
+def _import_porosity_model():
+    """
+    Import the porosity model package from its location, once per process.
+    """
+    module = sys.modules.get("porosity_model")
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            "porosity_model",
+            os.path.join(POROSITY_MODEL_PATH, "__init__.py"),
+            submodule_search_locations=[POROSITY_MODEL_PATH]
+        )
+        module = importlib.util.module_from_spec(spec)
+        # Registered before it runs, so that its relative imports find the package
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return module
+
+porosity_model = _import_porosity_model()
+POROSITY_FILE_NAME = porosity_model.POROSITY_FILE_NAME
+PorosityCalculationResult = porosity_model.PorosityCalculationResult
+porosity_from_volume = porosity_model.porosity_from_volume
+porosity_result_to_dict = porosity_model.porosity_result_to_dict
+
+# Region whose composition the porosity is calculated from
+POROSITY_REGION = "pocket_without_skeleton"
+
+def calculate_porosity(propellant: Propellant, result: RegionCalculationResult) -> PorosityCalculationResult:
+    """
+    Calculate the porosity of a propellant from the result of its pocket region without skeleton,
+    equal to the result of the porosity calculator on the region file.
+
+    Args:
+        propellant (Propellant): The propellant, with the densities of all components.
+        result (RegionCalculationResult): The result of the pocket region without skeleton.
+
+    Returns:
+        PorosityCalculationResult: The region density, the porosity and the region result.
+
+    Raises:
+        ValueError: If the density of a component is not given.
+        KeyError: If the propellant has no Aluminum component.
+    """
+    return porosity_model.calculate_porosity(propellant, result)
+
+def porosity_of_compositions(
+    propellants: PropellantSet,
+    compositions: np.ndarray,
+    elements: Sequence[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the porosity of every propellant of a set from compositions of its pocket region
+    without skeleton.
+
+    Args:
+        propellants (PropellantSet): The propellants, with their densities.
+        compositions (np.ndarray): Compositions of the pocket region, shape (N, P, E).
+        elements (Sequence[str]): Element symbols in the order of the composition axis.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Region densities, shape (N,), and porosities, shape (N, P).
+
+    Raises:
+        ValueError: If the density of a component is not given.
+    """
+    present = ~np.isnan(propellants.mass_fractions)
+    if np.isnan(propellants.densities[present]).any():
+        raise ValueError("Densities of all components are required for the porosity.")
+    total_volume = np.nansum(propellants.mass_fractions / propellants.densities, axis=1)
+
+    def element(symbol: str) -> np.ndarray:
+        if symbol not in elements:
+            return np.zeros(compositions.shape[:2])
+        return compositions[:, :, elements.index(symbol)]
+
+    with np.errstate(divide="ignore"):
+        region_density = np.where(total_volume != 0, 1 / total_volume, 0.0)
+    porosity = porosity_from_volume(
+        total_volume[:, None],
+        propellants.densities[:, propellants.column("Aluminum")][:, None],
+        element("C"),
+        element("Al")
+    )
+    return region_density, porosity
+
+def calculate_porosity_set(propellants: PropellantSet, results: RegionResultSet) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the porosity of all propellants and pressures of a result set at once.
+
+    Args:
+        propellants (PropellantSet): The propellants of the results, with their densities.
+        results (RegionResultSet): The region results, see `RegionCalculator.calculate_set`.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Region densities, shape (N,), and porosities, shape (N, P).
+
+    Raises:
+        ValueError: If the density of a component is not given.
+    """
+    return porosity_of_compositions(
+        propellants, results.compositions[:, :, REGIONS.index(POROSITY_REGION)], results.elements)
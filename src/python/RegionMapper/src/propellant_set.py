@@ -0,0 +1,270 @@
+"""
+This module contains the columnar representation of many propellants. Instead of one
+`Propellant` object graph per formulation, the properties of all formulations are kept
+in typed NumPy arrays with one row per propellant and one column per component, which
+keeps in-memory sweeps over 10^5-10^6 formulations compact.
+
+Missing values are stored as NaN: a component absent from a propellant has a NaN mass
+fraction, and absent densities or large particles fractions are NaN as well.
+
+Classes:
+    - PropellantSet: Columnar propellant properties with `Propellant` views.
+
+Usage:
+    propellants = PropellantSet.from_records(iter_json_records(file))
+    binder = propellants.mass_fraction("CombustibleBinder")  # shape (N,)
+    first = propellants[0]  # Propellant view
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import Propellant, PropellantComponent
+
+# Components of the propellants handled by the region mappers
+DEFAULT_COMPONENT_NAMES = ("CombustibleBinder", "AmmoniumPerchlorate", "Aluminum", "Octogen")
+
+class PropellantSet:
+    """
+    Columnar, array-backed properties of N propellants with C components.
+
+    Attributes:
+        names (Tuple[str, ...]): Propellant names, shape (N,).
+        component_names (Tuple[str, ...]): Component names in column order, shape (C,).
+        mass_fractions (np.ndarray): Mass fractions, shape (N, C).
+        densities (np.ndarray): Component densities in kg/m^3, shape (N, C).
+        large_particles_fractions (np.ndarray): Large particles fractions, shape (N, C).
+        agglomeration_coefficients (np.ndarray): Agglomeration polynomial coefficients padded
+            with zeros, shape (N, C, K).
+        coefficient_counts (np.ndarray): Number of agglomeration coefficients given for every
+            component, shape (N, C).
+    """
+    __slots__ = (
+        "names",
+        "component_names",
+        "mass_fractions",
+        "densities",
+        "large_particles_fractions",
+        "agglomeration_coefficients",
+        "coefficient_counts",
+        "_component_indices"
+    )
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        component_names: Sequence[str],
+        mass_fractions: np.ndarray,
+        densities: np.ndarray,
+        large_particles_fractions: np.ndarray,
+        agglomeration_coefficients: np.ndarray,
+        coefficient_counts: np.ndarray
+    ):
+        self.names = tuple(names)
+        self.component_names = tuple(component_names)
+        self.mass_fractions = mass_fractions
+        self.densities = densities
+        self.large_particles_fractions = large_particles_fractions
+        self.agglomeration_coefficients = agglomeration_coefficients
+        self.coefficient_counts = coefficient_counts
+        self._component_indices = {name: i for i, name in enumerate(self.component_names)}
+
+        expected = (len(self.names), len(self.component_names))
+        for column in (mass_fractions, densities, large_particles_fractions, coefficient_counts):
+            if column.shape != expected:
+                raise ValueError(f"Expected a column of shape {expected}, but got {column.shape}")
+        if agglomeration_coefficients.shape[:2] != expected:
+            raise ValueError(
+                f"Expected coefficients of shape {expected + (-1,)}, but got {agglomeration_coefficients.shape}")
+
+    @staticmethod
+    def from_records(
+        records: Iterable[dict],
+        component_names: Sequence[str] = DEFAULT_COMPONENT_NAMES
+    ) -> "PropellantSet":
+        """
+        Build the set from raw propellant records as found in propellants.json.
+
+        The records are consumed one at a time into growable typed arrays, so an
+        iterator over a large file never materializes the records.
+
+        Args:
+            records (Iterable[dict]): Propellant records with "name" and "components".
+            component_names (Sequence[str]): Component names in column order.
+
+        Returns:
+            PropellantSet: The columnar propellant properties.
+
+        Raises:
+            ValueError: If a record contains a component that is not a column.
+        """
+        component_indices = {name: i for i, name in enumerate(component_names)}
+        width = len(component_names)
+
+        names: List[str] = []
+        mass_fractions = array("d")
+        densities = array("d")
+        large_particles_fractions = array("d")
+        coefficient_counts = array("l")
+        coefficients: List[Tuple[int, int, Sequence[float]]] = []
+        max_count = 0
+
+        for row, record in enumerate(records):
+            components = record.get("components", {})
+            if not isinstance(components, dict):
+                raise ValueError(f"Expected a dictionary for propellant data, but got {type(components)}")
+
+            values = [[np.nan] * width for _ in range(3)]
+            counts = [0] * width
+            for component_name, data in components.items():
+                column = component_indices.get(component_name)
+                if column is None:
+                    raise ValueError(
+                        f"Unknown component '{component_name}' in propellant '{record.get('name')}'")
+                values[0][column] = data.get("mass_fraction", 0.0)
+                density = data.get("density")
+                values[1][column] = np.nan if density is None else density
+                fraction = data.get("large_particles_fraction")
+                values[2][column] = np.nan if fraction is None else fraction
+                row_coefficients = data.get("agglomeration_coefficients") or []
+                if row_coefficients:
+                    counts[column] = len(row_coefficients)
+                    max_count = max(max_count, len(row_coefficients))
+                    coefficients.append((row, column, row_coefficients))
+
+            names.append(record.get("name"))
+            mass_fractions.extend(values[0])
+            densities.extend(values[1])
+            large_particles_fractions.extend(values[2])
+            coefficient_counts.extend(counts)
+
+        shape = (len(names), width)
+        agglomeration_coefficients = np.zeros(shape + (max_count,))
+        for row, column, row_coefficients in coefficients:
+            agglomeration_coefficients[row, column, :len(row_coefficients)] = row_coefficients
+
+        return PropellantSet(
+            names=names,
+            component_names=component_names,
+            mass_fractions=np.frombuffer(mass_fractions, dtype=float).reshape(shape),
+            densities=np.frombuffer(densities, dtype=float).reshape(shape),
+            large_particles_fractions=np.frombuffer(large_particles_fractions, dtype=float).reshape(shape),
+            agglomeration_coefficients=agglomeration_coefficients,
+            coefficient_counts=np.array(coefficient_counts, dtype=np.int64).reshape(shape)
+        )
+
+    @staticmethod
+    def from_propellants(
+        propellants: Iterable[Propellant],
+        component_names: Sequence[str] = DEFAULT_COMPONENT_NAMES
+    ) -> "PropellantSet":
+        """
+        Build the set from `Propellant` objects. Densities that are not given are left as NaN.
+
+        Args:
+            propellants (Iterable[Propellant]): The propellants to convert.
+            component_names (Sequence[str]): Component names in column order.
+
+        Returns:
+            PropellantSet: The columnar propellant properties.
+        """
+        return PropellantSet.from_records((
+            {
+                "name": propellant.name,
+                "components": {
+                    name: {
+                        "mass_fraction": component.mass_fraction,
+                        "density": component.density,
+                        "large_particles_fraction": component.large_particles_fraction,
+                        "agglomeration_coefficients": component.agglomeration_coefficients
+                    }
+                    for name, component in propellant.components.items()
+                }
+            }
+            for propellant in propellants
+        ), component_names)
+
+    def take(self, indices: Sequence[int]) -> "PropellantSet":
+        """
+        Return a new set with copies of the given rows, in the given order.
+
+        Args:
+            indices (Sequence[int]): Row indices; rows may repeat.
+
+        Returns:
+            PropellantSet: The selected propellants.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        return PropellantSet(
+            names=[self.names[i] for i in indices],
+            component_names=self.component_names,
+            mass_fractions=self.mass_fractions[indices],
+            densities=self.densities[indices],
+            large_particles_fractions=self.large_particles_fractions[indices],
+            agglomeration_coefficients=self.agglomeration_coefficients[indices],
+            coefficient_counts=self.coefficient_counts[indices]
+        )
+
+    def column(self, component_name: str) -> int:
+        """
+        Return the column index of a component.
+
+        Raises:
+            KeyError: If the component is not a column of the set.
+        """
+        return self._component_indices[component_name]
+
+    def mass_fraction(self, component_name: str) -> np.ndarray:
+        """
+        Return the mass fractions of a component in every propellant, shape (N,).
+        """
+        return self.mass_fractions[:, self.column(component_name)]
+
+    def large_particles_fraction(self, component_name: str) -> np.ndarray:
+        """
+        Return the large particles fractions of a component in every propellant, shape (N,).
+        """
+        return self.large_particles_fractions[:, self.column(component_name)]
+
+    def coefficients(self, component_name: str) -> np.ndarray:
+        """
+        Return the zero-padded agglomeration coefficients of a component, shape (N, K).
+        """
+        return self.agglomeration_coefficients[:, self.column(component_name), :]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> Propellant:
+        """
+        Return a `Propellant` view of a row. Components with a NaN mass fraction are omitted.
+        """
+        components: Dict[str, PropellantComponent] = {}
+        for column, component_name in enumerate(self.component_names):
+            mass_fraction = self.mass_fractions[index, column]
+            if np.isnan(mass_fraction):
+                continue
+            large_particles_fraction = self.large_particles_fractions[index, column]
+            density = self.densities[index, column]
+            count = self.coefficient_counts[index, column]
+            components[component_name] = PropellantComponent(
+                mass_fraction=float(mass_fraction),
+                large_particles_fraction=(
+                    None if np.isnan(large_particles_fraction) else float(large_particles_fraction)),
+                agglomeration_coefficients=self.agglomeration_coefficients[index, column, :count].tolist(),
+                density=None if np.isnan(density) else float(density)
+            )
+        return Propellant(name=self.names[index], components=components)
+
+    def __iter__(self) -> Iterator[Propellant]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def density(self, index: int, component_name: str) -> Optional[float]:
+        """
+        Return the density of a component in a propellant, or None if it is not given.
+        """
+        density = self.densities[index, self.column(component_name)]
+        return None if np.isnan(density) else float(density)
@@ -0,0 +1,229 @@
+"""
+This module contains the vectorized region engine. It evaluates the elemental composition
+and enthalpy of every region for many propellants and pressures at once, using NumPy array
+contractions instead of walking dictionaries per component.
+
+The engine is built once from the component data:
+    - element_matrix: component x element matrix holding moles of element per kg of component.
+    - enthalpies: component vector holding enthalpies in joule per kg.
+
+Region compositions and enthalpies are then linear in the region mass fractions:
+    composition = mass_fractions @ element_matrix
+    enthalpy = mass_fractions @ enthalpies
+
+The region mass fractions come from the region specs (see `region_specs`), compiled
+once per engine against its component order.
+
+Classes:
+    - RegionEngine: Compiled component data and batched region evaluation.
+
+Usage:
+    engine = RegionEngine(read_components("components.json"))
+    propellants = PropellantSet.from_propellants(read_propellants("propellants.json"))
+    compositions, enthalpies = engine.calculate(engine.map_regions(propellants, pressures))
+"""
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from models import ComponentTable
+from propellant_set import PropellantSet
+from region_specs import REGION_SPECS, CompiledRegions
+
+# Region order of the batched results, named after the output files
+REGIONS = tuple(spec.name for spec in REGION_SPECS)
+
+# Components contributing to every region, in the order used by the scalar mappers
+REGION_COMPONENTS = {spec.name: spec.components for spec in REGION_SPECS}
+
+class RegionEngine:
+    """
+    Compiled component data for batched evaluation of region compositions and enthalpies.
+
+    Attributes:
+        component_names (Tuple[str, ...]): Component names in the order of the matrix rows.
+        elements (Tuple[str, ...]): Element symbols in the order of the matrix columns.
+        element_matrix (np.ndarray): Moles of element per kg of component, shape (C, E).
+        enthalpies (np.ndarray): Enthalpies of the components in joule per kg, shape (C,).
+    """
+
+    _last = None
+
+    def __init__(self, component_data: ComponentTable):
+        """
+        Compile the component data into the element matrix and the enthalpy vector.
+
+        Args:
+            component_data (ComponentTable): The component table with precompiled elemental compositions.
+        """
+        self.component_names = tuple(component_data)
+        self.elements = tuple(dict.fromkeys(
+            element for component in component_data.values() for element in component.composition
+        ))
+        self._component_indices = {name: i for i, name in enumerate(self.component_names)}
+        self._component_elements = {
+            name: tuple(component.composition) for name, component in component_data.items()
+        }
+
+        self._element_indices = {element: j for j, element in enumerate(self.elements)}
+        self.element_matrix = np.zeros((len(self.component_names), len(self.elements)))
+        for i, name in enumerate(self.component_names):
+            for element, content in component_data.specific_composition(name).items():
+                self.element_matrix[i, self._element_indices[element]] = content
+        self.enthalpies = np.array([c.enthalpy for c in component_data.values()], dtype=float)
+
+        self.element_matrix.setflags(write=False)
+        self.enthalpies.setflags(write=False)
+        self._regions = None
+
+    @property
+    def regions(self) -> CompiledRegions:
+        """
+        The region specs compiled against the component order, on first use, since
+        per-item calculations do not need every region component in the table.
+        """
+        if self._regions is None:
+            self._regions = CompiledRegions(REGION_SPECS, self.component_names)
+        return self._regions
+
+    @staticmethod
+    def for_components(component_data: ComponentTable) -> "RegionEngine":
+        """
+        Return the engine for the component data, reusing the last compiled engine
+        when it was built from the same object.
+
+        Args:
+            component_data (ComponentTable): The component table.
+
+        Returns:
+            RegionEngine: The compiled engine.
+        """
+        cached = RegionEngine._last
+        if cached is None or cached[0] is not component_data:
+            cached = (component_data, RegionEngine(component_data))
+            RegionEngine._last = cached
+        return cached[1]
+
+    def component_vector(self, components: Dict[str, float]) -> np.ndarray:
+        """
+        Convert a dictionary of component mass fractions to a vector in engine order.
+
+        Args:
+            components (Dict[str, float]): Component names and their mass fractions.
+
+        Returns:
+            np.ndarray: Mass fractions, shape (C,).
+
+        Raises:
+            KeyError: If a component is not present in the component data.
+        """
+        vector = np.zeros(len(self.component_names))
+        for name, mass_fraction in components.items():
+            vector[self._component_indices[name]] = mass_fraction
+        return vector
+
+    def region_elements(self, component_names: Sequence[str]) -> Tuple[str, ...]:
+        """
+        Return the elements present in a region, in order of first appearance.
+
+        Args:
+            component_names (Sequence[str]): Names of the components of the region.
+
+        Returns:
+            Tuple[str, ...]: Element symbols of the region.
+        """
+        return tuple(dict.fromkeys(
+            element for name in component_names for element in self._component_elements[name]
+        ))
+
+    def composition_dict(self, composition: np.ndarray, elements: Sequence[str]) -> Dict[str, float]:
+        """
+        Convert a composition vector to a dictionary restricted to the given elements.
+
+        Args:
+            composition (np.ndarray): Composition in engine element order, shape (E,).
+            elements (Sequence[str]): Element symbols to include.
+
+        Returns:
+            Dict[str, float]: Element symbols and their moles per kg.
+        """
+        return {element: float(composition[self._element_indices[element]]) for element in elements}
+
+    def calculate(self, mass_fractions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate elemental compositions and enthalpies for any batch of regions.
+
+        Args:
+            mass_fractions (np.ndarray): Region mass fractions in engine component order, shape (..., C).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Compositions in moles per kg, shape (..., E), and
+                enthalpies in joule per kg, shape (...).
+        """
+        mass_fractions = np.asarray(mass_fractions, dtype=float)
+        return mass_fractions @ self.element_matrix, mass_fractions @ self.enthalpies
+
+    def map_regions(self, propellants: PropellantSet, pressures: Sequence[float]) -> np.ndarray:
+        """
+        Calculate the mass fractions of every region for N propellants and P pressures.
+
+        The formulas are the compiled `REGION_SPECS`, matching the scalar mappers in `region_mappers`.
+
+        Args:
+            propellants (PropellantSet): Columnar propellant properties.
+            pressures (Sequence[float]): Pressures in Pascals, shape (P,).
+
+        Returns:
+            np.ndarray: Region mass fractions in engine component order, shape (N, P, len(REGIONS), C).
+
+        Raises:
+            ValueError: If any mass fraction or region mass is invalid.
+        """
+        return self.regions.map(propellants, pressures)
+
+    def calculate_regions(
+        self,
+        propellants: PropellantSet,
+        pressures: Sequence[float]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate compositions and enthalpies of every region for N propellants and P pressures.
+
+        Args:
+            propellants (PropellantSet): Columnar propellant properties.
+            pressures (Sequence[float]): Pressures in Pascals, shape (P,).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Compositions, shape (N, P, len(REGIONS), E), and
+                enthalpies, shape (N, P, len(REGIONS)).
+        """
+        return self.calculate(self.map_regions(propellants, pressures))
+
+    def calculate_regions_with_jacobian(
+        self,
+        propellants: PropellantSet,
+        pressures: Sequence[float]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Tuple[str, ...]]:
+        """
+        Calculate compositions and enthalpies of every region together with their exact
+        derivatives with respect to the propellant parameters, see `CompiledRegions.map_with_jacobian`.
+
+        Compositions and enthalpies are linear in the region mass fractions, so their
+        derivatives are the mass fraction derivatives contracted with the component data.
+
+        Args:
+            propellants (PropellantSet): Columnar propellant properties.
+            pressures (Sequence[float]): Pressures in Pascals, shape (P,).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Tuple[str, ...]]: Compositions,
+                shape (N, P, len(REGIONS), E), enthalpies, shape (N, P, len(REGIONS)), their
+                derivatives, shapes (N, P, len(REGIONS), E, Q) and (N, P, len(REGIONS), Q),
+                and the names of the Q parameters.
+        """
+        mass_fractions, derivatives, parameters = self.regions.map_with_jacobian(propellants, pressures)
+        compositions, enthalpies = self.calculate(mass_fractions)
+        composition_derivatives = np.einsum("nprcq,ce->npreq", derivatives, self.element_matrix)
+        enthalpy_derivatives = np.einsum("nprcq,c->nprq", derivatives, self.enthalpies)
+        return compositions, enthalpies, composition_derivatives, enthalpy_derivatives, parameters
@@ -5,6 +5,10 @@ and calculates the normalized mass fractions of components based on the input pr
 and pressure (if applicable). The classes do not store any data internally; all arguments 
 are passed directly to the methods.
 
+The regions are defined declaratively in `region_specs.REGION_SPECS`; each mapper evaluates
+the spec of its region for a single propellant, and `RegionEngine` evaluates the same specs
+for whole propellant sets.
+
 Regions:
     1. Inter-pocket region: Homogeneous mixture of all components.
     2. Pocket region without skeleton: Remaining homogeneous mixture excluding large particles.
@@ -26,11 +30,14 @@ Usage:
 """
 
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, Optional
+
+from models import Propellant
+from region_specs import REGION_SPECS, RegionSpec, validate_component
 
-from models import Propellant, PropellantComponent
+_SPECS = {spec.name: spec for spec in REGION_SPECS}
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RegionData:
     """
     Data Transfer Object (DTO) for storing the result of preprocessing calculations.
@@ -45,25 +52,31 @@ class RegionData:
 
 class BaseMapper:
     """
-    Base class for all mappers. Provides utility methods for error handling and validation.
+    Base class for all mappers. Evaluates the region spec of the mapper for a propellant.
+
+    Attributes:
+        spec (RegionSpec): The spec of the mapped region.
     """
+    spec: RegionSpec
 
     @staticmethod
-    def _validate_component(component: PropellantComponent, name: str):
+    def _validate_component(component, name: str):
         """
         Validate that a component exists and has valid properties.
 
-        Args:
-            component (PropellantComponent): The component to validate.
-            name (str): The name of the component.
-
         Raises:
             ValueError: If the component is invalid or missing.
         """
-        if component.mass_fraction < 0 or component.mass_fraction > 1:
-            raise ValueError(f"Invalid mass fraction for component '{name}': {component.mass_fraction}")
-        if component.mass_fraction == 0:
-            raise ValueError(f"Missing or zero mass fraction for component '{name}'")
+        validate_component(component, name)
+
+    def _map(self, propellant: Propellant, pressure: Optional[float] = None) -> RegionData:
+        """
+        Evaluate the region spec for a propellant.
+
+        Raises:
+            ValueError: If any required component is missing or invalid.
+        """
+        return RegionData(self.spec.evaluate(propellant, pressure))
 
 class InterPocketRegionMapper(BaseMapper):
     """
@@ -74,6 +87,7 @@ class InterPocketRegionMapper(BaseMapper):
         calculate(propellant: Propellant) -> RegionData:
             Calculates the mass fractions for the inter-pocket region.
     """
+    spec = _SPECS["inter_pocket"]
 
     def calculate(self, propellant: Propellant) -> RegionData:
         """
@@ -88,26 +102,7 @@ class InterPocketRegionMapper(BaseMapper):
         Raises:
             ValueError: If any required component is missing or invalid.
         """
-        # Extract and validate components
-        binder = propellant.components.get("CombustibleBinder")
-        ap = propellant.components.get("AmmoniumPerchlorate")
-        al = propellant.components.get("Aluminum")
-        hmx = propellant.components.get("Octogen")
-
-        self._validate_component(binder, "CombustibleBinder")
-        self._validate_component(ap, "AmmoniumPerchlorate")
-        self._validate_component(al, "Aluminum")
-        self._validate_component(hmx, "Octogen")
-
-        # Mass fractions are numerically equal to the original propellant's mass fractions
-        components = {
-            "CombustibleBinder": binder.mass_fraction,
-            "AmmoniumPerchlorate": ap.mass_fraction,
-            "Aluminum": al.mass_fraction,
-            "Octogen": hmx.mass_fraction
-        }
-
-        return RegionData(components)
+        return self._map(propellant)
 
 class PocketRegionWithoutSkeletonMapper(BaseMapper):
     """
@@ -117,6 +112,7 @@ class PocketRegionWithoutSkeletonMapper(BaseMapper):
         calculate(propellant: Propellant) -> RegionData:
             Calculates the mass fractions for the pocket region without skeleton.
     """
+    spec = _SPECS["pocket_without_skeleton"]
 
     def calculate(self, propellant: Propellant) -> RegionData:
         """
@@ -131,42 +127,7 @@ class PocketRegionWithoutSkeletonMapper(BaseMapper):
         Raises:
             ValueError: If any required component is missing or invalid.
         """
-        # Extract and validate components
-        binder = propellant.components.get("CombustibleBinder")
-        ap = propellant.components.get("AmmoniumPerchlorate")
-        al = propellant.components.get("Aluminum")
-
-        self._validate_component(binder, "CombustibleBinder")
-        self._validate_component(ap, "AmmoniumPerchlorate")
-        self._validate_component(al, "Aluminum")
-
-        # Assume total propellant mass is 1 kg
-        propellant_mass = 1.0
-
-        # Convert mass fractions to masses
-        binder_mass = binder.mass_fraction * propellant_mass
-        ap_mass = ap.mass_fraction * (1 - ap.large_particles_fraction) * propellant_mass
-        al_mass = al.mass_fraction * propellant_mass
-
-        # Calculate homogeneous mixture mass (exclude large particles AP and HMX)
-        homogeneous_mixture_mass = (
-            binder_mass +
-            ap_mass +
-            al_mass
-        )
-
-        # Validate mixture mass
-        if homogeneous_mixture_mass <= 0:
-            raise ValueError("Homogeneous mixture mass must be greater than zero.")
-
-        # Calculate mass fractions relative to homogeneous mixture mass
-        components = {
-            "CombustibleBinder": binder_mass / homogeneous_mixture_mass,
-            "AmmoniumPerchlorate": ap_mass / homogeneous_mixture_mass,
-            "Aluminum": al_mass / homogeneous_mixture_mass
-        }
-
-        return RegionData(components)
+        return self._map(propellant)
 
 class PocketRegionWithSkeletonMapper(BaseMapper):
     """
@@ -176,6 +137,7 @@ class PocketRegionWithSkeletonMapper(BaseMapper):
         calculate(propellant: Propellant) -> RegionData:
             Calculates the mass fractions for the pocket region with skeleton.
     """
+    spec = _SPECS["pocket_with_skeleton"]
 
     def calculate(self, propellant: Propellant) -> RegionData:
         """
@@ -190,34 +152,7 @@ class PocketRegionWithSkeletonMapper(BaseMapper):
         Raises:
             ValueError: If any required component is missing or invalid.
         """
-        # Extract and validate components
-        binder = propellant.components.get("CombustibleBinder")
-        ap = propellant.components.get("AmmoniumPerchlorate")
-
-        self._validate_component(binder, "CombustibleBinder")
-        self._validate_component(ap, "AmmoniumPerchlorate")
-
-        # Assume total propellant mass is 1 kg
-        propellant_mass = 1.0
-
-        # Convert mass fractions to masses
-        binder_mass = binder.mass_fraction * propellant_mass
-        ap_mass = ap.mass_fraction * (1 - ap.large_particles_fraction) * propellant_mass
-
-        # Calculate skeleton region mass (only binder and small fractions AP)
-        skeleton_mass = binder_mass + ap_mass
-
-        # Validate skeleton mass
-        if skeleton_mass <= 0:
-            raise ValueError("Skeleton region mass must be greater than zero.")
-
-        # Calculate mass fractions relative to skeleton region mass
-        components = {
-            "CombustibleBinder": binder_mass / skeleton_mass,
-            "AmmoniumPerchlorate": ap_mass / skeleton_mass
-        }
-
-        return RegionData(components)
+        return self._map(propellant)
 
 class DiffusionRegionMapper(BaseMapper):
     """
@@ -227,6 +162,7 @@ class DiffusionRegionMapper(BaseMapper):
         calculate(propellant: Propellant, pressure: float) -> RegionData:
             Calculates the mass fractions for the diffusion region.
     """
+    spec = _SPECS["diffusion"]
 
     def calculate(self, propellant: Propellant, pressure: float) -> RegionData:
         """
@@ -242,69 +178,4 @@ class DiffusionRegionMapper(BaseMapper):
         Raises:
             ValueError: If any required component is missing or invalid.
         """
-        # Extract and validate components
-        binder = propellant.components.get("CombustibleBinder")
-        ap = propellant.components.get("AmmoniumPerchlorate")
-        al = propellant.components.get("Aluminum")
-        hmx = propellant.components.get("Octogen")
-
-        self._validate_component(binder, "CombustibleBinder")
-        self._validate_component(ap, "AmmoniumPerchlorate")
-        self._validate_component(al, "Aluminum")
-        self._validate_component(hmx, "Octogen")
-
-        # Assume total propellant mass is 1 kg
-        propellant_mass = 1.0
-
-        # Convert mass fractions to masses
-        binder_mass = binder.mass_fraction * propellant_mass
-        ap_mass = ap.mass_fraction * propellant_mass
-        hmx_mass = hmx.mass_fraction * propellant_mass
-
-        # Calculate non-agglomerated Aluminum mass
-        al_non_agglomerated_mass = self._calculate_non_agglomerated_Aluminum(al, pressure)
-
-        # Total mass of the diffusion region
-        diffusion_mass = binder_mass + ap_mass + hmx_mass + al_non_agglomerated_mass
-
-        # Validate diffusion mass
-        if diffusion_mass <= 0:
-            raise ValueError("Diffusion region mass must be greater than zero.")
-
-        # Calculate mass fractions relative to diffusion mass
-        components = {
-            "CombustibleBinder": binder_mass / diffusion_mass,
-            "AmmoniumPerchlorate": ap_mass / diffusion_mass,
-            "Octogen": hmx_mass / diffusion_mass,
-            "Aluminum": al_non_agglomerated_mass / diffusion_mass
-        }
-
-        return RegionData(components)
-
-    def _calculate_non_agglomerated_Aluminum(self, al: PropellantComponent, pressure: float) -> float:
-        """
-        Calculate the mass of non-agglomerated Aluminum.
-
-        Args:
-            al (PropellantComponent): Aluminum component.
-            pressure (float): Pressure in Pascals.
-
-        Returns:
-            float: Mass of non-agglomerated Aluminum.
-        """
-        agglomeration_fraction = self._calculate_agglomeration_fraction(al.agglomeration_coefficients, pressure)
-        # print("Agglomeration fraction", agglomeration_fraction)
-        return al.mass_fraction * (1 - agglomeration_fraction)
-
-    def _calculate_agglomeration_fraction(self, coefficients: List[float], pressure: float) -> float:
-        """
-        Calculate agglomeration fraction using polynomial coefficients.
-
-        Args:
-            coefficients (List[float]): Polynomial coefficients.
-            pressure (float): Pressure in Pascals.
-
-        Returns:
-            float: Agglomeration fraction.
-        """
-        return sum(coeff * (pressure / 1e6) ** i for i, coeff in enumerate(coefficients))
+        return self._map(propellant, pressure)
@@ -0,0 +1,467 @@
+"""
+This module contains the declarative definitions of the propellant regions. A region is a
+list of terms, each contributing a component mass fraction to the region, optionally
+reduced by a fraction of that component:
+
+    CombustibleBinder
+    AmmoniumPerchlorate * (1 - large_particles_fraction)
+    Aluminum * (1 - agglomeration_fraction)
+
+The large particles fraction is a property of the propellant component, while the
+agglomeration fraction is a polynomial of the pressure (see `polynomials`). The region
+mass fractions are the term masses, normalized by the region mass unless disabled.
+
+Since every term is linear in the component mass fractions, the specs are compiled once
+into coefficient matrices over the component axis, one for the plain terms and one per
+excluded fraction. All regions are then evaluated for many propellants and pressures in
+a single fused pass:
+
+    masses[n, p, r, c] = x[n, c] * (A[r, c] - sum_f F_f[n, p, c] * B_f[r, c])
+
+The same form gives exact derivatives of the region mass fractions with respect to the
+component mass fractions, the large particles fractions and the agglomeration coefficients,
+computed alongside the values by `CompiledRegions.map_with_jacobian`.
+
+Classes:
+    - RegionTerm: A component mass fraction, optionally reduced by one of its fractions.
+    - RegionSpec: The named list of terms defining a region.
+    - CompiledRegions: Specs compiled into coefficient matrices for batched evaluation.
+
+Constants:
+    - REGION_SPECS: The regions written by the region mapper, in output order.
+"""
+
+import re
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import Propellant, PropellantComponent
+from polynomials import calculate_agglomeration_fraction, pressure_polynomial_basis
+from propellant_set import PropellantSet
+
+LARGE_PARTICLES_FRACTION = "large_particles_fraction"
+AGGLOMERATION_FRACTION = "agglomeration_fraction"
+
+# Fractions a term can exclude from its component, and whether they depend on pressure
+FRACTIONS = {
+    LARGE_PARTICLES_FRACTION: False,
+    AGGLOMERATION_FRACTION: True
+}
+
+_TERM_PATTERN = re.compile(r"^\s*(\w+)\s*(?:\*\s*\(\s*1\s*-\s*(\w+)\s*\))?\s*$")
+
+@dataclass(frozen=True, slots=True)
+class RegionTerm:
+    """
+    A component mass fraction contributing to a region.
+
+    Attributes:
+        component (str): Name of the component.
+        excluded_fraction (Optional[str]): Fraction of the component excluded from the region,
+            one of `FRACTIONS`, or None if the whole component contributes.
+    """
+    component: str
+    excluded_fraction: Optional[str] = None
+
+    def __post_init__(self):
+        if self.excluded_fraction is not None and self.excluded_fraction not in FRACTIONS:
+            raise ValueError(f"Unknown fraction '{self.excluded_fraction}', expected one of {tuple(FRACTIONS)}")
+
+    @staticmethod
+    def parse(expression: str) -> "RegionTerm":
+        """
+        Parse a term of the form "Component" or "Component * (1 - fraction)".
+
+        Args:
+            expression (str): The term expression.
+
+        Returns:
+            RegionTerm: The parsed term.
+
+        Raises:
+            ValueError: If the expression is malformed or names an unknown fraction.
+        """
+        match = _TERM_PATTERN.match(expression)
+        if match is None:
+            raise ValueError(f"Invalid region term '{expression}'")
+        return RegionTerm(component=match.group(1), excluded_fraction=match.group(2))
+
+    def __str__(self) -> str:
+        if self.excluded_fraction is None:
+            return self.component
+        return f"{self.component} * (1 - {self.excluded_fraction})"
+
+@dataclass(frozen=True, slots=True)
+class RegionSpec:
+    """
+    Declarative definition of a region.
+
+    Attributes:
+        name (str): Name of the region, also the stem of its output file.
+        label (str): Human-readable name used in error messages.
+        terms (Tuple[RegionTerm, ...]): The terms in the order of the region components.
+        normalize (bool): Whether the term masses are normalized by the region mass.
+    """
+    name: str
+    label: str
+    terms: Tuple[RegionTerm, ...]
+    normalize: bool = True
+
+    @staticmethod
+    def from_expressions(
+        name: str,
+        label: str,
+        expressions: Iterable[str],
+        normalize: bool = True
+    ) -> "RegionSpec":
+        """
+        Build a spec from term expressions, see `RegionTerm.parse`.
+        """
+        return RegionSpec(
+            name=name,
+            label=label,
+            terms=tuple(RegionTerm.parse(expression) for expression in expressions),
+            normalize=normalize
+        )
+
+    @property
+    def components(self) -> Tuple[str, ...]:
+        """
+        Names of the components of the region, in term order.
+        """
+        return tuple(dict.fromkeys(term.component for term in self.terms))
+
+    @property
+    def pressure_dependent(self) -> bool:
+        """
+        Whether the region mass fractions depend on pressure.
+        """
+        return any(term.excluded_fraction and FRACTIONS[term.excluded_fraction] for term in self.terms)
+
+    def evaluate(self, propellant: Propellant, pressure: Optional[float] = None) -> Dict[str, float]:
+        """
+        Calculate the mass fractions of the region for a single propellant.
+
+        Args:
+            propellant (Propellant): The propellant object containing all components.
+            pressure (Optional[float]): Pressure in Pascals, required for pressure-dependent regions.
+
+        Returns:
+            Dict[str, float]: Component names and their mass fractions in the region.
+
+        Raises:
+            ValueError: If any required component is missing or invalid, or the region mass is not positive.
+        """
+        if pressure is None and self.pressure_dependent:
+            raise ValueError(f"Region '{self.name}' depends on pressure, but no pressure was given.")
+
+        components: Dict[str, PropellantComponent] = {}
+        for name in self.components:
+            component = propellant.components.get(name)
+            validate_component(component, name)
+            components[name] = component
+
+        # Assume total propellant mass is 1 kg, so masses equal mass fractions
+        masses: Dict[str, float] = {}
+        for term in self.terms:
+            component = components[term.component]
+            mass = component.mass_fraction
+            if term.excluded_fraction is not None:
+                mass = mass * (1 - component_fraction(component, term.excluded_fraction, pressure))
+            masses[term.component] = masses.get(term.component, 0.0) + mass
+
+        if not self.normalize:
+            return masses
+
+        region_mass = sum(masses.values())
+        if region_mass <= 0:
+            raise ValueError(f"{self.label} mass must be greater than zero.")
+        return {name: mass / region_mass for name, mass in masses.items()}
+
+    def __str__(self) -> str:
+        return f"{self.name} = " + " + ".join(str(term) for term in self.terms)
+
+# Regions written by the region mapper, in output order
+REGION_SPECS = (
+    RegionSpec.from_expressions(
+        "inter_pocket", "Inter-pocket region",
+        ["CombustibleBinder", "AmmoniumPerchlorate", "Aluminum", "Octogen"],
+        # Mass fractions are numerically equal to the original propellant's mass fractions
+        normalize=False
+    ),
+    RegionSpec.from_expressions(
+        "pocket_without_skeleton", "Homogeneous mixture",
+        ["CombustibleBinder", "AmmoniumPerchlorate * (1 - large_particles_fraction)", "Aluminum"]
+    ),
+    RegionSpec.from_expressions(
+        "pocket_with_skeleton", "Skeleton region",
+        ["CombustibleBinder", "AmmoniumPerchlorate * (1 - large_particles_fraction)"]
+    ),
+    RegionSpec.from_expressions(
+        "diffusion", "Diffusion region",
+        ["CombustibleBinder", "AmmoniumPerchlorate", "Octogen", "Aluminum * (1 - agglomeration_fraction)"]
+    )
+)
+
+def validate_component(component: Optional[PropellantComponent], name: str) -> None:
+    """
+    Validate that a component exists and has a valid mass fraction.
+
+    Args:
+        component (Optional[PropellantComponent]): The component to validate.
+        name (str): The name of the component.
+
+    Raises:
+        ValueError: If the component is invalid or missing.
+    """
+    if component is None:
+        raise ValueError(f"Missing or zero mass fraction for component '{name}'")
+    if component.mass_fraction < 0 or component.mass_fraction > 1:
+        raise ValueError(f"Invalid mass fraction for component '{name}': {component.mass_fraction}")
+    if component.mass_fraction == 0:
+        raise ValueError(f"Missing or zero mass fraction for component '{name}'")
+
+def component_fraction(component: PropellantComponent, fraction: str, pressure: Optional[float]) -> float:
+    """
+    Return a fraction of a single propellant component.
+
+    Args:
+        component (PropellantComponent): The propellant component.
+        fraction (str): One of `FRACTIONS`.
+        pressure (Optional[float]): Pressure in Pascals, for pressure-dependent fractions.
+
+    Returns:
+        float: The fraction. A missing large particles fraction is zero.
+    """
+    if fraction == LARGE_PARTICLES_FRACTION:
+        return component.large_particles_fraction or 0.0
+    if fraction == AGGLOMERATION_FRACTION:
+        return calculate_agglomeration_fraction(component.agglomeration_coefficients, pressure)
+    raise ValueError(f"Unknown fraction '{fraction}'")
+
+def set_fraction(
+    propellants: PropellantSet,
+    component_name: str,
+    fraction: str,
+    pressures: np.ndarray
+) -> np.ndarray:
+    """
+    Return a fraction of a component for every propellant of a set.
+
+    Args:
+        propellants (PropellantSet): Columnar propellant properties.
+        component_name (str): Name of the component.
+        fraction (str): One of `FRACTIONS`.
+        pressures (np.ndarray): Pressures in Pascals, shape (P,).
+
+    Returns:
+        np.ndarray: The fractions, shape (N, P) for pressure-dependent fractions, else (N, 1).
+            Missing large particles fractions are zero.
+    """
+    if fraction == LARGE_PARTICLES_FRACTION:
+        return np.nan_to_num(propellants.large_particles_fraction(component_name))[:, None]
+    if fraction == AGGLOMERATION_FRACTION:
+        return calculate_agglomeration_fraction(propellants.coefficients(component_name), pressures)
+    raise ValueError(f"Unknown fraction '{fraction}'")
+
+def set_fraction_derivatives(
+    propellants: PropellantSet,
+    component_name: str,
+    fraction: str,
+    pressures: np.ndarray
+) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """
+    Return the derivatives of a fraction of a component with respect to its input parameters.
+
+    Args:
+        propellants (PropellantSet): Columnar propellant properties.
+        component_name (str): Name of the component.
+        fraction (str): One of `FRACTIONS`.
+        pressures (np.ndarray): Pressures in Pascals, shape (P,).
+
+    Returns:
+        Tuple[Tuple[str, ...], np.ndarray]: Names of the Q parameters, and the derivatives,
+            broadcastable to shape (N, P, Q).
+    """
+    if fraction == LARGE_PARTICLES_FRACTION:
+        return (f"{component_name}.large_particles_fraction",), np.ones((1, 1, 1))
+    if fraction == AGGLOMERATION_FRACTION:
+        count = propellants.coefficients(component_name).shape[-1]
+        names = tuple(f"{component_name}.agglomeration_coefficients[{k}]" for k in range(count))
+        return names, pressure_polynomial_basis(pressures, count)[None]
+    raise ValueError(f"Unknown fraction '{fraction}'")
+
+class CompiledRegions:
+    """
+    Region specs compiled into coefficient matrices over a component axis.
+
+    Attributes:
+        specs (Tuple[RegionSpec, ...]): The compiled specs, in region axis order.
+        component_names (Tuple[str, ...]): Component names in component axis order.
+        coefficients (np.ndarray): Number of terms of every component in every region, shape (R, C).
+        fraction_coefficients (Dict[str, np.ndarray]): Number of terms excluding a fraction
+            of every component in every region, shape (R, C), for every fraction in use.
+        required_components (Tuple[str, ...]): Components that must be present in every propellant.
+    """
+
+    def __init__(self, specs: Sequence[RegionSpec], component_names: Sequence[str]):
+        """
+        Compile the specs.
+
+        Args:
+            specs (Sequence[RegionSpec]): The region specs.
+            component_names (Sequence[str]): Component names in component axis order.
+
+        Raises:
+            ValueError: If a spec names a component that is not in `component_names`.
+        """
+        self.specs = tuple(specs)
+        self.component_names = tuple(component_names)
+        self._component_indices = {name: i for i, name in enumerate(self.component_names)}
+
+        shape = (len(self.specs), len(self.component_names))
+        self.coefficients = np.zeros(shape)
+        self.fraction_coefficients: Dict[str, np.ndarray] = {}
+        for r, spec in enumerate(self.specs):
+            for term in spec.terms:
+                c = self._component_indices.get(term.component)
+                if c is None:
+                    raise ValueError(f"Region '{spec.name}' uses unknown component '{term.component}'")
+                self.coefficients[r, c] += 1
+                if term.excluded_fraction is not None:
+                    matrix = self.fraction_coefficients.setdefault(term.excluded_fraction, np.zeros(shape))
+                    matrix[r, c] += 1
+
+        self.required_components = tuple(dict.fromkeys(name for spec in self.specs for name in spec.components))
+        self._normalized = np.array([spec.normalize for spec in self.specs])
+
+    @property
+    def region_names(self) -> Tuple[str, ...]:
+        """
+        Names of the regions, in region axis order.
+        """
+        return tuple(spec.name for spec in self.specs)
+
+    def _evaluate(
+        self,
+        propellants: PropellantSet,
+        pressures: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the component mass fractions, shape (N, C), and the per-term factors,
+        shape (N, 1 or P, R, C).
+        """
+        n, p = len(propellants), len(pressures)
+
+        mass_fractions = np.zeros((n, len(self.component_names)))
+        for name in self.required_components:
+            values = propellants.mass_fraction(name)
+            # Missing components are NaN and fail the positive check as well
+            if not np.all((values > 0) & (values <= 1)):
+                raise ValueError(f"Missing, invalid or zero mass fraction for component '{name}'")
+            mass_fractions[:, self._component_indices[name]] = values
+
+        # Pressure-invariant fractions broadcast over P
+        factors = self.coefficients[None, None]
+        for fraction, matrix in self.fraction_coefficients.items():
+            values = np.zeros((n, p if FRACTIONS[fraction] else 1, len(self.component_names)))
+            for c in np.flatnonzero(matrix.any(axis=0)):
+                values[:, :, c] = set_fraction(propellants, self.component_names[c], fraction, pressures)
+            factors = factors - values[:, :, None, :] * matrix
+
+        return mass_fractions, factors
+
+    def _region_totals(self, masses: np.ndarray) -> np.ndarray:
+        """
+        Return the masses of the normalized regions, and 1 for the others, shape (N, P, R, 1).
+        """
+        totals = masses.sum(axis=-1, keepdims=True)
+        totals[:, :, ~self._normalized] = 1.0
+        for r in np.flatnonzero(np.any(totals[..., 0] <= 0, axis=(0, 1))):
+            raise ValueError(f"{self.specs[r].label} mass must be greater than zero.")
+        return totals
+
+    def map(self, propellants: PropellantSet, pressures: Sequence[float]) -> np.ndarray:
+        """
+        Calculate the mass fractions of every region for N propellants and P pressures.
+
+        Args:
+            propellants (PropellantSet): Columnar propellant properties.
+            pressures (Sequence[float]): Pressures in Pascals, shape (P,).
+
+        Returns:
+            np.ndarray: Region mass fractions, shape (N, P, R, C).
+
+        Raises:
+            ValueError: If any required mass fraction or region mass is invalid.
+        """
+        pressures = np.asarray(pressures, dtype=float)
+        shape = (len(propellants), len(pressures), len(self.specs), len(self.component_names))
+
+        mass_fractions, factors = self._evaluate(propellants, pressures)
+        masses = np.broadcast_to(mass_fractions[:, None, None, :] * factors, shape)
+        return masses / self._region_totals(masses)
+
+    def map_with_jacobian(
+        self,
+        propellants: PropellantSet,
+        pressures: Sequence[float]
+    ) -> Tuple[np.ndarray, np.ndarray, Tuple[str, ...]]:
+        """
+        Calculate the mass fractions of every region and their exact derivatives with respect
+        to the input parameters of the propellants.
+
+        The parameters are the mass fractions of the required components, followed by the
+        parameters of every excluded fraction in use, e.g. "AmmoniumPerchlorate.large_particles_fraction"
+        and "Aluminum.agglomeration_coefficients[k]".
+
+        Args:
+            propellants (PropellantSet): Columnar propellant properties.
+            pressures (Sequence[float]): Pressures in Pascals, shape (P,).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, Tuple[str, ...]]: Region mass fractions, shape (N, P, R, C),
+                their derivatives, shape (N, P, R, C, Q), and the names of the Q parameters.
+
+        Raises:
+            ValueError: If any required mass fraction or region mass is invalid.
+        """
+        pressures = np.asarray(pressures, dtype=float)
+        n, p = len(propellants), len(pressures)
+        shape = (n, p, len(self.specs), len(self.component_names))
+
+        mass_fractions, factors = self._evaluate(propellants, pressures)
+        masses = np.broadcast_to(mass_fractions[:, None, None, :] * factors, shape)
+
+        # Derivatives of the term masses: d(x_c * g_rc)/dx_c = g_rc and d(x_c * g_rc)/dF_c = -x_c * B_rc
+        blocks = []
+        parameters = []
+        for name in self.required_components:
+            c = self._component_indices[name]
+            block = np.zeros(shape + (1,))
+            block[:, :, :, c, 0] = factors[:, :, :, c]
+            blocks.append(block)
+            parameters.append(f"{name}.mass_fraction")
+        for fraction, matrix in self.fraction_coefficients.items():
+            for c in np.flatnonzero(matrix.any(axis=0)):
+                names, derivatives = set_fraction_derivatives(
+                    propellants, self.component_names[c], fraction, pressures)
+                block = np.zeros(shape + (len(names),))
+                block[:, :, :, c, :] = (
+                    -mass_fractions[:, c, None, None, None] * matrix[None, None, :, c, None]
+                    * derivatives[:, :, None, :])
+                blocks.append(block)
+                parameters.extend(names)
+        mass_derivatives = np.concatenate(blocks, axis=-1)
+
+        # Quotient rule for the normalized regions: dw = (dm - w * dS) / S
+        totals = self._region_totals(masses)
+        region_mass_fractions = masses / totals
+        total_derivatives = mass_derivatives.sum(axis=3, keepdims=True)
+        total_derivatives[:, :, ~self._normalized] = 0.0
+        derivatives = (mass_derivatives - region_mass_fractions[..., None] * total_derivatives) / totals[..., None]
+
+        return region_mass_fractions, derivatives, tuple(parameters)
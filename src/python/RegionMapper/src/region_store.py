@@ -0,0 +1,244 @@
+"""
+This module contains the binary region result store, an alternative to the per-region JSON
+files written by `JSONWriter`.
+
+A store consists of two files in the output directory:
+    - region_store.npy: a structured NumPy array with one record per propellant and pressure,
+      holding the propellant index, the pressure and, for every region, the enthalpy and the
+      composition vector in a fixed element order;
+    - region_store.json: a small header with the propellant names, the pressures, the element
+      order, the regions and the elements reported for every region.
+
+Consumers map the records without parsing them:
+    header = json.load(open("region_store.json"))
+    records = np.load("region_store.npy", mmap_mode="r")
+    enthalpies = records["diffusion"]["enthalpy"]
+
+The records are appended chunk by chunk while the `.npy` header reserves room for the final
+record count, so stores of any size are written with bounded memory.
+
+Classes:
+    - RegionStoreWriter: Appends region result sets to a store.
+    - RegionStore: Memory-mapped read access to a store.
+"""
+
+import json
+import os
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from calculators import RegionCalculationResult, RegionResultSet
+from region_engine import REGIONS
+
+STORE_DATA_FILE_NAME = "region_store.npy"
+STORE_HEADER_FILE_NAME = "region_store.json"
+
+# Bump when the record layout changes
+STORE_FORMAT_VERSION = 1
+
+# Record count used to size the reserved .npy header, larger than any real store
+_MAX_RECORD_COUNT = 10 ** 18
+
+def record_dtype(element_count: int) -> np.dtype:
+    """
+    Return the record type of a store with the given number of elements.
+
+    Args:
+        element_count (int): Number of elements E of the composition vectors.
+
+    Returns:
+        np.dtype: Structured type with the fields "propellant", "pressure" and one
+            ("enthalpy", "composition" of shape (E,)) field per region.
+    """
+    region_dtype = np.dtype([("enthalpy", "<f8"), ("composition", "<f8", (element_count,))])
+    return np.dtype([("propellant", "<i8"), ("pressure", "<f8")] + [(region, region_dtype) for region in REGIONS])
+
+def _npy_header(dtype: np.dtype, count: int, length: int = 0) -> bytes:
+    """
+    Build a version 1.0 `.npy` header for a one-dimensional array, padded to at least `length` bytes.
+    """
+    header = repr({
+        "descr": np.lib.format.dtype_to_descr(dtype),
+        "fortran_order": False,
+        "shape": (count,)
+    })
+    prefix = len(np.lib.format.magic(1, 0)) + 2
+    # The data must start at a multiple of 64 bytes, and the header ends with a newline
+    total = max(length, prefix + len(header) + 1)
+    total += -total % 64
+    header = header + " " * (total - prefix - len(header) - 1) + "\n"
+    return np.lib.format.magic(1, 0) + len(header).to_bytes(2, "little") + header.encode("latin1")
+
+class RegionStoreWriter:
+    """
+    Appends region result sets to a binary store. Use as a context manager; the store is
+    moved into place atomically when the writer is closed without an error.
+
+    Attributes:
+        output_dir (str): The directory of the store.
+        elements (Tuple[str, ...]): Element order of the composition vectors.
+        region_elements (Dict[str, Tuple[str, ...]]): Elements reported for every region.
+        count (int): Number of records written so far.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        elements: Sequence[str],
+        region_elements: Dict[str, Tuple[str, ...]],
+        pressures: Sequence[float]
+    ):
+        """
+        Create the store files.
+
+        Args:
+            output_dir (str): The directory of the store.
+            elements (Sequence[str]): Element order of the composition vectors.
+            region_elements (Dict[str, Tuple[str, ...]]): Elements reported for every region.
+            pressures (Sequence[float]): Pressures in Pascals of every propellant.
+        """
+        self.output_dir = output_dir
+        self.elements = tuple(elements)
+        self.region_elements = {region: tuple(region_elements[region]) for region in REGIONS}
+        self.pressures = [float(pressure) for pressure in pressures]
+        self.count = 0
+        self._names: List[str] = []
+        self._dtype = record_dtype(len(self.elements))
+
+        self._data_path = os.path.join(output_dir, STORE_DATA_FILE_NAME)
+        self._temp_path = f"{self._data_path}.{os.getpid()}.tmp"
+        self._header_length = len(_npy_header(self._dtype, _MAX_RECORD_COUNT))
+        self._file = open(self._temp_path, "wb")
+        self._file.write(_npy_header(self._dtype, 0, self._header_length))
+
+    def append(self, results: RegionResultSet) -> None:
+        """
+        Append the records of a result set, propellant-major.
+
+        Args:
+            results (RegionResultSet): Results of the next propellants at the store pressures.
+
+        Raises:
+            ValueError: If the elements or the pressures of the results do not match the store.
+        """
+        if results.elements != self.elements:
+            raise ValueError(f"Expected elements {self.elements}, but got {results.elements}")
+        if results.pressures.tolist() != self.pressures:
+            raise ValueError("The pressures of the results do not match the store.")
+
+        n, p = len(results.names), len(self.pressures)
+        records = np.empty((n, p), dtype=self._dtype)
+        records["propellant"] = np.arange(len(self._names), len(self._names) + n)[:, None]
+        records["pressure"] = results.pressures[None, :]
+        for r, region in enumerate(REGIONS):
+            records[region]["enthalpy"] = results.enthalpies[:, :, r]
+            records[region]["composition"] = results.compositions[:, :, r, :]
+
+        records.tofile(self._file)
+        self._names.extend(results.names)
+        self.count += records.size
+
+    def close(self) -> None:
+        """
+        Finalize the `.npy` header, move the data into place and write the JSON header.
+        """
+        self._file.seek(0)
+        self._file.write(_npy_header(self._dtype, self.count, self._header_length))
+        self._file.close()
+        os.replace(self._temp_path, self._data_path)
+
+        header = {
+            "format_version": STORE_FORMAT_VERSION,
+            "data_file": STORE_DATA_FILE_NAME,
+            "count": self.count,
+            "propellants": self._names,
+            "pressures": self.pressures,
+            "elements": list(self.elements),
+            "regions": list(REGIONS),
+            "region_elements": {region: list(elements) for region, elements in self.region_elements.items()}
+        }
+        header_path = os.path.join(self.output_dir, STORE_HEADER_FILE_NAME)
+        temp_path = f"{header_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(header, file, indent=4)
+        os.replace(temp_path, header_path)
+
+    def abort(self) -> None:
+        """
+        Discard the partially written store.
+        """
+        self._file.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+    def __enter__(self) -> "RegionStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+class RegionStore:
+    """
+    Memory-mapped read access to a binary store.
+
+    Attributes:
+        header (dict): The parsed JSON header.
+        records (np.ndarray): The memory-mapped records, shape (len(propellants) * len(pressures),).
+    """
+
+    def __init__(self, output_dir: str):
+        """
+        Open the store of an output directory.
+
+        Args:
+            output_dir (str): The directory of the store.
+
+        Raises:
+            ValueError: If the store has an unsupported format version.
+        """
+        with open(os.path.join(output_dir, STORE_HEADER_FILE_NAME), "r", encoding="utf-8") as file:
+            self.header = json.load(file)
+        if self.header.get("format_version") != STORE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported region store format version {self.header.get('format_version')}")
+        self.records = np.load(os.path.join(output_dir, self.header["data_file"]), mmap_mode="r")
+        self._propellant_indices = {name: i for i, name in enumerate(self.header["propellants"])}
+
+    def record_index(self, propellant_name: str, pressure: float) -> int:
+        """
+        Return the index of the record of a propellant at a pressure.
+
+        Raises:
+            KeyError: If the propellant or the pressure is not in the store.
+        """
+        pressures = self.header["pressures"]
+        if pressure not in pressures:
+            raise KeyError(f"Pressure {pressure} is not in the region store")
+        return self._propellant_indices[propellant_name] * len(pressures) + pressures.index(pressure)
+
+    def result(self, propellant_name: str, pressure: float, region: str) -> RegionCalculationResult:
+        """
+        Return the result of a region, equal to the content of the corresponding JSON file.
+
+        Args:
+            propellant_name (str): Name of the propellant.
+            pressure (float): Pressure in Pascals.
+            region (str): Name of the region, one of `REGIONS`.
+
+        Returns:
+            RegionCalculationResult: The result of the region.
+        """
+        record = self.records[self.record_index(propellant_name, pressure)][region]
+        elements = self.header["elements"]
+        return RegionCalculationResult(
+            pressure=float(pressure),
+            enthalpy=float(record["enthalpy"]),
+            composition={
+                element: float(record["composition"][elements.index(element)])
+                for element in self.header["region_elements"][region]
+            }
+        )
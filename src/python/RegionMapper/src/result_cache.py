@@ -0,0 +1,172 @@
+"""
+This module contains the content-addressed result cache of the region mapper.
+
+Each (propellant, pressure) output directory is recorded in a manifest file at the root
+of the output directory together with a digest of everything its results depend on:
+the parsed propellant record, the component table and the pressure. The entry also lists
+the result files written with that digest, since the optional outputs (derivatives, porosity)
+depend on the command-line flags rather than on the inputs. When the digest of the current
+inputs matches the manifest, every file the run needs was written with that digest and all
+of them exist, the results are up to date and the calculation can be skipped. A file left
+over from a run with an older digest is never reported as up to date.
+
+Classes:
+    - ResultCache: Manifest-backed lookup and bookkeeping of up-to-date results.
+"""
+
+import hashlib
+import json
+import os
+
+from dataclasses import asdict
+from typing import Dict, Sequence
+
+from models import ComponentTable, Propellant
+
+# Bump when the calculation or the manifest layout changes in a way that invalidates existing results
+CACHE_VERSION = 2
+
+class ResultCache:
+    """
+    Manifest-backed cache of region results keyed by a digest of their inputs.
+
+    Attributes:
+        manifest_path (str): Path to the manifest file.
+        enabled (bool): Whether lookups may report up-to-date results. Results are recorded
+            in the manifest even when lookups are disabled, so the manifest never goes stale.
+        hits (int): Number of lookups that found up-to-date results.
+        misses (int): Number of lookups that required a calculation.
+    """
+    MANIFEST_FILE_NAME = ".region_cache.json"
+
+    def __init__(self, output_dir: str, file_names: Sequence[str], enabled: bool = True):
+        """
+        Load the manifest of an output directory.
+
+        Args:
+            output_dir (str): The root output directory holding the manifest.
+            file_names (Sequence[str]): Names of the result files the run expects in, and
+                writes to, every propellant output directory.
+            enabled (bool): Whether lookups may report up-to-date results.
+        """
+        self.manifest_path = os.path.join(output_dir, self.MANIFEST_FILE_NAME)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._output_dir = output_dir
+        self._file_names = tuple(file_names)
+        self._entries = self._load_entries()
+
+    def _load_entries(self) -> Dict[str, dict]:
+        """
+        Read the manifest entries {"key": ..., "files": [...]}, treating a missing or
+        unreadable manifest as empty.
+        """
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get("version") != CACHE_VERSION:
+            return {}
+        entries = manifest.get("entries", {})
+        if not isinstance(entries, dict):
+            return {}
+        return {
+            name: entry for name, entry in entries.items()
+            if isinstance(entry, dict) and isinstance(entry.get("files"), list)
+        }
+
+    @staticmethod
+    def components_digest(components: ComponentTable) -> str:
+        """
+        Compute the digest of a component table.
+
+        Args:
+            components (ComponentTable): The component table.
+
+        Returns:
+            str: Hex digest of the table contents.
+        """
+        payload = json.dumps([asdict(component) for component in components.values()], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def key(propellant: Propellant, components_digest: str, pressure: float) -> str:
+        """
+        Compute the cache key of the results of a propellant at a pressure.
+
+        Args:
+            propellant (Propellant): The propellant.
+            components_digest (str): Digest of the component table, see `components_digest`.
+            pressure (float): Pressure in Pascals.
+
+        Returns:
+            str: Hex digest identifying the inputs of the results.
+        """
+        payload = json.dumps({
+            "version": CACHE_VERSION,
+            "propellant": asdict(propellant),
+            "components": components_digest,
+            "pressure": pressure
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_name(self, propellant_output_dir: str) -> str:
+        return os.path.relpath(propellant_output_dir, self._output_dir).replace(os.sep, "/")
+
+    def is_up_to_date(self, propellant_output_dir: str, key: str) -> bool:
+        """
+        Check whether the results in a propellant output directory match the key,
+        updating the hit and miss counters.
+
+        Args:
+            propellant_output_dir (str): The directory holding the result files.
+            key (str): The cache key of the current inputs.
+
+        Returns:
+            bool: True if the calculation can be skipped.
+        """
+        entry = self._entries.get(self._entry_name(propellant_output_dir))
+        up_to_date = (
+            self.enabled
+            and entry is not None
+            and entry.get("key") == key
+            and set(self._file_names).issubset(entry["files"])
+            and all(os.path.isfile(os.path.join(propellant_output_dir, name)) for name in self._file_names)
+        )
+        if up_to_date:
+            self.hits += 1
+        else:
+            # The results are about to be rewritten, so they must not match any key until recorded
+            self._entries.pop(self._entry_name(propellant_output_dir), None)
+            self.misses += 1
+        return up_to_date
+
+    def record(self, propellant_output_dir: str, key: str) -> None:
+        """
+        Record that the result files of the run in a propellant output directory match the key.
+        Files written by earlier runs with other flags are not recorded, as they may be stale.
+
+        Args:
+            propellant_output_dir (str): The directory holding the result files.
+            key (str): The cache key of the inputs the results were calculated from.
+        """
+        self._entries[self._entry_name(propellant_output_dir)] = {"key": key, "files": sorted(self._file_names)}
+
+    def save(self) -> None:
+        """
+        Write the manifest atomically.
+        """
+        temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"version": CACHE_VERSION, "entries": self._entries}, file, indent=4, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+
+    def format_stats(self) -> str:
+        """
+        Format the hit and miss counters for the console.
+        """
+        total = self.hits + self.misses
+        hit_rate = 100.0 * self.hits / total if total else 0.0
+        return f"Cache: {self.hits} hits, {self.misses} misses ({hit_rate:.1f}% hit rate)."
@@ -0,0 +1,362 @@
+"""
+This module contains the formulation design-space sweep of the region mapper.
+
+Candidate formulations are generated from ranges of the CombustibleBinder, AmmoniumPerchlorate,
+Aluminum and Octogen mass fractions, constrained to the simplex where they sum to one, and a
+range of the AmmoniumPerchlorate large particles (coarse) fraction. The points come from either
+    - grid: every combination of the binder, AP and Al fractions on a regular step, with the
+      Octogen fraction closing the sum, crossed with evenly spaced coarse fractions;
+    - lhs: a Latin hypercube sample of the binder, AP, Al and coarse fractions, with the
+      Octogen fraction closing the sum.
+Points whose Octogen fraction falls outside its range are dropped.
+
+The points are generated lazily in chunks, every chunk is evaluated for all regions and
+pressures as one batched array computation, and its rows are appended to a single CSV file,
+so the memory use is bounded by the chunk size regardless of the number of points. The
+remaining properties, such as the Aluminum agglomeration coefficients and the densities,
+are taken from a base propellant.
+
+Functions:
+    - grid_points: Lazily generates the simplex-constrained grid.
+    - latin_hypercube_points: Lazily generates the Latin hypercube sample.
+    - build_propellant_set: Builds the propellant set of a chunk of points.
+    - evaluate_points: Evaluates a chunk of points into output rows.
+
+Usage:
+    python3 sweep.py --propellants propellants.json --components ../data/components.json \
+        --pressures 1e6:6.5e6:10 --binder 0.15:0.3 --ap 0.25:0.5 --al 0.1:0.25 --hmx 0.05:0.4 \
+        --coarse 0.4:0.8 --mode grid --step 0.01 --output sweep.csv
+"""
+
+import argparse
+import itertools
+import sys
+
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from cli_utils import parse_pressures
+from json_reader import read_components, read_propellant_set
+from models import ComponentTable
+from propellant_set import PropellantSet
+from region_engine import REGION_COMPONENTS, REGIONS, RegionEngine
+
+# Swept components in the order of the point columns, followed by the coarse fraction
+SWEPT_COMPONENTS = ("CombustibleBinder", "AmmoniumPerchlorate", "Aluminum", "Octogen")
+COARSE_COMPONENT = "AmmoniumPerchlorate"
+
+# Tolerance of the simplex constraint and of the range bounds
+TOLERANCE = 1e-9
+
+DEFAULT_CHUNK_SIZE = 1 << 15
+
+Range = Tuple[float, float]
+
+def parse_range(value: str) -> Range:
+    """
+    Parse a fraction range "min:max" or a single fraction.
+
+    Args:
+        value (str): The range.
+
+    Returns:
+        Range: The lower and upper bounds.
+
+    Raises:
+        ValueError: If the range is malformed or not within (0, 1].
+    """
+    parts = value.split(":")
+    if len(parts) not in (1, 2):
+        raise ValueError(f"Invalid range '{value}', expected 'min:max'.")
+    lower, upper = float(parts[0]), float(parts[-1])
+    if not 0 <= lower <= upper <= 1:
+        raise ValueError(f"Invalid range '{value}', expected 0 <= min <= max <= 1.")
+    return lower, upper
+
+def _close_simplex(fractions: np.ndarray, hmx_range: Range) -> np.ndarray:
+    """
+    Append the Octogen fraction closing the sum to one and drop points outside its range.
+
+    Args:
+        fractions (np.ndarray): Binder, AP, Al and coarse fractions, shape (N, 4).
+        hmx_range (Range): The Octogen fraction range.
+
+    Returns:
+        np.ndarray: Points with binder, AP, Al, HMX and coarse fractions, shape (M, 5).
+    """
+    hmx = 1.0 - fractions[:, :3].sum(axis=1)
+    keep = (hmx >= hmx_range[0] - TOLERANCE) & (hmx <= hmx_range[1] + TOLERANCE) & (hmx > TOLERANCE)
+    return np.column_stack((fractions[keep, :3], hmx[keep], fractions[keep, 3]))
+
+def _grid_values(bounds: Range, step: float) -> np.ndarray:
+    """
+    Return the values of a range on a regular step, bounds included when they lie on the step.
+    """
+    count = int(np.floor((bounds[1] - bounds[0]) / step + TOLERANCE)) + 1
+    return bounds[0] + step * np.arange(count)
+
+def grid_points(
+    binder: Range,
+    ap: Range,
+    al: Range,
+    hmx: Range,
+    coarse: Range,
+    step: float,
+    coarse_steps: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[np.ndarray]:
+    """
+    Lazily generate the simplex-constrained grid of formulations.
+
+    Args:
+        binder (Range): CombustibleBinder mass fraction range.
+        ap (Range): AmmoniumPerchlorate mass fraction range.
+        al (Range): Aluminum mass fraction range.
+        hmx (Range): Octogen mass fraction range.
+        coarse (Range): AmmoniumPerchlorate large particles fraction range.
+        step (float): Grid step of the mass fractions.
+        coarse_steps (int): Number of evenly spaced coarse fractions.
+        chunk_size (int): Maximum number of points per chunk.
+
+    Yields:
+        np.ndarray: Points with binder, AP, Al, HMX and coarse fractions, shape (M, 5), M <= chunk_size.
+    """
+    al_values = _grid_values(al, step)
+    coarse_values = np.linspace(coarse[0], coarse[1], coarse_steps)
+
+    pending: List[np.ndarray] = []
+    pending_count = 0
+    for binder_value, ap_value in itertools.product(_grid_values(binder, step), _grid_values(ap, step)):
+        # Every Al fraction crossed with every coarse fraction, vectorized
+        al_grid, coarse_grid = np.meshgrid(al_values, coarse_values, indexing="ij")
+        fractions = np.column_stack((
+            np.full(al_grid.size, binder_value),
+            np.full(al_grid.size, ap_value),
+            al_grid.ravel(),
+            coarse_grid.ravel()
+        ))
+        points = _close_simplex(fractions, hmx)
+        if len(points) == 0:
+            continue
+
+        pending.append(points)
+        pending_count += len(points)
+        while pending_count >= chunk_size:
+            merged = np.concatenate(pending)
+            yield merged[:chunk_size]
+            pending = [merged[chunk_size:]]
+            pending_count = len(pending[0])
+
+    if pending_count:
+        yield np.concatenate(pending)
+
+def latin_hypercube_points(
+    binder: Range,
+    ap: Range,
+    al: Range,
+    hmx: Range,
+    coarse: Range,
+    samples: int,
+    rng: np.random.Generator,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[np.ndarray]:
+    """
+    Lazily generate a Latin hypercube sample of formulations.
+
+    The binder, AP, Al and coarse fractions are stratified into `samples` intervals each; only
+    the stratum permutations are held in memory, the points are drawn chunk by chunk.
+
+    Args:
+        binder (Range): CombustibleBinder mass fraction range.
+        ap (Range): AmmoniumPerchlorate mass fraction range.
+        al (Range): Aluminum mass fraction range.
+        hmx (Range): Octogen mass fraction range.
+        coarse (Range): AmmoniumPerchlorate large particles fraction range.
+        samples (int): Number of sampled points before the Octogen range is applied.
+        rng (np.random.Generator): The random generator.
+        chunk_size (int): Maximum number of points per chunk.
+
+    Yields:
+        np.ndarray: Points with binder, AP, Al, HMX and coarse fractions, shape (M, 5), M <= chunk_size.
+    """
+    bounds = np.array([binder, ap, al, coarse])
+    strata = np.stack([rng.permutation(samples) for _ in range(len(bounds))], axis=1)
+
+    for start in range(0, samples, chunk_size):
+        stop = min(start + chunk_size, samples)
+        unit = (strata[start:stop] + rng.random((stop - start, len(bounds)))) / samples
+        points = _close_simplex(bounds[:, 0] + unit * (bounds[:, 1] - bounds[:, 0]), hmx)
+        if len(points):
+            yield points
+
+def build_propellant_set(points: np.ndarray, base: PropellantSet, base_index: int, first_index: int) -> PropellantSet:
+    """
+    Build the propellant set of a chunk of points, taking the remaining properties from a base propellant.
+
+    Args:
+        points (np.ndarray): Binder, AP, Al, HMX and coarse fractions, shape (N, 5).
+        base (PropellantSet): The set holding the base propellant.
+        base_index (int): Index of the base propellant.
+        first_index (int): Global index of the first point, used for the names.
+
+    Returns:
+        PropellantSet: The formulations of the points.
+    """
+    n, width = len(points), len(base.component_names)
+
+    mass_fractions = np.full((n, width), np.nan)
+    for j, name in enumerate(SWEPT_COMPONENTS):
+        mass_fractions[:, base.column(name)] = points[:, j]
+    large_particles_fractions = np.full((n, width), np.nan)
+    large_particles_fractions[:, base.column(COARSE_COMPONENT)] = points[:, 4]
+
+    return PropellantSet(
+        names=[f"point_{first_index + i}" for i in range(n)],
+        component_names=base.component_names,
+        mass_fractions=mass_fractions,
+        densities=np.broadcast_to(base.densities[base_index], (n, width)),
+        large_particles_fractions=large_particles_fractions,
+        agglomeration_coefficients=np.broadcast_to(
+            base.agglomeration_coefficients[base_index], (n,) + base.agglomeration_coefficients.shape[1:]),
+        coefficient_counts=np.broadcast_to(base.coefficient_counts[base_index], (n, width))
+    )
+
+def output_columns(engine: RegionEngine) -> List[str]:
+    """
+    Return the header of the output rows.
+    """
+    columns = ["index", *SWEPT_COMPONENTS, "large_particles_fraction", "pressure"]
+    for region in REGIONS:
+        columns.append(f"{region}.enthalpy")
+        columns.extend(f"{region}.{element}" for element in engine.region_elements(REGION_COMPONENTS[region]))
+    return columns
+
+def evaluate_points(
+    points: np.ndarray,
+    propellants: PropellantSet,
+    engine: RegionEngine,
+    pressures: np.ndarray,
+    first_index: int
+) -> np.ndarray:
+    """
+    Evaluate the regions of a chunk of points for all pressures.
+
+    Args:
+        points (np.ndarray): Binder, AP, Al, HMX and coarse fractions, shape (N, 5).
+        propellants (PropellantSet): The formulations of the points, see `build_propellant_set`.
+        engine (RegionEngine): The compiled engine.
+        pressures (np.ndarray): Pressures in Pascals, shape (P,).
+        first_index (int): Global index of the first point.
+
+    Returns:
+        np.ndarray: Output rows in the order of `output_columns`, shape (N * P, columns).
+    """
+    n, p = len(points), len(pressures)
+    compositions, enthalpies = engine.calculate_regions(propellants, pressures)
+
+    blocks = [
+        np.repeat(np.arange(first_index, first_index + n), p)[:, None],
+        np.repeat(points, p, axis=0),
+        np.tile(pressures, n)[:, None]
+    ]
+    for r, region in enumerate(REGIONS):
+        columns = [engine.elements.index(element) for element in engine.region_elements(REGION_COMPONENTS[region])]
+        blocks.append(enthalpies[:, :, r].reshape(n * p, 1))
+        blocks.append(compositions[:, :, r, columns].reshape(n * p, len(columns)))
+    return np.hstack(blocks)
+
+def parse_args():
+    """
+    Parse command-line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Sweep the formulation design space and evaluate the regions.")
+    parser.add_argument("--propellants", required=True, help="Path to the propellant JSON file holding the base propellant.")
+    parser.add_argument("--components", required=True, help="Path to the components JSON file.")
+    parser.add_argument(
+        "--base-propellant",
+        help="Name of the propellant providing the agglomeration coefficients and densities (default: the first one)."
+    )
+    parser.add_argument(
+        "--pressures",
+        nargs="+",
+        required=True,
+        help="Pressures in Pascals, single values or ranges 'start:stop:count' (e.g., 1e6:6.5e6:10)."
+    )
+    parser.add_argument("--binder", default="0.1:0.3", help="CombustibleBinder mass fraction range 'min:max'.")
+    parser.add_argument("--ap", default="0.2:0.6", help="AmmoniumPerchlorate mass fraction range 'min:max'.")
+    parser.add_argument("--al", default="0.05:0.25", help="Aluminum mass fraction range 'min:max'.")
+    parser.add_argument("--hmx", default="0.05:0.4", help="Octogen mass fraction range 'min:max'.")
+    parser.add_argument("--coarse", default="0.4:0.8", help="AmmoniumPerchlorate large particles fraction range 'min:max'.")
+    parser.add_argument("--mode", choices=("grid", "lhs"), default="grid", help="Point generation mode (default: grid).")
+    parser.add_argument("--step", type=float, default=0.01, help="Mass fraction step of the grid (default: 0.01).")
+    parser.add_argument("--coarse-steps", type=int, default=5, help="Number of coarse fractions of the grid (default: 5).")
+    parser.add_argument("--samples", type=int, default=100000, help="Number of Latin hypercube samples (default: 100000).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the Latin hypercube sample (default: 0).")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Number of points evaluated at once (default: {DEFAULT_CHUNK_SIZE})."
+    )
+    parser.add_argument("--output", required=True, help="Path to the output CSV file.")
+
+    args = parser.parse_args()
+    try:
+        args.pressures = parse_pressures(args.pressures)
+        for name in ("binder", "ap", "al", "hmx", "coarse"):
+            setattr(args, name, parse_range(getattr(args, name)))
+    except ValueError as e:
+        parser.error(str(e))
+    if any(pressure <= 0 for pressure in args.pressures):
+        parser.error("Pressures must be positive values.")
+    if min(args.binder[0], args.ap[0], args.al[0]) <= 0:
+        parser.error("The binder, AP and Al ranges must exclude zero, as every component is required.")
+    if args.step <= 0 or args.coarse_steps < 1 or args.samples < 1 or args.chunk_size < 1:
+        parser.error("Step, coarse steps, samples and chunk size must be positive values.")
+    return args
+
+
+def main():
+    """
+    Main function to sweep the design space and stream the results.
+    """
+    try:
+        args = parse_args()
+
+        components: ComponentTable = read_components(args.components)
+        base = read_propellant_set(args.propellants, tuple(components))
+        if len(base) == 0:
+            raise ValueError("The propellants file holds no base propellant.")
+        base_index = 0 if args.base_propellant is None else base.names.index(args.base_propellant)
+        engine = RegionEngine.for_components(components)
+        pressures = np.asarray(args.pressures, dtype=float)
+
+        ranges = (args.binder, args.ap, args.al, args.hmx, args.coarse)
+        if args.mode == "grid":
+            chunks = grid_points(*ranges, args.step, args.coarse_steps, args.chunk_size)
+        else:
+            chunks = latin_hypercube_points(
+                *ranges, args.samples, np.random.default_rng(args.seed), args.chunk_size)
+
+        point_count = 0
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(",".join(output_columns(engine)) + "\n")
+            for points in chunks:
+                propellants = build_propellant_set(points, base, base_index, point_count)
+                rows = evaluate_points(points, propellants, engine, pressures, point_count)
+                np.savetxt(file, rows, fmt=["%d"] + ["%.12g"] * (rows.shape[1] - 1), delimiter=",")
+                point_count += len(points)
+
+        print(f"Results of {point_count} formulations at {len(pressures)} pressures successfully written to {args.output}")
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
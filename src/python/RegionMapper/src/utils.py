@@ -1,7 +1,7 @@
 from typing import Dict
 
 from molar_masses import ELEMENT_MOLAR_MASSES
-from models import Component
+from models import ComponentTable
 
 def compute_molar_mass(elements: Dict[str, float]) -> float:
     """
@@ -26,7 +26,7 @@ def compute_molar_mass(elements: Dict[str, float]) -> float:
 
 def calculate_elemental_composition(
     region_data: Dict[str, float], 
-    component_data: Dict[str, Component]
+    component_data: ComponentTable
 ) -> Dict[str, float]:
     """
     Calculate the overall elemental composition of a region based on mass fractions and component compositions.
@@ -34,8 +34,7 @@ def calculate_elemental_composition(
     Args:
         region_data (Dict[str, float]): A dictionary where keys are component names (e.g., "CombustibleBinder") 
             and values are their mass fractions in the region.
-        component_data (Dict[str, Component]): A dictionary where keys are component names and values are 
-            `Component` objects containing elemental composition and other properties.
+        component_data (ComponentTable): The component table with precompiled elemental compositions.
 
     Returns:
         Dict[str, float]: A dictionary where keys are element symbols (e.g., "H", "C") and values are their 
@@ -43,10 +42,9 @@ def calculate_elemental_composition(
     """
     total_elemental_composition = {}
     for component_name, mass_fraction in region_data.items():
-        component = component_data[component_name]
-        molar_mass = compute_molar_mass(component.composition)
-        for element, count in component.composition.items():
-            relative_content = (count / molar_mass) * mass_fraction
+        specific_composition = component_data.specific_composition(component_name)
+        for element, content in specific_composition.items():
+            relative_content = content * mass_fraction
             total_elemental_composition[element] = total_elemental_composition.get(element, 0.0) + relative_content
     return total_elemental_composition
 
@@ -66,7 +64,7 @@ def normalize_elemental_composition(elements: Dict[str, float], propellant_molar
 
 def calculate_enthalpy(
     region_data: Dict[str, float], 
-    component_data: Dict[str, Component]
+    component_data: ComponentTable
 ) -> float:
     """
     Calculate the overall enthalpy based on mass fractions and component enthalpies.
@@ -74,8 +72,7 @@ def calculate_enthalpy(
     Args:
         region_data (Dict[str, float]): A dictionary where keys are component names (e.g., "CombustibleBinder") 
             and values are their mass fractions in the region.
-        component_data (Dict[str, Component]): A dictionary where keys are component names and values are 
-            `Component` objects containing enthalpy and other properties.
+        component_data (ComponentTable): The component table containing enthalpies and other properties.
 
     Returns:
         float: The overall enthalpy of the region in joule per kg.
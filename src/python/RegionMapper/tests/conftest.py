@@ -0,0 +1,26 @@
+"""
+Shared fixtures of the region mapper tests.
+
+The tool is run from its `src` directory with flat imports, so the tests put that directory
+on the import path the same way.
+"""
+
+import os
+import sys
+
+import pytest
+
+SOURCE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SOURCE_DIRECTORY)
+
+from json_reader import read_components, read_propellants  # noqa: E402
+
+DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+@pytest.fixture(scope="session")
+def components():
+    return read_components(os.path.join(DATA_DIRECTORY, "components.json"))
+
+@pytest.fixture(scope="session")
+def propellants():
+    return read_propellants(os.path.join(DATA_DIRECTORY, "propellants.json"))
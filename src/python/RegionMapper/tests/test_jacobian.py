@@ -0,0 +1,60 @@
+import json
+import os
+import re
+
+import numpy as np
+import pytest
+
+from calculators import RegionCalculator
+from conftest import DATA_DIRECTORY
+from polynomials import PRESSURE_SCALE
+from propellant_set import PropellantSet
+
+PRESSURES = [1e6, 3e6, 7.5e6]
+
+_PARAMETER_PATTERN = re.compile(r"^(\w+)\.(\w+)(?:\[(\d+)\])?$")
+
+@pytest.fixture(scope="module")
+def records():
+    with open(os.path.join(DATA_DIRECTORY, "propellants.json"), "r", encoding="utf-8") as file:
+        return json.load(file)
+
+def test_jacobian_matches_finite_differences(components, records):
+    def calculate(perturbed_records):
+        results = RegionCalculator.calculate_set(
+            PropellantSet.from_records(perturbed_records, tuple(components)), components, PRESSURES)
+        return results.compositions, results.enthalpies
+
+    results = RegionCalculator.calculate_set(
+        PropellantSet.from_records(records, tuple(components)), components, PRESSURES, jacobian=True)
+    assert results.parameters
+
+    for q, parameter in enumerate(results.parameters):
+        # Central differences, exact up to the second order of the step; the steps of the
+        # polynomial coefficients are scaled so that every step moves the fractions alike
+        _, _, power = _PARAMETER_PATTERN.match(parameter).groups()
+        step = 1e-6 / (max(PRESSURES) / PRESSURE_SCALE) ** int(power or 0)
+        upper = calculate(perturb(records, parameter, step))
+        lower = calculate(perturb(records, parameter, -step))
+        for derivatives, (upper_values, lower_values) in (
+            (results.composition_derivatives, (upper[0], lower[0])),
+            (results.enthalpy_derivatives, (upper[1], lower[1]))
+        ):
+            finite_differences = (upper_values - lower_values) / (2 * step)
+            scale = np.abs(finite_differences).max() + 1.0
+            np.testing.assert_allclose(
+                derivatives[..., q], finite_differences, rtol=1e-6, atol=1e-7 * scale, err_msg=parameter)
+
+def perturb(records, parameter, step):
+    component_name, field, index = _PARAMETER_PATTERN.match(parameter).groups()
+    perturbed = json.loads(json.dumps(records))
+    for record in perturbed:
+        component = record["components"][component_name]
+        if index is None:
+            component[field] = component.get(field, 0.0) + step
+        else:
+            # Shorter coefficient lists are padded with zeros across the set
+            coefficients = component[field]
+            coefficients.extend([0.0] * (int(index) + 1 - len(coefficients)))
+            coefficients[int(index)] += step
+    return perturbed
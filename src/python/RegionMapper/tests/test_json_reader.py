@@ -0,0 +1,25 @@
+import io
+import json
+
+import pytest
+
+from json_reader import iter_json_records
+
+RECORDS = [1.25, 300, -4e5, {"name": "Bas_1", "components": {"Aluminum": {"mass_fraction": 0.2073}}}, "x", [1e-3]]
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 15, 1 << 16])
+def test_decodes_json_array_for_any_chunk_size(chunk_size):
+    text = json.dumps(RECORDS)
+
+    assert list(iter_json_records(io.StringIO(text), chunk_size=chunk_size)) == RECORDS
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 15, 1 << 16])
+def test_decodes_json_lines_for_any_chunk_size(chunk_size):
+    text = "\n".join(json.dumps(record) for record in RECORDS)
+
+    assert list(iter_json_records(io.StringIO(text), chunk_size=chunk_size)) == RECORDS
+
+@pytest.mark.parametrize("text", ["[1.25, 3x]", "[1.25, 300", "1.2.3"])
+def test_rejects_invalid_records(text):
+    with pytest.raises(ValueError):
+        list(iter_json_records(io.StringIO(text), chunk_size=1))
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from porosity_solver import CONVERGED, NO_BRACKET, porosity_function, solve_porosity
+from propellant_set import PropellantSet
+
+VARIABLE = "AmmoniumPerchlorate.large_particles_fraction"
+PRESSURE = 1e6
+
+@pytest.fixture(scope="module")
+def propellant_set(components, propellants):
+    return PropellantSet.from_propellants(propellants, tuple(components))
+
+def test_recovers_the_values_of_known_porosities(components, propellant_set):
+    # Targets are the porosities at known values inside the bracket [0.2, 0.9]
+    expected = np.array([0.35, 0.55, 0.8])
+    function = porosity_function(propellant_set, components, VARIABLE, PRESSURE)
+    rows = np.zeros(len(expected), dtype=int)
+    targets = function(rows, expected)
+
+    solution = solve_porosity(
+        propellant_set.take([0]), components, targets, VARIABLE, 0.2, 0.9, pressure=PRESSURE)
+
+    assert solution.statuses == (CONVERGED,) * len(expected)
+    np.testing.assert_allclose(solution.values, expected, rtol=1e-9)
+    assert np.all(np.abs(solution.residuals) <= 1e-12)
+    # The Illinois weighting keeps false position from stalling on one side of the root
+    assert solution.iterations.max() < 20
+
+def test_reports_targets_outside_the_bracket(components, propellant_set):
+    function = porosity_function(propellant_set, components, VARIABLE, PRESSURE)
+    porosity = function(np.zeros(2, dtype=int), np.array([0.2, 0.9]))
+    target = porosity.max() + 0.1
+
+    solution = solve_porosity(
+        propellant_set.take([0]), components, [target], VARIABLE, 0.2, 0.9, pressure=PRESSURE)
+
+    assert solution.statuses == (NO_BRACKET,)
+    assert np.isnan(solution.values[0])
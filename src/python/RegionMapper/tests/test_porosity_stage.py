@@ -0,0 +1,28 @@
+import os
+
+import numpy as np
+import pytest
+
+from calculators import RegionCalculator
+from porosity_stage import POROSITY_MODEL_PATH, calculate_porosity, calculate_porosity_set, porosity_model
+from propellant_set import PropellantSet
+from region_mappers import PocketRegionWithoutSkeletonMapper
+
+def test_porosity_model_does_not_resolve_modules_of_the_region_mapper():
+    # The region mapper has its own molar_masses module, which the model must not pick up
+    assert porosity_model.molar_masses.__name__ == "porosity_model.molar_masses"
+    assert os.path.samefile(os.path.dirname(porosity_model.molar_masses.__file__), POROSITY_MODEL_PATH)
+
+def test_batched_porosity_matches_the_porosity_calculator(components, propellants):
+    pressures = [1e6, 5e6]
+    results = RegionCalculator.calculate_set(
+        PropellantSet.from_propellants(propellants, tuple(components)), components, pressures)
+    region_density, porosity = calculate_porosity_set(
+        PropellantSet.from_propellants(propellants, tuple(components)), results)
+
+    for n, propellant in enumerate(propellants):
+        region_result = RegionCalculator.calculate(
+            PocketRegionWithoutSkeletonMapper().calculate(propellant), components, pressures[0])
+        expected = calculate_porosity(propellant, region_result)
+        assert region_density[n] == pytest.approx(expected.region_density, rel=1e-12)
+        np.testing.assert_allclose(porosity[n], expected.porosity, rtol=1e-12)
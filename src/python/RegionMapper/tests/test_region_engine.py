@@ -0,0 +1,37 @@
+import pytest
+
+from calculators import RegionCalculator
+from propellant_set import PropellantSet
+from region_mappers import (
+    DiffusionRegionMapper,
+    InterPocketRegionMapper,
+    PocketRegionWithoutSkeletonMapper,
+    PocketRegionWithSkeletonMapper
+)
+from utils import calculate_elemental_composition, calculate_enthalpy
+
+PRESSURES = [1e6, 3e6, 7.5e6]
+
+def scalar_region_data(propellant, pressure):
+    return {
+        "inter_pocket": InterPocketRegionMapper().calculate(propellant),
+        "pocket_without_skeleton": PocketRegionWithoutSkeletonMapper().calculate(propellant),
+        "pocket_with_skeleton": PocketRegionWithSkeletonMapper().calculate(propellant),
+        "diffusion": DiffusionRegionMapper().calculate(propellant, pressure)
+    }
+
+def test_batched_regions_match_scalar_mappers(components, propellants):
+    results = RegionCalculator.calculate_set(
+        PropellantSet.from_propellants(propellants, tuple(components)), components, PRESSURES)
+
+    for n, propellant in enumerate(propellants):
+        for p, pressure in enumerate(PRESSURES):
+            for region, region_data in scalar_region_data(propellant, pressure).items():
+                # The dictionary walk the engine replaced is the reference
+                result = results.result(n, p, region)
+                expected = calculate_elemental_composition(region_data.components, components)
+                assert result.composition.keys() == expected.keys()
+                for element, amount in expected.items():
+                    assert result.composition[element] == pytest.approx(amount, rel=1e-12)
+                assert result.enthalpy == pytest.approx(
+                    calculate_enthalpy(region_data.components, components), rel=1e-12)
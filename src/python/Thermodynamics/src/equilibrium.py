@@ -0,0 +1,513 @@
+"""
+This module contains the chemical equilibrium solver of the combustion products.
+
+The equilibrium composition at a fixed enthalpy and pressure minimizes the Gibbs energy of
+the products subject to the element balance. The solver follows the method of Gordon and
+McBride (NASA RP-1311): every Newton iteration solves one symmetric linear system for the
+Lagrange multipliers of the element balance, the corrections of the condensed species, the
+total gas moles and the temperature, and updates the logarithms of the gaseous species
+moles with a step control that keeps trace species from overshooting.
+
+Condensed species enter the problem when they lower the Gibbs energy at the converged
+state and leave it when their moles become negative.
+
+Gaseous species whose mole fraction falls below `PRUNE_LOG_FRACTION` during the iterations
+are pruned from the Newton system, so that the element-species matrices of the iterations
+only hold the species that matter. At convergence the mole fraction of every pruned species
+is recovered from the Lagrange multipliers; species that would exceed the threshold are
+re-admitted and the iterations continue. A species is pruned at most once per solve, so
+the active set cannot oscillate.
+
+A solve may start from the converged state of a neighbouring problem, e.g. the same region
+at the previous pressure of a sweep, instead of the generic cold start. If the warm start
+does not converge within `WARM_START_MAX_ITERATIONS`, the problem is solved again from the
+cold start.
+
+Classes:
+    - EquilibriumSolver: Solves the (H, P) equilibrium of regions for a species set.
+"""
+
+import math
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional, Tuple
+
+import numpy as np
+
+from models import EquilibriumResult, RegionCalculationResult
+from properties import GAS_CONSTANT
+from species_table import SpeciesTable
+
+# Standard state pressure of the species data in Pascals
+STANDARD_PRESSURE = 101325.0
+
+# Cold start of an equilibrium solve
+INITIAL_TEMPERATURE = 3800.0
+INITIAL_GAS_MOLES = 100.0  # mol/kg
+
+# Temperatures the Newton iterations are kept within, in Kelvin
+MIN_TEMPERATURE = 200.0
+MAX_TEMPERATURE = 6000.0
+
+MAX_ITERATIONS = 200
+# A warm start taking longer than this is abandoned for the cold start
+WARM_START_MAX_ITERATIONS = 50
+MAX_CONDENSED_CHANGES = 20
+
+# Convergence tolerances of the corrections and of the element balance
+MOLES_TOLERANCE = 0.5e-5
+TEMPERATURE_TOLERANCE = 1.0e-4
+ELEMENT_TOLERANCE = 1.0e-6
+
+# Mole fraction below which a gaseous species is a trace species, ln(1e-8)
+TRACE_LOG_FRACTION = -18.420681
+# Trace species are not allowed to grow above this mole fraction in one step, ln(1e-4)
+TRACE_STEP_LOG_FRACTION = -9.2103404
+
+# Smallest logarithm of the species moles, keeps exp() away from underflow
+MIN_LOG_MOLES = -700.0
+
+# Mole fraction below which a gaseous species is pruned from the iterations, ln(1e-12)
+PRUNE_LOG_FRACTION = -27.631021
+
+@dataclass(frozen=True, slots=True)
+class _Reduction:
+    """
+    The elements and species of the problems of regions with the same elements.
+
+    Attributes:
+        elements (Tuple[str, ...]): The elements present in the regions.
+        gas (np.ndarray): Table indices of the gaseous species consisting of these elements.
+        condensed (np.ndarray): Table indices of the condensed species consisting of these elements.
+        element_matrix (np.ndarray): Element matrix of the gaseous and then the condensed species.
+    """
+    elements: Tuple[str, ...]
+    gas: np.ndarray
+    condensed: np.ndarray
+    element_matrix: np.ndarray
+
+    @property
+    def species(self) -> np.ndarray:
+        return np.concatenate([self.gas, self.condensed])
+
+class EquilibriumSolver:
+    """
+    Solves the chemical equilibrium of combustion products at a fixed enthalpy and pressure.
+
+    The reduced element matrix of every set of elements is built once and shared by all
+    regions with these elements, so a solver should be reused for many regions.
+
+    Attributes:
+        table (SpeciesTable): All species the products may consist of.
+        pruning (bool): Whether gaseous trace species are pruned from the iterations.
+    """
+
+    def __init__(self, table: SpeciesTable, pruning: bool = True):
+        """
+        Args:
+            table (SpeciesTable): The combustion products.
+            pruning (bool): Whether gaseous trace species are pruned from the iterations.
+        """
+        self.table = table
+        self.pruning = pruning
+        self._reductions: Dict[FrozenSet[str], _Reduction] = {}
+
+    def _reduce(self, elements: FrozenSet[str]) -> _Reduction:
+        """
+        Return the elements and species taking part in the problems of regions with the given
+        elements, building them on first use.
+
+        Raises:
+            ValueError: If an element is not contained in any species, or no gaseous species
+                consist of the elements.
+        """
+        reduction = self._reductions.get(elements)
+        if reduction is not None:
+            return reduction
+
+        table = self.table
+        missing = elements.difference(table.elements)
+        if missing:
+            raise ValueError(f"No species contain the elements {sorted(missing)}.")
+        element_rows = [i for i, element in enumerate(table.elements) if element in elements]
+        absent_rows = [i for i, element in enumerate(table.elements) if element not in elements]
+        active = ~np.any(table.element_matrix[absent_rows] > 0, axis=0)
+
+        gas = np.flatnonzero(active & table.is_gas)
+        condensed = np.flatnonzero(active & ~table.is_gas)
+        if gas.size == 0:
+            raise ValueError("No gaseous species consist of the elements of the region.")
+
+        reduction = _Reduction(
+            elements=tuple(table.elements[i] for i in element_rows),
+            gas=gas,
+            condensed=condensed,
+            element_matrix=table.element_matrix[np.ix_(element_rows, np.concatenate([gas, condensed]))]
+        )
+        self._reductions[elements] = reduction
+        return reduction
+
+    def solve(
+        self,
+        region: RegionCalculationResult,
+        pressure: Optional[float] = None,
+        initial: Optional[EquilibriumResult] = None
+    ) -> EquilibriumResult:
+        """
+        Calculate the equilibrium state of the combustion products of 1 kg of a region.
+
+        Args:
+            region (RegionCalculationResult): Enthalpy and elemental composition of the region.
+            pressure (Optional[float]): Pressure in Pascals, defaults to the pressure of the region.
+            initial (Optional[EquilibriumResult]): Converged state to start the iterations from,
+                defaults to the cold start. Species missing from it start as trace species.
+
+        Returns:
+            EquilibriumResult: The equilibrium state.
+
+        Raises:
+            ValueError: If the region contains an element no species consists of.
+            RuntimeError: If the iterations do not converge.
+        """
+        pressure = region.pressure if pressure is None else pressure
+        if pressure <= 0:
+            raise ValueError("Pressure must be a positive value.")
+
+        # Only elements present in the region and the species consisting of them take part
+        table = self.table
+        reduction = self._reduce(frozenset(
+            element for element, amount in region.composition.items() if amount > 0))
+        gas, condensed, species = reduction.gas, reduction.condensed, reduction.species
+
+        def new_problem() -> _Problem:
+            return _Problem(
+                table=table,
+                species=species,
+                gas_count=gas.size,
+                element_matrix=reduction.element_matrix,
+                element_moles=np.array([region.composition[element] for element in reduction.elements], dtype=float),
+                enthalpy=region.enthalpy / GAS_CONSTANT,
+                log_pressure=math.log(pressure / STANDARD_PRESSURE),
+                pruning=self.pruning
+            )
+
+        warm_start = initial is not None
+        failed_iterations = 0
+        if warm_start:
+            problem = new_problem()
+            problem.start_from(
+                temperature=initial.temperature,
+                gas_moles=np.array([initial.moles.get(table.label(index), 0.0) for index in gas]),
+                condensed_moles=np.array([initial.moles.get(table.label(index), 0.0) for index in condensed])
+            )
+            try:
+                problem.solve(WARM_START_MAX_ITERATIONS)
+            except RuntimeError:
+                warm_start = False
+                failed_iterations = problem.iterations
+        if not warm_start:
+            problem = new_problem()
+            problem.solve()
+
+        gas_moles = problem.gas_moles.sum()
+        moles = {}
+        for index, amount in zip(gas, problem.gas_moles):
+            moles[table.label(index)] = float(amount)
+        for index, amount, is_included in zip(condensed, problem.condensed_moles, problem.condensed_included):
+            if is_included:
+                moles[table.label(index)] = float(amount)
+
+        _, _, heat_capacities = table.dimensionless_properties(problem.temperature, species)
+        all_moles = np.concatenate([problem.gas_moles, problem.condensed_moles])
+        active_species = tuple(table.label(index) for index in gas[problem.gas_active]) + tuple(
+            table.label(index) for index in condensed[problem.condensed_included])
+        return EquilibriumResult(
+            pressure=pressure,
+            temperature=problem.temperature,
+            moles=moles,
+            gas_moles=float(gas_moles),
+            gas_average_molar_mass=float(problem.gas_moles @ table.molar_masses[gas] / gas_moles),
+            specific_heat_capacity_volumetric=float(GAS_CONSTANT * (all_moles @ heat_capacities - gas_moles)),
+            iterations=failed_iterations + problem.iterations,
+            warm_start=warm_start,
+            active_species=active_species,
+            species_count=len(species)
+        )
+
+
+class _Problem:
+    """
+    Newton iterations of a single (H, P) equilibrium problem, reduced to the species and
+    elements present in the region. Gaseous species come first in all species arrays.
+    """
+
+    def __init__(
+        self,
+        table: SpeciesTable,
+        species: np.ndarray,
+        gas_count: int,
+        element_matrix: np.ndarray,
+        element_moles: np.ndarray,
+        enthalpy: float,
+        log_pressure: float,
+        pruning: bool = True
+    ):
+        self.table = table
+        self.species = species
+        self.gas_count = gas_count
+        self.gas_matrix = element_matrix[:, :gas_count]
+        self.condensed_matrix = element_matrix[:, gas_count:]
+        self.element_moles = element_moles
+        # Enthalpy divided by the gas constant, H / R in K*mol/kg
+        self.enthalpy = enthalpy
+        self.log_pressure = log_pressure
+        self.pruning = pruning
+
+        self.temperature = INITIAL_TEMPERATURE
+        self.log_total_moles = math.log(INITIAL_GAS_MOLES)
+        self.log_gas_moles = np.full(gas_count, math.log(INITIAL_GAS_MOLES / gas_count))
+        self.gas_active = np.ones(gas_count, dtype=bool)
+        self.gas_pruned_once = np.zeros(gas_count, dtype=bool)
+        self.condensed_moles = np.zeros(len(species) - gas_count)
+        self.condensed_included = np.zeros(len(species) - gas_count, dtype=bool)
+        self.multipliers = np.zeros(len(element_moles))
+        self.iterations = 0
+
+    @property
+    def gas_moles(self) -> np.ndarray:
+        return np.exp(self.log_gas_moles)
+
+    def start_from(self, temperature: float, gas_moles: np.ndarray, condensed_moles: np.ndarray) -> None:
+        """
+        Replace the cold start by a previous state. Condensed species with positive moles are
+        included from the start.
+        """
+        total_moles = gas_moles.sum()
+        if total_moles <= 0:
+            return
+        self.temperature = min(max(temperature, MIN_TEMPERATURE), MAX_TEMPERATURE)
+        self.log_total_moles = math.log(total_moles)
+        with np.errstate(divide="ignore"):
+            self.log_gas_moles = np.maximum(np.log(gas_moles), MIN_LOG_MOLES)
+        self.condensed_included = condensed_moles > 0
+        self.condensed_moles = np.where(self.condensed_included, condensed_moles, 0.0)
+
+    def solve(self, max_iterations: int = MAX_ITERATIONS) -> None:
+        """
+        Iterate to convergence, adding and removing condensed species until no condensed
+        species can lower the Gibbs energy.
+
+        Raises:
+            RuntimeError: If the iterations do not converge.
+        """
+        changes = 0
+        while changes < MAX_CONDENSED_CHANGES:
+            while not self._iterate():
+                if self.iterations >= max_iterations:
+                    raise RuntimeError(f"Equilibrium did not converge in {max_iterations} iterations.")
+                self._prune()
+            if self._readmit():
+                continue
+            if not self._update_condensed():
+                return
+            changes += 1
+        raise RuntimeError("Equilibrium did not converge: the condensed phases keep changing.")
+
+    def _iterate(self) -> bool:
+        """
+        Perform one Newton iteration. Returns True if the corrections are within the tolerances.
+        """
+        self.iterations += 1
+        temperature = self.temperature
+
+        # Only the active gaseous species and the included condensed species take part
+        active = np.flatnonzero(self.gas_active)
+        included = np.flatnonzero(self.condensed_included)
+        enthalpies, entropies, heat_capacities = self.table.dimensionless_properties(
+            temperature, np.concatenate([self.species[active], self.species[self.gas_count + included]]))
+        gibbs = enthalpies - entropies
+
+        g = active.size
+        gas_matrix = self.gas_matrix[:, active]
+        condensed_matrix = self.condensed_matrix[:, included]
+        log_gas_moles = self.log_gas_moles[active]
+        gas_moles = np.exp(log_gas_moles)
+        condensed_moles = self.condensed_moles[included]
+        gas_enthalpies = enthalpies[:g]
+        condensed_enthalpies = enthalpies[g:]
+
+        total_moles = math.exp(self.log_total_moles)
+        gas_potentials = gibbs[:g] + log_gas_moles - self.log_total_moles + self.log_pressure
+        condensed_potentials = gibbs[g:]
+
+        m = len(self.element_moles)
+        c = included.size
+        r = m + c
+        e = r + 1
+        weighted_matrix = gas_matrix * gas_moles
+        element_moles = weighted_matrix.sum(axis=1) + condensed_matrix @ condensed_moles
+
+        matrix = np.zeros((m + c + 2, m + c + 2))
+        rhs = np.zeros(m + c + 2)
+
+        # Element balance
+        matrix[:m, :m] = weighted_matrix @ gas_matrix.T
+        matrix[:m, m:r] = condensed_matrix
+        matrix[:m, r] = weighted_matrix.sum(axis=1)
+        matrix[:m, e] = weighted_matrix @ gas_enthalpies
+        rhs[:m] = self.element_moles - element_moles + weighted_matrix @ gas_potentials
+
+        # Condensed species
+        matrix[m:r, :m] = condensed_matrix.T
+        matrix[m:r, e] = condensed_enthalpies
+        rhs[m:r] = condensed_potentials
+
+        # Total gas moles
+        matrix[r, :m] = matrix[:m, r]
+        matrix[r, r] = gas_moles.sum() - total_moles
+        matrix[r, e] = gas_moles @ gas_enthalpies
+        rhs[r] = total_moles - gas_moles.sum() + gas_moles @ gas_potentials
+
+        # Enthalpy
+        matrix[e, :m] = matrix[:m, e]
+        matrix[e, m:r] = condensed_enthalpies
+        matrix[e, r] = matrix[r, e]
+        matrix[e, e] = (
+            gas_moles @ heat_capacities[:g] + condensed_moles @ heat_capacities[g:]
+            + gas_moles @ gas_enthalpies ** 2
+        )
+        rhs[e] = (
+            self.enthalpy / temperature - gas_moles @ gas_enthalpies - condensed_moles @ condensed_enthalpies
+            + gas_moles @ (gas_enthalpies * gas_potentials)
+        )
+
+        try:
+            solution = np.linalg.solve(matrix, rhs)
+        except np.linalg.LinAlgError:
+            solution = np.linalg.lstsq(matrix, rhs, rcond=None)[0]
+
+        multipliers = solution[:m]
+        condensed_corrections = solution[m:r]
+        log_total_correction = solution[r]
+        log_temperature_correction = solution[e]
+        log_gas_corrections = (
+            -gas_potentials + gas_enthalpies * log_temperature_correction
+            + gas_matrix.T @ multipliers + log_total_correction
+        )
+
+        step = self._step_size(log_gas_moles, log_gas_corrections, log_total_correction, log_temperature_correction)
+        self.log_gas_moles[active] = np.maximum(log_gas_moles + step * log_gas_corrections, MIN_LOG_MOLES)
+        self.condensed_moles[included] += step * condensed_corrections
+        self.log_total_moles += step * log_total_correction
+        self.temperature = min(max(
+            temperature * math.exp(step * log_temperature_correction), MIN_TEMPERATURE), MAX_TEMPERATURE)
+        self.multipliers = multipliers
+
+        total = gas_moles.sum() + condensed_moles.sum()
+        return bool(
+            np.all(gas_moles * np.abs(log_gas_corrections) <= MOLES_TOLERANCE * total)
+            and np.all(np.abs(condensed_corrections) <= MOLES_TOLERANCE * total)
+            and abs(log_total_correction) <= MOLES_TOLERANCE
+            and abs(log_temperature_correction) <= TEMPERATURE_TOLERANCE
+            and np.all(np.abs(self.element_moles - element_moles)
+                       <= ELEMENT_TOLERANCE * self.element_moles.max())
+        )
+
+    def _step_size(
+        self,
+        log_gas_moles: np.ndarray,
+        log_gas_corrections: np.ndarray,
+        log_total_correction: float,
+        log_temperature_correction: float
+    ) -> float:
+        """
+        Limit the Newton step so that temperature and major species change by at most a factor
+        of e**0.4 and trace species cannot jump above a mole fraction of 1e-4.
+        """
+        log_fractions = log_gas_moles - self.log_total_moles
+        major = log_fractions > TRACE_LOG_FRACTION
+        largest = max(
+            5.0 * abs(log_temperature_correction),
+            5.0 * abs(log_total_correction),
+            float(np.abs(log_gas_corrections[major]).max(initial=0.0))
+        )
+        step = 2.0 / largest if largest > 2.0 else 1.0
+
+        growing = ~major & (log_gas_corrections - log_total_correction > 0)
+        if np.any(growing):
+            trace_steps = np.abs(
+                (-log_fractions[growing] + TRACE_STEP_LOG_FRACTION)
+                / (log_gas_corrections[growing] - log_total_correction)
+            )
+            step = min(step, float(trace_steps.min()))
+        return step
+
+    def _prune(self) -> None:
+        """
+        Deactivate the gaseous species below the pruning threshold that have not been pruned
+        before, keeping at least one active carrier of every element.
+        """
+        if not self.pruning:
+            return
+        candidates = (
+            self.gas_active & ~self.gas_pruned_once
+            & (self.log_gas_moles - self.log_total_moles < PRUNE_LOG_FRACTION)
+        )
+        if not candidates.any():
+            return
+
+        remaining = self.gas_active & ~candidates
+        carried = (
+            (self.gas_matrix[:, remaining] > 0).any(axis=1)
+            | (self.condensed_matrix[:, self.condensed_included] > 0).any(axis=1)
+        )
+        if not carried.all():
+            candidates &= ~(self.gas_matrix[~carried] > 0).any(axis=0)
+        self.gas_active &= ~candidates
+        self.gas_pruned_once |= candidates
+
+    def _readmit(self) -> bool:
+        """
+        Recover the moles of the pruned gaseous species from the Lagrange multipliers of the
+        converged state and re-admit the species above the pruning threshold.
+        Returns True if any species was re-admitted.
+        """
+        pruned = np.flatnonzero(~self.gas_active)
+        if pruned.size == 0:
+            return False
+
+        enthalpies, entropies, _ = self.table.dimensionless_properties(self.temperature, self.species[pruned])
+        # At equilibrium the chemical potential of every gaseous species is sum_i a_ij * pi_i
+        log_fractions = (
+            self.gas_matrix[:, pruned].T @ self.multipliers - (enthalpies - entropies) - self.log_pressure
+        )
+        self.log_gas_moles[pruned] = np.maximum(log_fractions + self.log_total_moles, MIN_LOG_MOLES)
+
+        readmitted = pruned[log_fractions > PRUNE_LOG_FRACTION]
+        self.gas_active[readmitted] = True
+        return readmitted.size > 0
+
+    def _update_condensed(self) -> bool:
+        """
+        Remove the condensed species with the most negative moles, or else add the condensed
+        species that lowers the Gibbs energy the most. Returns True if the set changed.
+        """
+        included = self.condensed_included
+        if np.any(included & (self.condensed_moles <= 0)):
+            index = int(np.argmin(np.where(included, self.condensed_moles, np.inf)))
+            included[index] = False
+            self.condensed_moles[index] = 0.0
+            return True
+
+        if included.all():
+            return False
+        enthalpies, entropies, _ = self.table.dimensionless_properties(
+            self.temperature, self.species[self.gas_count:])
+        # Gibbs energy change of forming a condensed species from the elements in equilibrium
+        affinities = enthalpies - entropies - self.condensed_matrix.T @ self.multipliers
+        affinities[included] = np.inf
+        index = int(np.argmin(affinities))
+        if affinities[index] >= 0:
+            return False
+        included[index] = True
+        return True
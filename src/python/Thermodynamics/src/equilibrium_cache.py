@@ -0,0 +1,188 @@
+"""
+This module contains the cache of equilibrium results.
+
+Three of the four regions do not depend on the pressure and many propellants share the
+same blends, so identical equilibrium problems recur within a run and across runs. The
+cache keeps recent results in an in-memory LRU and, optionally, every result in an SQLite
+database that persists between runs and may be shared by concurrent processes.
+
+Results are keyed by a digest of the quantized inputs: the elemental composition, the
+enthalpy and the pressure, each rounded to `KEY_SIGNIFICANT_DIGITS` significant digits, and
+the digest of the species table, so results of other species data are never returned.
+
+Classes:
+    - EquilibriumCache: Two-level cache of equilibrium results with hit and miss counters.
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+
+from collections import OrderedDict
+from typing import Optional
+
+from json_reader import equilibrium_result_from_dict
+from json_writer import equilibrium_result_to_dict
+from models import EquilibriumResult, RegionCalculationResult
+
+# Bump when the solver changes in a way that invalidates cached results
+CACHE_VERSION = 2
+
+# Significant digits the inputs are rounded to, far below the accuracy of the species data
+KEY_SIGNIFICANT_DIGITS = 10
+
+DEFAULT_CAPACITY = 4096
+
+# Seconds a process waits for another process holding the database lock
+DATABASE_TIMEOUT = 30.0
+
+CACHE_FILE_SUFFIX = ".equilibrium.sqlite"
+
+class EquilibriumCache:
+    """
+    In-memory LRU cache of equilibrium results in front of an optional SQLite database.
+
+    Attributes:
+        species_digest (str): Digest of the species table the results were calculated with.
+        database_path (Optional[str]): Path to the SQLite database, or None for memory only.
+        capacity (int): Number of results kept in memory.
+        hits (int): Number of lookups answered from memory.
+        database_hits (int): Number of lookups answered from the database.
+        misses (int): Number of lookups that required a solve.
+    """
+
+    def __init__(self, species_digest: str, database_path: Optional[str] = None, capacity: int = DEFAULT_CAPACITY):
+        """
+        Open the cache, creating the database if it does not exist. If the database cannot
+        be opened, a warning is printed and the cache keeps results in memory only.
+
+        Args:
+            species_digest (str): Digest of the species table, see `SpeciesTable.digest`.
+            database_path (Optional[str]): Path to the SQLite database, or None for memory only.
+            capacity (int): Number of results kept in memory.
+
+        Raises:
+            ValueError: If the capacity is not positive.
+        """
+        if capacity < 1:
+            raise ValueError("Cache capacity must be a positive value.")
+
+        self.species_digest = species_digest
+        self.database_path = database_path
+        self.capacity = capacity
+        self.hits = 0
+        self.database_hits = 0
+        self.misses = 0
+        self._results: "OrderedDict[str, EquilibriumResult]" = OrderedDict()
+        self._connection = None
+        if database_path is not None:
+            try:
+                self._connection = sqlite3.connect(database_path, timeout=DATABASE_TIMEOUT)
+                self._connection.execute("PRAGMA journal_mode=WAL")
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT NOT NULL)")
+                self._connection.commit()
+            except sqlite3.Error as e:
+                # A read-only directory or a corrupt database only costs the reuse between runs
+                print(f"Warning: equilibrium cache {database_path} is unavailable, keeping results "
+                      f"in memory only: {e}", file=sys.stderr)
+                self.close()
+                self.database_path = None
+
+    def __enter__(self) -> "EquilibriumCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def key(self, region: RegionCalculationResult, pressure: float) -> str:
+        """
+        Compute the cache key of the equilibrium of a region at a pressure.
+
+        Args:
+            region (RegionCalculationResult): Enthalpy and elemental composition of the region.
+            pressure (float): Pressure in Pascals.
+
+        Returns:
+            str: Hex digest of the quantized inputs.
+        """
+        payload = json.dumps({
+            "version": CACHE_VERSION,
+            "species": self.species_digest,
+            "composition": {
+                element: _quantize(amount)
+                for element, amount in sorted(region.composition.items()) if amount > 0
+            },
+            "enthalpy": _quantize(region.enthalpy),
+            "pressure": _quantize(pressure)
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[EquilibriumResult]:
+        """
+        Look up a result, updating the hit and miss counters.
+
+        Args:
+            key (str): The cache key, see `key`.
+
+        Returns:
+            Optional[EquilibriumResult]: The cached result, or None on a miss.
+        """
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return result
+
+        if self._connection is not None:
+            row = self._connection.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                result = equilibrium_result_from_dict(json.loads(row[0]))
+                self._remember(key, result)
+                self.database_hits += 1
+                return result
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, result: EquilibriumResult) -> None:
+        """
+        Store a result in memory and in the database.
+
+        Args:
+            key (str): The cache key, see `key`.
+            result (EquilibriumResult): The result.
+        """
+        self._remember(key, result)
+        if self._connection is not None:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO results (key, result) VALUES (?, ?)",
+                    (key, json.dumps(equilibrium_result_to_dict(result))))
+
+    def _remember(self, key: str, result: EquilibriumResult) -> None:
+        self._results[key] = result
+        self._results.move_to_end(key)
+        if len(self._results) > self.capacity:
+            self._results.popitem(last=False)
+
+    def format_stats(self) -> str:
+        """
+        Format the hit and miss counters for the console.
+        """
+        total = self.hits + self.database_hits + self.misses
+        hit_rate = 100.0 * (self.hits + self.database_hits) / total if total else 0.0
+        return (f"Equilibrium cache: {self.hits} memory hits, {self.database_hits} database hits, "
+                f"{self.misses} misses ({hit_rate:.1f}% hit rate).")
+
+def _quantize(value: float) -> str:
+    return f"{float(value):.{KEY_SIGNIFICANT_DIGITS}g}"
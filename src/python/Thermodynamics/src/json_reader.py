@@ -0,0 +1,255 @@
+import json
+import os
+import re
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from models import EquilibriumResult, RegionCalculationResult, Species, TemperatureRange, ThermodynamicsJob
+from molar_masses import ELEMENT_MOLAR_MASSES
+from properties import evaluate_coefficients
+
+# Extension of the output files, replacing the extension of the region files as the .NET host does
+OUTPUT_FILE_EXTENSION = ".tdc.json"
+
+# Temperature range of the gaseous species in TAB.dat files, which do not list it
+DEFAULT_GAS_TEMPERATURE_RANGE = (1000.0, 5000.0)
+
+# Phase of the condensed species in TAB.dat files, as in thermodynamic_substances.json
+TAB_CONDENSED_PHASE = "liquid"
+
+# Phase of the condensed species below a phase change
+SOLID_PHASE = "solid"
+
+# Enthalpy jump in J/mol between adjacent ranges of a condensed species that marks a phase
+# change, e.g. the heat of fusion of Al2O3 (117 kJ/mol) or Al (11 kJ/mol); smaller jumps are
+# fitting noise of ranges of the same phase
+PHASE_CHANGE_ENTHALPY = 1000.0
+
+_ELEMENT_PATTERN = re.compile(r"([A-Z][a-z]?)(\d*)")
+# Names such as 'Al2O3(900-2303' are truncated to a fixed width in TAB.dat files
+_TAB_NAME_PATTERN = re.compile(r"^([^(]+)(?:\((\d+(?:\.\d*)?)-(\d+(?:\.\d*)?)\)?)?$")
+
+def load_region_result(file_path: str) -> RegionCalculationResult:
+    """
+    Reads a region file written by the region mapper.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+
+    return RegionCalculationResult(
+        pressure=data["pressure"],
+        enthalpy=data["enthalpy"],
+        composition=data["composition"]
+    )
+
+def equilibrium_result_from_dict(data: dict) -> EquilibriumResult:
+    """
+    Converts a dictionary in the layout of the .tdc.json files back to an equilibrium result.
+    """
+    return EquilibriumResult(
+        pressure=data["pressure"],
+        temperature=data["temperature"],
+        moles=data["moles"],
+        gas_moles=data["gas_moles"],
+        gas_average_molar_mass=data["gas_average_molar_mass"],
+        specific_heat_capacity_volumetric=data["specific_heat_capacity_volumetric"],
+        iterations=data["iterations"],
+        warm_start=data.get("warm_start", False),
+        active_species=tuple(data.get("active_species", ())),
+        species_count=data.get("species_count", 0),
+        cached=data.get("cached", False)
+    )
+
+def get_output_path(propellant_path: str) -> str:
+    """
+    Returns the default output path of a region file, e.g. "inter_pocket.tdc.json" for "inter_pocket.json".
+    """
+    return os.path.splitext(propellant_path)[0] + OUTPUT_FILE_EXTENSION
+
+def get_series(propellant_path: str) -> str:
+    """
+    Returns the default series of a region file, "<propellant>/<region file>" in the
+    '<pressure>/<propellant>/<region>.json' layout of the region mapper output.
+    """
+    directory, file_name = os.path.split(os.path.abspath(propellant_path))
+    return f"{os.path.basename(directory)}/{file_name}"
+
+def load_manifest(file_path: str) -> List[ThermodynamicsJob]:
+    """
+    Reads a manifest of equilibrium calculations, a JSON array of objects such as
+        {"propellant": "1000000/Bas_2/inter_pocket.json", "pressure": 1e6, "output_json": "..."}
+    where "output_json" is optional and defaults to `get_output_path` of the region file, and an
+    optional "series" defaults to `get_series` of the region file.
+    Relative paths are resolved against the directory of the manifest.
+
+    Raises:
+        ValueError: If the manifest is not an array of jobs or a pressure is not positive.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    if not isinstance(data, list):
+        raise ValueError(f"Manifest '{file_path}' must contain a JSON array of jobs.")
+
+    base_dir = os.path.dirname(os.path.abspath(file_path))
+    jobs = []
+    for index, item in enumerate(data):
+        try:
+            propellant_path = os.path.join(base_dir, item["propellant"])
+            pressure = float(item["pressure"])
+            output_path = item.get("output_json")
+            series = item.get("series")
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid job {index} in manifest '{file_path}': {e!r}.") from e
+        if pressure <= 0:
+            raise ValueError(f"Pressure of job {index} in manifest '{file_path}' must be a positive value.")
+        jobs.append(ThermodynamicsJob(
+            propellant_path=propellant_path,
+            pressure=pressure,
+            output_path=os.path.join(base_dir, output_path) if output_path else get_output_path(propellant_path),
+            series=str(series) if series is not None else get_series(propellant_path)
+        ))
+    return jobs
+
+def parse_formula(formula: str) -> Dict[str, int]:
+    """
+    Parses a chemical formula such as "Al2O3" into the number of atoms of every element.
+
+    Raises:
+        ValueError: If the formula contains anything but element symbols and counts.
+    """
+    elements: Dict[str, int] = {}
+    position = 0
+    for match in _ELEMENT_PATTERN.finditer(formula):
+        if match.start() != position:
+            break
+        element, count = match.groups()
+        elements[element] = elements.get(element, 0) + (int(count) if count else 1)
+        position = match.end()
+    if position != len(formula) or not elements:
+        raise ValueError(f"Invalid chemical formula '{formula}'.")
+    return elements
+
+def load_species(file_path: str) -> List[Species]:
+    """
+    Reads the thermodynamic data of the combustion products from a JSON file in the layout of
+    thermodynamic_substances.json or from a TAB.dat text file.
+
+    Entries with the same formula and phase are merged into one species whose ranges are
+    sorted by temperature. Both data files label every range of a condensed species with the
+    same phase, so a condensed species is split into separate phases wherever its enthalpy
+    jumps between adjacent ranges, see `split_phases`.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        text = file.read()
+
+    if text.lstrip().startswith("["):
+        entries = _parse_json_entries(json.loads(text))
+    else:
+        entries = _parse_tab_entries(text)
+
+    grouped: Dict[Tuple[str, str], List[TemperatureRange]] = {}
+    for formula, phase, temperature_range in entries:
+        grouped.setdefault((formula, phase), []).append(temperature_range)
+
+    species = []
+    for (formula, phase), ranges in grouped.items():
+        ranges = sorted(ranges, key=lambda r: r.min)
+        phases = [(phase, ranges)] if phase == "gas" else split_phases(phase, ranges)
+        elements = parse_formula(formula)
+        species.extend(
+            Species(formula=formula, elements=elements, phase=phase_name, ranges=tuple(phase_ranges))
+            for phase_name, phase_ranges in phases
+        )
+    return species
+
+def split_phases(phase: str, ranges: List[TemperatureRange]) -> List[Tuple[str, List[TemperatureRange]]]:
+    """
+    Splits the sorted ranges of a condensed species into phases at every boundary where the
+    enthalpy jumps by more than `PHASE_CHANGE_ENTHALPY`, as CEA treats solid and liquid as
+    separate species. Merged into one species, the jump makes the enthalpy discontinuous at
+    the melting point, and an equilibrium on the melting plateau cannot converge; as separate
+    phases, both can coexist at the melting point.
+
+    The phase above the last jump keeps the given phase, the phases below it are solid,
+    numbered from the lowest temperature if there are several.
+
+    Returns:
+        List[Tuple[str, List[TemperatureRange]]]: Phase names and their ranges.
+    """
+    segments = [[ranges[0]]]
+    for lower, upper in zip(ranges, ranges[1:]):
+        boundary = lower.max
+        lower_enthalpy = evaluate_coefficients(np.array(lower.coefficients), boundary)[0]
+        upper_enthalpy = evaluate_coefficients(np.array(upper.coefficients), boundary)[0]
+        if abs(float(upper_enthalpy - lower_enthalpy)) > PHASE_CHANGE_ENTHALPY:
+            segments.append([])
+        segments[-1].append(upper)
+
+    if len(segments) == 1:
+        return [(phase, segments[0])]
+    solid_names = [SOLID_PHASE] if len(segments) == 2 else [f"{SOLID_PHASE}{i + 1}" for i in range(len(segments) - 1)]
+    return list(zip(solid_names + [phase], segments))
+
+def normalize_tab_formula(formula: str) -> str:
+    """
+    Restores the case of element symbols written in capitals in TAB.dat files, e.g. "HCL" -> "HCl".
+    A capital letter is merged into the preceding symbol only if it does not start an element
+    of its own, so "CO" remains carbon monoxide.
+    """
+    characters = list(formula)
+    for i in range(1, len(characters)):
+        previous, current = characters[i - 1], characters[i]
+        if (previous.isupper() and current.isupper() and current not in ELEMENT_MOLAR_MASSES
+                and previous + current.lower() in ELEMENT_MOLAR_MASSES):
+            characters[i] = current.lower()
+    return "".join(characters)
+
+def _parse_json_entries(data) -> List[Tuple[str, str, TemperatureRange]]:
+    entries = []
+    for item in data:
+        temperature_range = item.get("temperature_range", {})
+        entries.append((
+            item["formula"],
+            item.get("phase", "gas"),
+            TemperatureRange(
+                min=float(temperature_range.get("min", DEFAULT_GAS_TEMPERATURE_RANGE[0])),
+                max=float(temperature_range.get("max", DEFAULT_GAS_TEMPERATURE_RANGE[1])),
+                coefficients=_parse_coefficients(item["coefficients"], item["formula"])
+            )
+        ))
+    return entries
+
+def _parse_tab_entries(text: str) -> List[Tuple[str, str, TemperatureRange]]:
+    entries = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        # Files written by DOS tools end with a Ctrl-Z end-of-file marker
+        tokens = line.replace("\x1a", "").split()
+        if not tokens:
+            continue
+        name = tokens[0].strip("'\"")
+        match = _TAB_NAME_PATTERN.match(name)
+        if match is None:
+            raise ValueError(f"Invalid species name '{name}' on line {line_number}.")
+        formula, t_min, t_max = match.groups()
+        formula = normalize_tab_formula(formula)
+        if t_min is None:
+            phase, (t_min, t_max) = "gas", DEFAULT_GAS_TEMPERATURE_RANGE
+        else:
+            phase = TAB_CONDENSED_PHASE
+        entries.append((
+            formula,
+            phase,
+            TemperatureRange(
+                min=float(t_min),
+                max=float(t_max),
+                coefficients=_parse_coefficients([float(token) for token in tokens[1:]], formula)
+            )
+        ))
+    return entries
+
+def _parse_coefficients(coefficients, formula: str) -> Tuple[float, ...]:
+    if len(coefficients) != 9:
+        raise ValueError(f"Species '{formula}' must have 9 coefficients, got {len(coefficients)}.")
+    return tuple(float(c) for c in coefficients)
@@ -0,0 +1,41 @@
+import json
+import os
+
+from models import EquilibriumResult
+
+def equilibrium_result_to_dict(result: EquilibriumResult) -> dict:
+    """
+    Converts an equilibrium result to the layout of the .tdc.json files read by the .NET host.
+    """
+    return {
+        "pressure": result.pressure,
+        "temperature": result.temperature,
+        "specific_heat_capacity_volumetric": result.specific_heat_capacity_volumetric,
+        "gas_average_molar_mass": result.gas_average_molar_mass,
+        "gas_moles": result.gas_moles,
+        "iterations": result.iterations,
+        "warm_start": result.warm_start,
+        "cached": result.cached,
+        "species_count": result.species_count,
+        "active_species": list(result.active_species),
+        "moles": result.moles
+    }
+
+def write_equilibrium_result(result: EquilibriumResult, output_path: str) -> None:
+    """
+    Saves an equilibrium result to a JSON file, creating its directory if it does not exist.
+    The file is replaced atomically, so readers never observe a partially written result.
+    """
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(equilibrium_result_to_dict(result), file, indent=4)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,208 @@
+import argparse
+import sys
+
+from dataclasses import replace
+from typing import Dict, List, Optional
+
+from equilibrium import EquilibriumSolver
+from equilibrium_cache import CACHE_FILE_SUFFIX as EQUILIBRIUM_CACHE_FILE_SUFFIX, EquilibriumCache
+from json_reader import load_manifest, load_region_result
+from json_writer import write_equilibrium_result
+from models import EquilibriumResult, ThermodynamicsJob
+from species_table import load_species_table
+
+def parse_args():
+    """
+    Parse command-line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Calculate the equilibrium temperature and properties of the combustion products of regions."
+    )
+    parser.add_argument(
+        "--propellant",
+        help="Path to the region JSON file written by the region mapper (e.g., inter_pocket.json)."
+    )
+    parser.add_argument(
+        "--manifest",
+        help=(
+            "Path to a JSON array of jobs {\"propellant\": ..., \"pressure\": ..., \"output_json\": ...} "
+            "solved in one run instead of a single --propellant. \"output_json\" is optional and defaults "
+            "to the region file with the extension '.tdc.json'; relative paths are resolved against "
+            "the directory of the manifest. Jobs of the same region are solved in the order of their "
+            "pressures, each starting from the solution at the previous pressure."
+        )
+    )
+    parser.add_argument(
+        "--combustion-products",
+        required=True,
+        help=(
+            "Path to the thermodynamic data of the combustion products, a JSON file in the layout of "
+            "thermodynamic_substances.json or a TAB.dat text file."
+        )
+    )
+    parser.add_argument(
+        "--pressure",
+        type=float,
+        help="Pressure in Pascals (e.g., 1e6), required with --propellant."
+    )
+    parser.add_argument(
+        "--output-json",
+        help="Path to the output JSON file (e.g., inter_pocket.tdc.json), required with --propellant."
+    )
+    parser.add_argument(
+        "--species-cache",
+        help=(
+            "Path to the compiled species table cache (default: the combustion products path "
+            "with the suffix '.species.npz')."
+        )
+    )
+    parser.add_argument(
+        "--no-species-cache",
+        action="store_true",
+        help="Compile the species table from the combustion products file without reading or writing the cache."
+    )
+    parser.add_argument(
+        "--no-warm-start",
+        action="store_true",
+        help="Solve every job of a manifest from the cold start instead of the solution at the previous pressure."
+    )
+    parser.add_argument(
+        "--no-species-pruning",
+        action="store_true",
+        help="Keep every gaseous species in the Newton iterations instead of pruning trace species."
+    )
+    parser.add_argument(
+        "--equilibrium-cache",
+        help=(
+            "Path to the SQLite database of equilibrium results, shared by runs and concurrent "
+            "processes (default: the combustion products path with the suffix '.equilibrium.sqlite')."
+        )
+    )
+    parser.add_argument(
+        "--no-equilibrium-cache",
+        action="store_true",
+        help="Solve every job, only reusing results of identical regions within the run."
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Print equilibrium cache statistics at the end of the run."
+    )
+
+    args = parser.parse_args()
+    if (args.propellant is None) == (args.manifest is None):
+        parser.error("Exactly one of --propellant and --manifest is required.")
+    if args.propellant is not None:
+        if args.pressure is None or args.output_json is None:
+            parser.error("--pressure and --output-json are required with --propellant.")
+        if args.pressure <= 0:
+            parser.error("Pressure must be a positive value.")
+    elif args.pressure is not None or args.output_json is not None:
+        parser.error("--pressure and --output-json are given per job in the manifest.")
+    return args
+
+def run_jobs(
+        solver: EquilibriumSolver,
+        jobs: List[ThermodynamicsJob],
+        warm_start: bool = True,
+        cache: Optional[EquilibriumCache] = None
+    ) -> int:
+    """
+    Solve and write every job, continuing after failed jobs. The jobs of every series are
+    solved in the order of their pressures. Jobs found in the cache are written without solving.
+
+    Args:
+        solver (EquilibriumSolver): The solver shared by all jobs.
+        jobs (List[ThermodynamicsJob]): The jobs.
+        warm_start (bool): Whether to start every job from the solution of the previous job
+            of its series.
+        cache (Optional[EquilibriumCache]): Cache of the results of previous solves.
+
+    Returns:
+        int: Number of failed jobs.
+    """
+    failures = 0
+    iterations = 0
+    warm_starts = 0
+    cached = 0
+    previous: Dict[str, EquilibriumResult] = {}
+    for job in sorted(jobs, key=lambda job: (job.series, job.pressure)):
+        try:
+            region = load_region_result(job.propellant_path)
+            key = cache.key(region, job.pressure) if cache is not None else None
+            result = cache.get(key) if cache is not None else None
+            from_cache = result is not None
+            if from_cache:
+                # The output reports the work of this run, not of the run that solved the job
+                result = replace(result, iterations=0, warm_start=False, cached=True)
+            else:
+                result = solver.solve(region, job.pressure, previous.get(job.series) if warm_start else None)
+                if cache is not None:
+                    cache.put(key, result)
+            write_equilibrium_result(result, job.output_path)
+        except Exception as e:
+            failures += 1
+            print(f"Error: {job.propellant_path} at {job.pressure} Pa: {e}", file=sys.stderr)
+            continue
+
+        previous[job.series] = result
+        if from_cache:
+            cached += 1
+            print(f"Equilibrium at {result.temperature:.1f} K taken from the cache, "
+                  f"results successfully written to {job.output_path}")
+            continue
+
+        iterations += result.iterations
+        warm_starts += result.warm_start
+        print(f"Equilibrium at {result.temperature:.1f} K reached in {result.iterations} iterations "
+              f"({'warm' if result.warm_start else 'cold'} start, "
+              f"{len(result.active_species)} of {result.species_count} species active), "
+              f"results successfully written to {job.output_path}")
+
+    if len(jobs) > 1:
+        print(f"Solved {len(jobs) - failures} of {len(jobs)} jobs in {iterations} iterations, "
+              f"{warm_starts} from the previous pressure, {cached} from the cache.")
+    return failures
+
+def main():
+    """
+    Main function to calculate and export the thermodynamic properties of regions.
+    """
+    try:
+        args = parse_args()
+
+        if args.manifest is not None:
+            jobs = load_manifest(args.manifest)
+        else:
+            jobs = [ThermodynamicsJob(
+                propellant_path=args.propellant,
+                pressure=args.pressure,
+                output_path=args.output_json
+            )]
+
+        # The species data and the reduced element matrices are shared by all jobs
+        table = load_species_table(args.combustion_products, args.species_cache, use_cache=not args.no_species_cache)
+        solver = EquilibriumSolver(table, pruning=not args.no_species_pruning)
+
+        # Without the database identical regions of the run, e.g. shared blends, are still solved once
+        database_path = None
+        if not args.no_equilibrium_cache:
+            database_path = args.equilibrium_cache or args.combustion_products + EQUILIBRIUM_CACHE_FILE_SUFFIX
+
+        with EquilibriumCache(table.digest(), database_path) as cache:
+            failures = run_jobs(solver, jobs, warm_start=not args.no_warm_start, cache=cache)
+            if args.cache_stats:
+                print(cache.format_stats())
+        if failures:
+            raise RuntimeError(f"{failures} of {len(jobs)} jobs failed.")
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+@dataclass(frozen=True, slots=True)
+class TemperatureRange:
+    """
+    Represents the Φ(T) approximation of a species over a temperature range.
+
+    Attributes:
+        min (float): Lower bound of the range in Kelvin.
+        max (float): Upper bound of the range in Kelvin.
+        coefficients (Tuple[float, ...]): The 9 approximation coefficients. With x = T / 1000,
+            the enthalpy in cal/mol is sum(coefficients[k + 1] * x**k for k in 0..7) and
+            coefficients[0] is the entropy constant in cal/(mol*K).
+    """
+    min: float
+    max: float
+    coefficients: Tuple[float, ...]
+
+@dataclass(frozen=True, slots=True)
+class Species:
+    """
+    Represents a combustion product with its thermodynamic data.
+
+    Attributes:
+        formula (str): The chemical formula (e.g., "H2O").
+        elements (Dict[str, int]): Number of atoms of every element in the formula.
+        phase (str): "gas" for gaseous species, any other phase is treated as condensed.
+        ranges (Tuple[TemperatureRange, ...]): Approximations sorted by temperature. Condensed
+            species carry one range per phase, e.g. solid and liquid Aluminum.
+
+    Example:
+        >>> Species(
+        ...     formula="H2O",
+        ...     elements={"H": 2, "O": 1},
+        ...     phase="gas",
+        ...     ranges=(TemperatureRange(min=1000, max=5000, coefficients=(53.6277, -60008.456, ...)),)
+        ... )
+    """
+    formula: str
+    elements: Dict[str, int]
+    phase: str
+    ranges: Tuple[TemperatureRange, ...]
+
+    @property
+    def is_gas(self) -> bool:
+        return self.phase == "gas"
+
+@dataclass(frozen=True, slots=True)
+class RegionCalculationResult:
+    """
+    Data Transfer Object (DTO) for the region data written by the region mapper.
+
+    Attributes:
+        pressure (float): Pressure in Pascals.
+        enthalpy (float): Enthalpy of the region in joule per kg.
+        composition (Dict[str, float]): Moles of every element per kg of the region.
+    """
+    pressure: float
+    enthalpy: float
+    composition: Dict[str, float]
+
+@dataclass(frozen=True, slots=True)
+class EquilibriumResult:
+    """
+    Data Transfer Object (DTO) for the equilibrium state of the combustion products of 1 kg of a region.
+
+    Attributes:
+        pressure (float): Pressure in Pascals.
+        temperature (float): Equilibrium temperature in Kelvin.
+        moles (Dict[str, float]): Moles of every species per kg, condensed species are
+            suffixed with their phase, e.g. "Al2O3(liquid)".
+        gas_moles (float): Total moles of the gaseous species per kg.
+        gas_average_molar_mass (float): Average molar mass of the gaseous species in kg/mol.
+        specific_heat_capacity_volumetric (float): Frozen specific heat capacity at constant
+            volume of the products in J/(kg*K).
+        iterations (int): Number of Newton iterations, including those of a failed warm start.
+        warm_start (bool): Whether the solve converged from a previous state.
+        active_species (Tuple[str, ...]): Species taking part in the final iterations, the
+            gaseous species above the pruning threshold and the included condensed species.
+        species_count (int): Number of species consisting of the elements of the region.
+        cached (bool): Whether the result was taken from the equilibrium cache instead of
+            being solved, in which case no iterations were performed.
+    """
+    pressure: float
+    temperature: float
+    moles: Dict[str, float]
+    gas_moles: float
+    gas_average_molar_mass: float
+    specific_heat_capacity_volumetric: float
+    iterations: int
+    warm_start: bool = False
+    active_species: Tuple[str, ...] = ()
+    species_count: int = 0
+    cached: bool = False
+
+@dataclass(frozen=True, slots=True)
+class ThermodynamicsJob:
+    """
+    Represents one equilibrium calculation of a manifest.
+
+    Attributes:
+        propellant_path (str): Path to the region JSON file written by the region mapper.
+        pressure (float): Pressure in Pascals.
+        output_path (str): Path to the output .tdc.json file.
+        series (str): Jobs of the same series are the same region at different pressures and
+            are solved in the order of their pressures, each starting from the previous one.
+    """
+    propellant_path: str
+    pressure: float
+    output_path: str
+    series: str = ""
+
+@dataclass(frozen=True, slots=True)
+class RegionFamily:
+    """
+    Represents a region whose composition depends on a parameter, the fraction of one of its
+    components excluded from it, such as the diffusion region without the agglomerated Aluminum.
+    Every region is a mass mixture of its components, so 1 kg of the region at the parameter θ
+    is the base region with θ * excluded_mass_fraction kg of the component removed, normalized
+    to 1 kg.
+
+    Attributes:
+        base (RegionCalculationResult): The region at the parameter 0.
+        excluded_composition (Dict[str, float]): Moles of every element per kg of the excluded
+            component, empty if the region does not depend on a parameter.
+        excluded_enthalpy (float): Enthalpy of the excluded component in joule per kg.
+        excluded_mass_fraction (float): Mass of the excluded component per kg of the base region.
+    """
+    base: RegionCalculationResult
+    excluded_composition: Dict[str, float]
+    excluded_enthalpy: float = 0.0
+    excluded_mass_fraction: float = 0.0
@@ -0,0 +1,77 @@
+"""
+This module evaluates the thermodynamic properties of species from their Φ(T) approximations.
+
+With x = T / 1000 and the coefficients f[0..8] of the range containing T:
+    H(T)  = sum(f[k + 1] * x**k, k = 0..7)                                       [cal/mol]
+    Cp(T) = sum(k * f[k + 1] * x**(k - 1), k = 1..7) / 1000                       [cal/(mol*K)]
+    S(T)  = f[0] + (f[2] * ln(x) + sum(k / (k - 1) * f[k + 1] * x**(k - 1), k = 2..7)) / 1000
+                                                                                  [cal/(mol*K)]
+    Φ(T)  = S(T) - H(T) / T, so that G(T) = -T * Φ(T).
+
+The enthalpy includes the enthalpy of formation at 298.15 K, so it is on the same scale as
+the enthalpies of the propellant components.
+
+Functions:
+    - evaluate_coefficients: Evaluates H, S and Cp of approximations at temperatures.
+    - species_molar_mass: Calculates the molar mass of a species.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from models import Species
+from molar_masses import ELEMENT_MOLAR_MASSES
+
+# Joules per international calorie, the unit of the approximation coefficients
+CALORIE = 4.1868
+
+# Universal gas constant in J/(mol*K)
+GAS_CONSTANT = 8.314462618
+
+# Number of coefficients of an approximation
+COEFFICIENT_COUNT = 9
+
+# Exponents k of the enthalpy polynomial and the factors k / (k - 1) of the entropy terms
+_EXPONENTS = np.arange(8, dtype=float)
+_ENTROPY_FACTORS = _EXPONENTS[2:] / (_EXPONENTS[2:] - 1.0)
+
+def evaluate_coefficients(
+    coefficients: np.ndarray,
+    temperatures: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Evaluate the enthalpy, entropy and heat capacity of approximations.
+
+    Args:
+        coefficients (np.ndarray): Approximation coefficients, shape (..., 9).
+        temperatures (np.ndarray): Temperatures in Kelvin, broadcastable to coefficients.shape[:-1].
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: H in J/mol, S and Cp in J/(mol*K).
+    """
+    x = np.asarray(temperatures, dtype=float)[..., None] / 1000.0
+    powers = x ** _EXPONENTS
+
+    enthalpies = (coefficients[..., 1:] * powers).sum(axis=-1)
+    heat_capacities = (coefficients[..., 2:] * _EXPONENTS[1:] * powers[..., :7]).sum(axis=-1) / 1000.0
+    entropies = coefficients[..., 0] + (
+        coefficients[..., 2] * np.log(x[..., 0])
+        + (coefficients[..., 3:] * _ENTROPY_FACTORS * powers[..., 1:7]).sum(axis=-1)
+    ) / 1000.0
+
+    return enthalpies * CALORIE, entropies * CALORIE, heat_capacities * CALORIE
+
+def species_molar_mass(species: Species) -> float:
+    """
+    Calculate the molar mass of a species in kg/mol.
+
+    Raises:
+        KeyError: If an element is not found in the `ELEMENT_MOLAR_MASSES` database.
+    """
+    molar_mass = 0.0
+    for element, count in species.elements.items():
+        if element not in ELEMENT_MOLAR_MASSES:
+            raise KeyError(f"Element '{element}' of species '{species.formula}' not found in molar mass database.")
+        molar_mass += ELEMENT_MOLAR_MASSES[element] * count
+    return molar_mass
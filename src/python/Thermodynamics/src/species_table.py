@@ -0,0 +1,369 @@
+"""
+This module contains the precompiled species table of the combustion products.
+
+Parsing the species data and building the element matrix is repeated by every
+thermodynamics invocation. The table compiles it once into NumPy arrays:
+    - a species x range x coefficient matrix, where species with fewer ranges are padded
+      and a range mask marks the valid ranges;
+    - the temperature bounds of every range;
+    - the element matrix and the molar masses of the species.
+
+The compiled table is cached as an `.npz` file next to the species data. The cache records
+the size, modification time and SHA-256 digest of the data file; when the size or the
+modification time differ, the digest decides whether the cache is still valid, so touching
+or copying the data file does not force a recompilation.
+
+Classes:
+    - SpeciesProperties: Properties of species over temperatures.
+    - SpeciesTable: Array-backed species data with vectorized property evaluation.
+
+Functions:
+    - load_species_table: Loads a species table from the cache or compiles it from the data file.
+"""
+
+import hashlib
+import os
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from json_reader import load_species
+from models import Species
+from properties import COEFFICIENT_COUNT, GAS_CONSTANT, evaluate_coefficients, species_molar_mass
+
+# Bump when the layout of the cache file changes
+CACHE_VERSION = 2
+
+CACHE_FILE_SUFFIX = ".species.npz"
+
+@dataclass(frozen=True, slots=True)
+class SpeciesProperties:
+    """
+    Data Transfer Object (DTO) for the properties of species over temperatures.
+
+    Attributes:
+        temperatures (np.ndarray): Temperatures in Kelvin, shape (N,).
+        enthalpy (np.ndarray): Enthalpies in J/mol, shape (N, S).
+        entropy (np.ndarray): Entropies in J/(mol*K), shape (N, S).
+        heat_capacity (np.ndarray): Isobaric heat capacities in J/(mol*K), shape (N, S).
+        gibbs (np.ndarray): Gibbs energies in J/mol at the standard pressure, shape (N, S).
+    """
+    temperatures: np.ndarray
+    enthalpy: np.ndarray
+    entropy: np.ndarray
+    heat_capacity: np.ndarray
+    gibbs: np.ndarray
+
+class SpeciesTable:
+    """
+    Array-backed thermodynamic data of S species over their E elements.
+
+    Attributes:
+        formulas (Tuple[str, ...]): Chemical formulas, shape (S,).
+        phases (Tuple[str, ...]): Phases, shape (S,).
+        elements (Tuple[str, ...]): Element symbols in the order of the element matrix rows.
+        element_matrix (np.ndarray): Atoms of every element in every species, shape (E, S).
+        is_gas (np.ndarray): Whether a species is gaseous, shape (S,).
+        molar_masses (np.ndarray): Molar masses in kg/mol, shape (S,).
+        coefficients (np.ndarray): Approximation coefficients, shape (S, K, 9), where K is
+            the largest number of ranges of a species.
+        range_mask (np.ndarray): Whether a range of a species is valid, shape (S, K).
+        range_min (np.ndarray): Lower range bounds in Kelvin, shape (S, K).
+        range_max (np.ndarray): Upper range bounds in Kelvin, shape (S, K).
+    """
+    __slots__ = (
+        "formulas",
+        "phases",
+        "elements",
+        "element_matrix",
+        "is_gas",
+        "molar_masses",
+        "coefficients",
+        "range_mask",
+        "range_min",
+        "range_max",
+        "_switch_temperatures"
+    )
+
+    def __init__(
+        self,
+        formulas: Sequence[str],
+        phases: Sequence[str],
+        elements: Sequence[str],
+        element_matrix: np.ndarray,
+        molar_masses: np.ndarray,
+        coefficients: np.ndarray,
+        range_mask: np.ndarray,
+        range_min: np.ndarray,
+        range_max: np.ndarray
+    ):
+        if not formulas:
+            raise ValueError("At least one species is required.")
+
+        self.formulas = tuple(formulas)
+        self.phases = tuple(phases)
+        self.elements = tuple(elements)
+        self.element_matrix = np.asarray(element_matrix, dtype=float)
+        self.is_gas = np.array([phase == "gas" for phase in self.phases])
+        self.molar_masses = np.asarray(molar_masses, dtype=float)
+        self.coefficients = np.asarray(coefficients, dtype=float)
+        self.range_mask = np.asarray(range_mask, dtype=bool)
+        self.range_min = np.asarray(range_min, dtype=float)
+        self.range_max = np.asarray(range_max, dtype=float)
+
+        # A temperature selects the first valid range whose upper bound it does not exceed,
+        # or the last valid range; padded ranges are never selected
+        switch_temperatures = np.where(self.range_mask, self.range_max, np.inf)[:, :-1].copy()
+        last_range = self.range_mask.sum(axis=1) - 1
+        for k in range(switch_temperatures.shape[1]):
+            switch_temperatures[last_range <= k, k] = np.inf
+        self._switch_temperatures = switch_temperatures
+
+    @classmethod
+    def from_species(cls, species: Sequence[Species]) -> "SpeciesTable":
+        """
+        Compile the species data into a table.
+
+        Args:
+            species (Sequence[Species]): The species.
+
+        Raises:
+            KeyError: If a species contains an element without a known molar mass.
+        """
+        elements = sorted({element for item in species for element in item.elements})
+        element_index = {element: i for i, element in enumerate(elements)}
+        range_count = max((len(item.ranges) for item in species), default=1)
+
+        element_matrix = np.zeros((len(elements), len(species)))
+        coefficients = np.zeros((len(species), range_count, COEFFICIENT_COUNT))
+        range_mask = np.zeros((len(species), range_count), dtype=bool)
+        range_min = np.zeros((len(species), range_count))
+        range_max = np.zeros((len(species), range_count))
+        for j, item in enumerate(species):
+            for element, count in item.elements.items():
+                element_matrix[element_index[element], j] = count
+            for k, temperature_range in enumerate(item.ranges):
+                coefficients[j, k] = temperature_range.coefficients
+                range_mask[j, k] = True
+                range_min[j, k] = temperature_range.min
+                range_max[j, k] = temperature_range.max
+
+        return cls(
+            formulas=[item.formula for item in species],
+            phases=[item.phase for item in species],
+            elements=elements,
+            element_matrix=element_matrix,
+            molar_masses=np.array([species_molar_mass(item) for item in species]),
+            coefficients=coefficients,
+            range_mask=range_mask,
+            range_min=range_min,
+            range_max=range_max
+        )
+
+    def __len__(self) -> int:
+        return len(self.formulas)
+
+    def digest(self) -> str:
+        """
+        Compute the SHA-256 digest of the species, their elements and their approximations.
+        """
+        digest = hashlib.sha256()
+        digest.update("\n".join(self.formulas).encode("utf-8"))
+        digest.update("\n".join(self.phases).encode("utf-8"))
+        digest.update("\n".join(self.elements).encode("utf-8"))
+        for array in (self.element_matrix, self.coefficients, self.range_mask, self.range_min, self.range_max):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()
+
+    def label(self, index: int) -> str:
+        """
+        Return the name of a species in results, condensed species are suffixed with their
+        phase, e.g. "Al2O3(liquid)".
+        """
+        if self.is_gas[index]:
+            return self.formulas[index]
+        return f"{self.formulas[index]}({self.phases[index]})"
+
+    def select_coefficients(self, temperatures: np.ndarray, species: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Select the coefficients of the range of every species at every temperature.
+        Temperatures outside of all ranges use the nearest range.
+
+        Args:
+            temperatures (np.ndarray): Temperatures in Kelvin, any shape T.
+            species (Optional[np.ndarray]): Indices of the species, defaults to all species.
+
+        Returns:
+            np.ndarray: Coefficients, shape T + (S, 9).
+        """
+        species = np.arange(len(self)) if species is None else np.asarray(species)
+        temperatures = np.asarray(temperatures, dtype=float)
+        switch_temperatures = self._switch_temperatures[species]
+        ranges = (temperatures[..., None, None] > switch_temperatures).sum(axis=-1)
+        return self.coefficients[species, ranges]
+
+    def properties(self, temperatures: np.ndarray, species: Optional[np.ndarray] = None) -> SpeciesProperties:
+        """
+        Evaluate the properties of species over a temperature vector in one call.
+
+        Args:
+            temperatures (np.ndarray): Temperatures in Kelvin, shape (N,).
+            species (Optional[np.ndarray]): Indices of the S species, defaults to all species.
+
+        Returns:
+            SpeciesProperties: Properties of shape (N, S).
+        """
+        temperatures = np.atleast_1d(np.asarray(temperatures, dtype=float))
+        enthalpy, entropy, heat_capacity = evaluate_coefficients(
+            self.select_coefficients(temperatures, species), temperatures[:, None])
+        return SpeciesProperties(
+            temperatures=temperatures,
+            enthalpy=enthalpy,
+            entropy=entropy,
+            heat_capacity=heat_capacity,
+            gibbs=enthalpy - temperatures[:, None] * entropy
+        )
+
+    def dimensionless_properties(
+        self,
+        temperature: float,
+        species: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate H/RT, S/R and Cp/R of species at a temperature, as used by the equilibrium solver.
+
+        Args:
+            temperature (float): Temperature in Kelvin.
+            species (Optional[np.ndarray]): Indices of the S species, defaults to all species.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Arrays of shape (S,).
+        """
+        enthalpy, entropy, heat_capacity = evaluate_coefficients(
+            self.select_coefficients(temperature, species), temperature)
+        return (
+            enthalpy / (GAS_CONSTANT * temperature),
+            entropy / GAS_CONSTANT,
+            heat_capacity / GAS_CONSTANT
+        )
+
+    def save(self, file_path: str, source_stamp: Tuple[int, int, str]) -> None:
+        """
+        Write the table to an `.npz` file atomically.
+
+        Args:
+            file_path (str): Path to the cache file.
+            source_stamp (Tuple[int, int, str]): Size, modification time in nanoseconds and
+                SHA-256 digest of the species data file, see `source_stamp`.
+        """
+        temp_path = f"{file_path}.{os.getpid()}.tmp.npz"
+        try:
+            np.savez(
+                temp_path,
+                version=np.int64(CACHE_VERSION),
+                source_size=np.int64(source_stamp[0]),
+                source_mtime_ns=np.int64(source_stamp[1]),
+                source_sha256=np.str_(source_stamp[2]),
+                formulas=np.array(self.formulas, dtype=str),
+                phases=np.array(self.phases, dtype=str),
+                elements=np.array(self.elements, dtype=str),
+                element_matrix=self.element_matrix,
+                molar_masses=self.molar_masses,
+                coefficients=self.coefficients,
+                range_mask=self.range_mask,
+                range_min=self.range_min,
+                range_max=self.range_max
+            )
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, file_path: str) -> Optional[Tuple["SpeciesTable", Tuple[int, int, str]]]:
+        """
+        Read a table from an `.npz` file.
+
+        Args:
+            file_path (str): Path to the cache file.
+
+        Returns:
+            Optional[Tuple[SpeciesTable, Tuple[int, int, str]]]: The table and the stamp of the
+                species data file it was compiled from, or None if the cache is missing,
+                unreadable or of another version.
+        """
+        try:
+            with np.load(file_path, allow_pickle=False) as data:
+                if int(data["version"]) != CACHE_VERSION:
+                    return None
+                stamp = (int(data["source_size"]), int(data["source_mtime_ns"]), str(data["source_sha256"]))
+                table = cls(
+                    formulas=[str(formula) for formula in data["formulas"]],
+                    phases=[str(phase) for phase in data["phases"]],
+                    elements=[str(element) for element in data["elements"]],
+                    element_matrix=data["element_matrix"],
+                    molar_masses=data["molar_masses"],
+                    coefficients=data["coefficients"],
+                    range_mask=data["range_mask"],
+                    range_min=data["range_min"],
+                    range_max=data["range_max"]
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+        return table, stamp
+
+def file_sha256(file_path: str) -> str:
+    """
+    Compute the SHA-256 digest of a file.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def source_stamp(file_path: str) -> Tuple[int, int, str]:
+    """
+    Return the size, modification time in nanoseconds and SHA-256 digest of a file.
+    """
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns, file_sha256(file_path)
+
+def load_species_table(file_path: str, cache_path: Optional[str] = None, use_cache: bool = True) -> SpeciesTable:
+    """
+    Load the species table of a species data file, compiling it and refreshing the cache
+    when the cache is missing or stale.
+
+    Args:
+        file_path (str): Path to the species data, see `json_reader.load_species`.
+        cache_path (Optional[str]): Path to the cache file, defaults to the data file path
+            with the suffix ".species.npz".
+        use_cache (bool): Whether to read and write the cache.
+
+    Returns:
+        SpeciesTable: The species table.
+    """
+    if not use_cache:
+        return SpeciesTable.from_species(load_species(file_path))
+
+    cache_path = cache_path or file_path + CACHE_FILE_SUFFIX
+    stat = os.stat(file_path)
+    cached = SpeciesTable.load(cache_path)
+    if cached is not None:
+        table, (size, mtime_ns, digest) = cached
+        if (size, mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            return table
+
+    stamp = source_stamp(file_path)
+    if cached is None or stamp[2] != digest:
+        table = SpeciesTable.from_species(load_species(file_path))
+    try:
+        # Also refreshes the stamp of a touched but unchanged data file, so it is not hashed again
+        table.save(cache_path, stamp)
+    except OSError:
+        # A read-only data directory only costs the compilation on the next run
+        pass
+    return table
@@ -0,0 +1,547 @@
+"""
+This module contains the tabulated surrogate of the equilibrium properties of a region.
+
+The parametric model only needs the flame temperature, the average molar mass of the gas and
+the volumetric heat capacity of every region at every pressure of an optimization campaign.
+Instead of an equilibrium solve per pressure, the surrogate tabulates these properties once
+on a grid over the pressure and the parameter of the region, the fraction of a component
+excluded from it (the Aluminum agglomeration fraction of the diffusion region), and
+interpolates the grid bilinearly in log-pressure and the parameter:
+
+    surrogate = PropertySurrogate.load("Bas_2.diffusion.surrogate.npz")
+    properties = surrogate.interpolate(pressures, agglomeration_fractions)  # arrays of any shape
+    properties["temperature"]
+
+The grid starts from a few evenly spaced nodes on every axis. Every refinement pass solves the
+midpoint of every interval for all nodes of the other axis and inserts the midpoints where the
+solved properties deviate from the interpolated ones by more than the relative tolerance, so
+nodes concentrate where the properties curve, e.g. around phase changes of the condensed
+products. The interpolation error is then estimated against full solves at random points
+and stored with the grid.
+
+Classes:
+    - PropertySurrogate: Tabulated properties with a vectorized bilinear interpolator.
+
+Functions:
+    - region_at_parameter: Evaluates the region of a region family at a parameter.
+    - build_surrogate: Tabulates the properties of a region family with adaptive refinement.
+    - estimate_errors: Compares the interpolated properties with full solves at random points.
+
+Usage:
+    python3 surrogate.py --region ../1000000/Bas_2/inter_pocket.json --combustion-products TAB.dat \
+        --pressures 1e6:6.5e6 --excluded-component Al --excluded-mass-fraction 0.2073 \
+        --parameters 0:1 --output Bas_2.diffusion.surrogate.npz
+"""
+
+import argparse
+import math
+import os
+import sys
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from equilibrium import EquilibriumSolver
+from json_reader import load_region_result, parse_formula
+from models import EquilibriumResult, RegionCalculationResult, RegionFamily
+from molar_masses import ELEMENT_MOLAR_MASSES
+from species_table import load_species_table
+
+# Bump when the layout of the surrogate file changes
+SURROGATE_VERSION = 1
+
+# Tabulated properties, named after the keys of the .tdc.json files
+PROPERTY_NAMES = ("temperature", "gas_average_molar_mass", "specific_heat_capacity_volumetric")
+
+DEFAULT_INITIAL_NODES = 5
+DEFAULT_MAX_NODES = 65
+# Relative deviation of a solved midpoint from the interpolated one that refines its interval
+DEFAULT_TOLERANCE = 1e-3
+DEFAULT_VALIDATION_POINTS = 32
+
+# Relative slack of the grid bounds, so that the bounds themselves are never rejected
+BOUNDS_TOLERANCE = 1e-9
+
+class PropertySurrogate:
+    """
+    Properties of a region tabulated over pressures and parameters.
+
+    Attributes:
+        pressures (np.ndarray): Pressure nodes in Pascals, shape (P,), increasing.
+        parameters (np.ndarray): Parameter nodes, shape (Q,), increasing. A single node if the
+            region does not depend on a parameter.
+        names (Tuple[str, ...]): Names of the K properties.
+        values (np.ndarray): Properties at the nodes, shape (P, Q, K).
+        max_errors (np.ndarray): Maximum absolute interpolation error of every property against
+            full solves, shape (K,), NaN if not estimated.
+        rms_errors (np.ndarray): Root mean square interpolation error of every property, shape (K,).
+        species_digest (str): Digest of the species table the properties were solved with.
+    """
+    __slots__ = (
+        "pressures",
+        "parameters",
+        "names",
+        "values",
+        "max_errors",
+        "rms_errors",
+        "species_digest",
+        "_log_pressures"
+    )
+
+    def __init__(
+        self,
+        pressures: np.ndarray,
+        parameters: np.ndarray,
+        names: Sequence[str],
+        values: np.ndarray,
+        species_digest: str = "",
+        max_errors: Optional[np.ndarray] = None,
+        rms_errors: Optional[np.ndarray] = None
+    ):
+        self.pressures = np.asarray(pressures, dtype=float)
+        self.parameters = np.asarray(parameters, dtype=float)
+        self.names = tuple(names)
+        self.values = np.asarray(values, dtype=float)
+        self.species_digest = species_digest
+        nan = np.full(len(self.names), np.nan)
+        self.max_errors = nan if max_errors is None else np.asarray(max_errors, dtype=float)
+        self.rms_errors = nan if rms_errors is None else np.asarray(rms_errors, dtype=float)
+        self._log_pressures = np.log(self.pressures)
+
+        expected = (len(self.pressures), len(self.parameters), len(self.names))
+        if self.values.shape != expected:
+            raise ValueError(f"Expected values of shape {expected}, but got {self.values.shape}")
+        if len(self.pressures) < 2:
+            raise ValueError("A surrogate requires at least 2 pressure nodes.")
+
+    def interpolate_array(self, pressures, parameters=0.0) -> np.ndarray:
+        """
+        Interpolate all properties bilinearly in log-pressure and the parameter.
+
+        Args:
+            pressures: Pressures in Pascals, any shape broadcastable against the parameters.
+            parameters: Parameters, ignored if the region does not depend on a parameter.
+
+        Returns:
+            np.ndarray: Properties, shape broadcast(pressures, parameters) + (K,).
+
+        Raises:
+            ValueError: If a pressure or parameter is outside of the grid.
+        """
+        log_pressures, parameters = np.broadcast_arrays(
+            np.log(np.asarray(pressures, dtype=float)), np.asarray(parameters, dtype=float))
+        i, s = _locate(self._log_pressures, log_pressures, "Pressure")
+        if len(self.parameters) == 1:
+            values = self.values[:, 0]
+            return values[i] * (1 - s)[..., None] + values[i + 1] * s[..., None]
+
+        j, t = _locate(self.parameters, parameters, "Parameter")
+        s, t = s[..., None], t[..., None]
+        values = self.values
+        return (
+            (values[i, j] * (1 - t) + values[i, j + 1] * t) * (1 - s)
+            + (values[i + 1, j] * (1 - t) + values[i + 1, j + 1] * t) * s
+        )
+
+    def interpolate(self, pressures, parameters=0.0) -> Dict[str, np.ndarray]:
+        """
+        Interpolate all properties, see `interpolate_array`.
+
+        Returns:
+            Dict[str, np.ndarray]: Every property by name, shape broadcast(pressures, parameters).
+        """
+        values = self.interpolate_array(pressures, parameters)
+        return {name: values[..., k] for k, name in enumerate(self.names)}
+
+    def format_errors(self) -> str:
+        """
+        Format the estimated interpolation errors for the console.
+        """
+        return "\n".join(
+            f"{name}: max error {max_error:.4g}, rms error {rms_error:.4g}"
+            for name, max_error, rms_error in zip(self.names, self.max_errors, self.rms_errors)
+        )
+
+    def save(self, file_path: str) -> None:
+        """
+        Write the surrogate to an `.npz` file atomically.
+        """
+        temp_path = f"{file_path}.{os.getpid()}.tmp.npz"
+        try:
+            np.savez_compressed(
+                temp_path,
+                version=np.int64(SURROGATE_VERSION),
+                pressures=self.pressures,
+                parameters=self.parameters,
+                names=np.array(self.names, dtype=str),
+                values=self.values,
+                max_errors=self.max_errors,
+                rms_errors=self.rms_errors,
+                species_digest=np.str_(self.species_digest)
+            )
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, file_path: str) -> "PropertySurrogate":
+        """
+        Read a surrogate from an `.npz` file.
+
+        Raises:
+            ValueError: If the file was written by another version of the surrogate.
+        """
+        with np.load(file_path, allow_pickle=False) as data:
+            if int(data["version"]) != SURROGATE_VERSION:
+                raise ValueError(f"Unsupported surrogate version {int(data['version'])} in '{file_path}'.")
+            return cls(
+                pressures=data["pressures"],
+                parameters=data["parameters"],
+                names=[str(name) for name in data["names"]],
+                values=data["values"],
+                species_digest=str(data["species_digest"]),
+                max_errors=data["max_errors"],
+                rms_errors=data["rms_errors"]
+            )
+
+def _locate(nodes: np.ndarray, x: np.ndarray, name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the interval of every value and its position within the interval.
+    """
+    slack = BOUNDS_TOLERANCE * max(1.0, abs(nodes[0]), abs(nodes[-1]))
+    if np.any(x < nodes[0] - slack) or np.any(x > nodes[-1] + slack):
+        raise ValueError(f"{name} outside of the surrogate grid.")
+    i = np.clip(np.searchsorted(nodes, x, side="right") - 1, 0, len(nodes) - 2)
+    t = np.clip((x - nodes[i]) / (nodes[i + 1] - nodes[i]), 0.0, 1.0)
+    return i, t
+
+def region_at_parameter(family: RegionFamily, parameter: float) -> RegionCalculationResult:
+    """
+    Evaluate the region of a region family at a parameter.
+
+    Raises:
+        ValueError: If the parameter removes the whole region.
+    """
+    removed = parameter * family.excluded_mass_fraction
+    if removed >= 1:
+        raise ValueError(f"The parameter {parameter} removes the whole region.")
+
+    base = family.base
+    composition = {
+        element: max(0.0, (base.composition.get(element, 0.0) - removed * family.excluded_composition.get(element, 0.0))
+                     / (1 - removed))
+        for element in set(base.composition) | set(family.excluded_composition)
+    }
+    return RegionCalculationResult(
+        pressure=base.pressure,
+        enthalpy=(base.enthalpy - removed * family.excluded_enthalpy) / (1 - removed),
+        composition=composition
+    )
+
+def _properties(result: EquilibriumResult) -> np.ndarray:
+    return np.array([getattr(result, name) for name in PROPERTY_NAMES])
+
+class _GridSolver:
+    """
+    Memoizes the solves of a region family. Every solve starts from the solution at the
+    nearest pressure of the same parameter.
+    """
+
+    def __init__(self, solver: EquilibriumSolver, family: RegionFamily):
+        self.solver = solver
+        self.family = family
+        self.solves = 0
+        self._results: Dict[float, Dict[float, EquilibriumResult]] = {}
+
+    def solve(self, pressure: float, parameter: float) -> np.ndarray:
+        column = self._results.setdefault(parameter, {})
+        result = column.get(pressure)
+        if result is None:
+            nearest = min(column, key=lambda node: abs(math.log(node / pressure)), default=None)
+            result = self.solver.solve(
+                region_at_parameter(self.family, parameter),
+                pressure,
+                column[nearest] if nearest is not None else None)
+            column[pressure] = result
+            self.solves += 1
+        return _properties(result)
+
+    def grid(self, pressures: Sequence[float], parameters: Sequence[float]) -> np.ndarray:
+        return np.array([[self.solve(pressure, parameter) for parameter in parameters] for pressure in pressures])
+
+def _refine_axis(
+    grid_solver: _GridSolver,
+    nodes: List[float],
+    other_nodes: List[float],
+    pressure_axis: bool,
+    tolerance: float,
+    max_nodes: int
+) -> List[float]:
+    """
+    Return the midpoints of the intervals of an axis whose properties deviate from the
+    interpolated ones by more than the tolerance, worst first, at most up to `max_nodes` nodes.
+    """
+    def solve(node: float, other_node: float) -> np.ndarray:
+        return grid_solver.solve(node, other_node) if pressure_axis else grid_solver.solve(other_node, node)
+
+    deviations = []
+    for lower, upper in zip(nodes, nodes[1:]):
+        midpoint = math.sqrt(lower * upper) if pressure_axis else (lower + upper) / 2
+        deviation = 0.0
+        for other_node in other_nodes:
+            solved = solve(midpoint, other_node)
+            interpolated = (solve(lower, other_node) + solve(upper, other_node)) / 2
+            deviation = max(deviation, float(np.max(np.abs(solved - interpolated) / np.abs(solved))))
+        if deviation > tolerance:
+            deviations.append((deviation, midpoint))
+
+    deviations.sort(reverse=True)
+    return [midpoint for _, midpoint in deviations[:max(0, max_nodes - len(nodes))]]
+
+def build_surrogate(
+    solver: EquilibriumSolver,
+    family: RegionFamily,
+    pressure_range: Tuple[float, float],
+    parameter_range: Tuple[float, float] = (0.0, 0.0),
+    initial_nodes: int = DEFAULT_INITIAL_NODES,
+    tolerance: float = DEFAULT_TOLERANCE,
+    max_nodes: int = DEFAULT_MAX_NODES
+) -> Tuple[PropertySurrogate, int]:
+    """
+    Tabulate the properties of a region family with adaptive refinement.
+
+    Args:
+        solver (EquilibriumSolver): The solver.
+        family (RegionFamily): The region family.
+        pressure_range (Tuple[float, float]): Lowest and highest pressure in Pascals.
+        parameter_range (Tuple[float, float]): Lowest and highest parameter. A single node is
+            tabulated if the bounds are equal or the region does not depend on a parameter.
+        initial_nodes (int): Number of evenly spaced nodes every axis starts with, in
+            log-pressure on the pressure axis.
+        tolerance (float): Relative deviation of a midpoint that refines its interval.
+        max_nodes (int): Maximum number of nodes of every axis.
+
+    Returns:
+        Tuple[PropertySurrogate, int]: The surrogate and the number of equilibrium solves.
+
+    Raises:
+        ValueError: If the ranges are invalid.
+        RuntimeError: If a solve does not converge.
+    """
+    if not 0 < pressure_range[0] < pressure_range[1]:
+        raise ValueError("The pressure range must be positive and increasing.")
+    if parameter_range[0] > parameter_range[1]:
+        raise ValueError("The parameter range must be increasing.")
+    if initial_nodes < 2 or max_nodes < initial_nodes:
+        raise ValueError("At least 2 initial nodes and no fewer maximum nodes are required.")
+
+    pressures = np.geomspace(*pressure_range, initial_nodes).tolist()
+    if family.excluded_composition and parameter_range[0] < parameter_range[1]:
+        parameters = np.linspace(*parameter_range, initial_nodes).tolist()
+    else:
+        parameters = [float(parameter_range[0])]
+
+    grid_solver = _GridSolver(solver, family)
+    while True:
+        new_pressures = _refine_axis(grid_solver, pressures, parameters, True, tolerance, max_nodes)
+        new_parameters = []
+        if len(parameters) > 1:
+            new_parameters = _refine_axis(grid_solver, parameters, pressures, False, tolerance, max_nodes)
+        if not new_pressures and not new_parameters:
+            break
+        pressures = sorted(pressures + new_pressures)
+        parameters = sorted(parameters + new_parameters)
+
+    surrogate = PropertySurrogate(
+        pressures=pressures,
+        parameters=parameters,
+        names=PROPERTY_NAMES,
+        values=grid_solver.grid(pressures, parameters),
+        species_digest=solver.table.digest()
+    )
+    return surrogate, grid_solver.solves
+
+def estimate_errors(
+    surrogate: PropertySurrogate,
+    solver: EquilibriumSolver,
+    family: RegionFamily,
+    points: int = DEFAULT_VALIDATION_POINTS,
+    seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compare the interpolated properties with full solves at random points of the grid,
+    uniformly distributed in log-pressure and the parameter.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Maximum and root mean square absolute errors, shape (K,).
+    """
+    rng = np.random.default_rng(seed)
+    pressures = np.exp(rng.uniform(surrogate._log_pressures[0], surrogate._log_pressures[-1], points))
+    parameters = rng.uniform(surrogate.parameters[0], surrogate.parameters[-1], points)
+
+    solved = np.array([
+        _properties(solver.solve(region_at_parameter(family, parameter), pressure))
+        for pressure, parameter in zip(pressures, parameters)
+    ])
+    errors = np.abs(surrogate.interpolate_array(pressures, parameters) - solved)
+    return errors.max(axis=0), np.sqrt((errors ** 2).mean(axis=0))
+
+def parse_range(value: str) -> Tuple[float, float]:
+    """
+    Parse a range "min:max" or a single value.
+
+    Raises:
+        ValueError: If the range is malformed.
+    """
+    bounds = value.split(":")
+    if len(bounds) == 1:
+        return float(bounds[0]), float(bounds[0])
+    if len(bounds) != 2:
+        raise ValueError(f"Invalid range '{value}', expected 'min:max'.")
+    return float(bounds[0]), float(bounds[1])
+
+def parse_args():
+    """
+    Parse command-line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Tabulate the equilibrium properties of a region over pressures and its parameter."
+    )
+    parser.add_argument(
+        "--region",
+        required=True,
+        help=(
+            "Path to the region JSON file written by the region mapper at the parameter 0, e.g. "
+            "inter_pocket.json for the diffusion region without agglomeration. Its pressure is ignored."
+        )
+    )
+    parser.add_argument(
+        "--combustion-products",
+        required=True,
+        help="Path to the thermodynamic data of the combustion products (JSON or TAB.dat)."
+    )
+    parser.add_argument("--species-cache", help="Path to the compiled species table cache.")
+    parser.add_argument(
+        "--no-species-cache",
+        action="store_true",
+        help="Compile the species table from the combustion products file without reading or writing the cache."
+    )
+    parser.add_argument("--pressures", required=True, help="Pressure range in Pascals 'min:max' (e.g., 1e6:6.5e6).")
+    parser.add_argument(
+        "--excluded-component",
+        help=(
+            "Formula of the component excluded from the region by the parameter (e.g., Al for "
+            "the agglomerated Aluminum). Without it the region does not depend on a parameter."
+        )
+    )
+    parser.add_argument(
+        "--excluded-mass-fraction",
+        type=float,
+        help="Mass of the excluded component per kg of the region at the parameter 0 (e.g., 0.2073)."
+    )
+    parser.add_argument(
+        "--excluded-enthalpy",
+        type=float,
+        default=0.0,
+        help="Enthalpy of the excluded component in joule per kg (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--parameters",
+        default="0:1",
+        help="Parameter range 'min:max', e.g. of the agglomeration fraction (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--initial-nodes",
+        type=int,
+        default=DEFAULT_INITIAL_NODES,
+        help="Number of evenly spaced nodes every axis starts with (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--max-nodes",
+        type=int,
+        default=DEFAULT_MAX_NODES,
+        help="Maximum number of nodes of every axis (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Relative interpolation error at the interval midpoints that refines the grid (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--validation-points",
+        type=int,
+        default=DEFAULT_VALIDATION_POINTS,
+        help="Number of random points the interpolation error is estimated at, 0 to skip (default: %(default)s)."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the validation points (default: %(default)s).")
+    parser.add_argument("--output", required=True, help="Path to the output .npz file.")
+
+    args = parser.parse_args()
+    try:
+        args.pressures = parse_range(args.pressures)
+        args.parameters = parse_range(args.parameters)
+    except ValueError as e:
+        parser.error(str(e))
+    if (args.excluded_component is None) != (args.excluded_mass_fraction is None):
+        parser.error("--excluded-component and --excluded-mass-fraction are required together.")
+    if args.excluded_mass_fraction is not None and not 0 < args.excluded_mass_fraction <= 1:
+        parser.error("The excluded mass fraction must be within (0, 1].")
+    if args.validation_points < 0:
+        parser.error("The number of validation points must not be negative.")
+    return args
+
+
+def main():
+    """
+    Main function to tabulate and export the properties of a region.
+    """
+    try:
+        args = parse_args()
+
+        excluded_composition: Dict[str, float] = {}
+        if args.excluded_component is not None:
+            elements = parse_formula(args.excluded_component)
+            molar_mass = sum(count * ELEMENT_MOLAR_MASSES[element] for element, count in elements.items())
+            excluded_composition = {element: count / molar_mass for element, count in elements.items()}
+        family = RegionFamily(
+            base=load_region_result(args.region),
+            excluded_composition=excluded_composition,
+            excluded_enthalpy=args.excluded_enthalpy,
+            excluded_mass_fraction=args.excluded_mass_fraction or 0.0
+        )
+
+        table = load_species_table(args.combustion_products, args.species_cache, use_cache=not args.no_species_cache)
+        solver = EquilibriumSolver(table)
+        surrogate, solves = build_surrogate(
+            solver,
+            family,
+            args.pressures,
+            args.parameters,
+            initial_nodes=args.initial_nodes,
+            tolerance=args.tolerance,
+            max_nodes=args.max_nodes
+        )
+        if args.validation_points:
+            surrogate.max_errors, surrogate.rms_errors = estimate_errors(
+                surrogate, solver, family, args.validation_points, args.seed)
+
+        surrogate.save(args.output)
+        print(f"Grid of {len(surrogate.pressures)} pressure and {len(surrogate.parameters)} parameter nodes "
+              f"tabulated from {solves} equilibrium solves, results successfully written to {args.output}")
+        if args.validation_points:
+            print(surrogate.format_errors())
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Shared fixtures of the thermodynamics tests.
+
+The tool is run from its `src` directory with flat imports, so the tests put that directory
+on the import path the same way.
+"""
+
+import os
+import sys
+
+import pytest
+
+SOURCE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SOURCE_DIRECTORY)
+
+from equilibrium import EquilibriumSolver  # noqa: E402
+from models import RegionCalculationResult  # noqa: E402
+from species_table import load_species_table  # noqa: E402
+
+# Thermodynamic data of the combustion products shipped with the repository
+COMBUSTION_PRODUCTS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "data", "TAB.dat")
+
+@pytest.fixture(scope="session")
+def species_table():
+    return load_species_table(COMBUSTION_PRODUCTS_PATH, use_cache=False)
+
+@pytest.fixture(scope="session")
+def solver(species_table):
+    return EquilibriumSolver(species_table)
+
+@pytest.fixture
+def aluminized_region():
+    # Pocket without skeleton of the Bas_2 propellant, which melts Al2O3 in the products
+    return RegionCalculationResult(
+        pressure=1.0e6,
+        enthalpy=-1527829.4083859853,
+        composition={
+            "C": 9.505849129331365,
+            "H": 35.214695099119155,
+            "O": 15.704786718374072,
+            "N": 6.007718569653603,
+            "Cl": 3.3293409533388547,
+            "Al": 14.709996403305084
+        }
+    )
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from equilibrium import EquilibriumSolver
+from properties import GAS_CONSTANT
+
+@pytest.mark.parametrize("pressure, temperature", [(1.4e6, 2413.2), (1.5e6, 2421.8)])
+def test_converges_at_the_melting_point_of_alumina(solver, aluminized_region, pressure, temperature):
+    # Both phases of Al2O3 coexist near 2303 K; merged into one species the iterations cycled
+    result = solver.solve(aluminized_region, pressure)
+
+    assert result.temperature == pytest.approx(temperature, abs=0.1)
+    assert any(label.startswith("Al2O3(") for label in result.active_species)
+
+def test_splits_condensed_species_at_enthalpy_jumps(species_table):
+    labels = [species_table.label(index) for index in range(len(species_table))]
+
+    assert {"Al2O3(solid)", "Al2O3(liquid)", "Al(solid)", "Al(liquid)"} <= set(labels)
+
+def test_conserves_elements_and_enthalpy(species_table, solver, aluminized_region):
+    result = solver.solve(aluminized_region)
+
+    indices = {species_table.label(index): index for index in range(len(species_table))}
+    species = np.array([indices[label] for label in result.moles])
+    moles = np.array(list(result.moles.values()))
+    element_moles = species_table.element_matrix[:, species] @ moles
+    for element, amount in aluminized_region.composition.items():
+        assert element_moles[species_table.elements.index(element)] == pytest.approx(amount, rel=1e-8)
+
+    enthalpies, _, _ = species_table.dimensionless_properties(result.temperature, species)
+    enthalpy = GAS_CONSTANT * result.temperature * (enthalpies @ moles)
+    assert enthalpy == pytest.approx(aluminized_region.enthalpy, abs=1e-6 * abs(aluminized_region.enthalpy))
+
+def test_warm_start_matches_cold_start(solver, aluminized_region):
+    initial = solver.solve(aluminized_region, 1.0e6)
+
+    cold = solver.solve(aluminized_region, 2.0e6)
+    warm = solver.solve(aluminized_region, 2.0e6, initial=initial)
+
+    assert warm.warm_start and not cold.warm_start
+    assert warm.temperature == pytest.approx(cold.temperature, rel=1e-8)
+    assert_same_moles(warm, cold)
+
+def test_pruning_matches_full_species_set(species_table, solver, aluminized_region):
+    pruned = solver.solve(aluminized_region)
+    full = EquilibriumSolver(species_table, pruning=False).solve(aluminized_region)
+
+    assert len(pruned.active_species) < len(full.active_species)
+    assert pruned.temperature == pytest.approx(full.temperature, rel=1e-8)
+    assert_same_moles(pruned, full)
+
+def assert_same_moles(result, expected):
+    # Species below the pruning threshold may differ by far more than their share of the products
+    total = sum(expected.moles.values())
+    for label, amount in expected.moles.items():
+        assert result.moles.get(label, 0.0) == pytest.approx(amount, abs=1e-8 * total)
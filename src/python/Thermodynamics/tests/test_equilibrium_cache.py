@@ -0,0 +1,46 @@
+import dataclasses
+import json
+
+from equilibrium_cache import EquilibriumCache
+from main import run_jobs
+from models import ThermodynamicsJob
+
+def test_falls_back_to_memory_when_the_database_cannot_be_opened(tmp_path, capsys, solver, aluminized_region):
+    # A directory cannot be opened as a database
+    with EquilibriumCache("digest", str(tmp_path)) as cache:
+        assert cache.database_path is None
+        result = solver.solve(aluminized_region)
+        key = cache.key(aluminized_region, aluminized_region.pressure)
+        cache.put(key, result)
+        assert cache.get(key) == result
+    assert "in memory only" in capsys.readouterr().err
+
+def test_persists_results_between_runs(tmp_path, solver, aluminized_region):
+    database_path = str(tmp_path / "results.equilibrium.sqlite")
+    result = solver.solve(aluminized_region)
+    with EquilibriumCache("digest", database_path) as cache:
+        cache.put(cache.key(aluminized_region, aluminized_region.pressure), result)
+
+    with EquilibriumCache("digest", database_path) as cache:
+        assert cache.get(cache.key(aluminized_region, aluminized_region.pressure)) == result
+        assert cache.database_hits == 1
+    with EquilibriumCache("other digest", database_path) as cache:
+        assert cache.get(cache.key(aluminized_region, aluminized_region.pressure)) is None
+
+def test_cached_jobs_report_no_iterations(tmp_path, solver, species_table, aluminized_region):
+    region_path = tmp_path / "pocket_without_skeleton.json"
+    region_path.write_text(json.dumps(dataclasses.asdict(aluminized_region)), encoding="utf-8")
+    jobs = [
+        ThermodynamicsJob(propellant_path=str(region_path), pressure=1e6, output_path=str(tmp_path / name))
+        for name in ("solved.tdc.json", "cached.tdc.json")
+    ]
+
+    with EquilibriumCache(species_table.digest()) as cache:
+        assert run_jobs(solver, jobs[:1], cache=cache) == 0
+        assert run_jobs(solver, jobs[1:], cache=cache) == 0
+
+    solved = json.loads((tmp_path / "solved.tdc.json").read_text(encoding="utf-8"))
+    cached = json.loads((tmp_path / "cached.tdc.json").read_text(encoding="utf-8"))
+    assert solved["iterations"] > 0 and not solved["cached"]
+    assert cached["iterations"] == 0 and cached["cached"] and not cached["warm_start"]
+    assert cached["temperature"] == solved["temperature"]
@@ -0,0 +1,11 @@
+import json
+
+from json_writer import write_equilibrium_result
+
+def test_creates_the_output_directory(tmp_path, solver, aluminized_region):
+    output_path = tmp_path / "1000000" / "Bas_2" / "pocket_without_skeleton.tdc.json"
+
+    write_equilibrium_result(solver.solve(aluminized_region), str(output_path))
+
+    assert json.loads(output_path.read_text(encoding="utf-8"))["pressure"] == aluminized_region.pressure
+    assert [path.name for path in output_path.parent.iterdir()] == [output_path.name]
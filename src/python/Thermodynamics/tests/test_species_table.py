@@ -0,0 +1,29 @@
+import os
+import shutil
+
+import numpy as np
+
+from conftest import COMBUSTION_PRODUCTS_PATH
+from species_table import load_species_table
+
+def test_cache_is_refreshed_when_the_data_file_changes(tmp_path):
+    data_path = str(tmp_path / "TAB.dat")
+    cache_path = str(tmp_path / "TAB.dat.species.npz")
+    shutil.copyfile(COMBUSTION_PRODUCTS_PATH, data_path)
+
+    compiled = load_species_table(data_path, cache_path)
+    assert os.path.exists(cache_path)
+    assert load_species_table(data_path, cache_path).digest() == compiled.digest()
+
+    # Same size, so only the modification time and the digest tell the files apart
+    with open(data_path, "r", encoding="utf-8") as file:
+        text = file.read()
+    with open(data_path, "w", encoding="utf-8") as file:
+        file.write(text.replace("58008.607", "58108.607", 1))
+    stat = os.stat(data_path)
+    os.utime(data_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    refreshed = load_species_table(data_path, cache_path)
+    assert refreshed.digest() != compiled.digest()
+    assert not np.array_equal(refreshed.coefficients, compiled.coefficients)
+    assert load_species_table(data_path, use_cache=False).digest() == refreshed.digest()